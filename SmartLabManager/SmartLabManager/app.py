@@ -6,36 +6,11 @@ import dashboard
 import booking
 import profile
 import settings
-import database
+from scheduler import get_scheduler
 import base64
 from PIL import Image
 import io
 
-# Page configuration
-st.set_page_config(
-    page_title="Smart Lab Resource Management System",
-    page_icon="🧪",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Initialize session state variables if they don't exist
-if 'logged_in' not in st.session_state:
-    st.session_state.logged_in = False
-if 'user_email' not in st.session_state:
-    st.session_state.user_email = ""
-if 'theme' not in st.session_state:
-    st.session_state.theme = "dark"  # Set default theme to dark for coffee brown theme
-if 'user_data' not in st.session_state:
-    st.session_state.user_data = {}
-if 'equipment_data' not in st.session_state:
-    # Initialize with sample equipment
-    st.session_state.equipment_data = database.initialize_equipment()
-if 'booking_data' not in st.session_state:
-    st.session_state.booking_data = []
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = "dashboard"
-
 # Display badge at the top of every page
 def display_badge():
     st.image("assets/badge.png", width=150)
@@ -93,9 +68,14 @@ def display_navigation():
             elif selected == "Settings":
                 st.session_state.current_page = "settings"
             elif selected == "Logout":
+                booking.release_slot_hold()
                 auth.logout()
                 st.rerun()
         
+        # A slot held on the booking form is given up once the user leaves it
+        if st.session_state.current_page != "booking":
+            booking.release_slot_hold()
+        
         # Display appropriate page based on current_page
         if st.session_state.current_page == "dashboard":
             dashboard.show_dashboard()
@@ -113,6 +93,29 @@ def display_navigation():
         auth.show_auth_page()
 
 def main():
+    # Page configuration
+    st.set_page_config(
+        page_title="Smart Lab Resource Management System",
+        page_icon="🧪",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # Start the scheduling backend once per server process (no-op on reruns)
+    get_scheduler()
+    
+    # Initialize session state variables if they don't exist
+    if 'logged_in' not in st.session_state:
+        st.session_state.logged_in = False
+    if 'user_email' not in st.session_state:
+        st.session_state.user_email = ""
+    if 'theme' not in st.session_state:
+        st.session_state.theme = "dark"  # Set default theme to dark for coffee brown theme
+    if 'user_data' not in st.session_state:
+        st.session_state.user_data = {}
+    if 'current_page' not in st.session_state:
+        st.session_state.current_page = "dashboard"
+    
     # Apply theme from session state
     if st.session_state.theme == "dark":
         st.markdown("""
@@ -315,8 +315,8 @@ def show_auth_page():
                     elif not is_valid_email(email):
                         st.error("Please enter a valid email address")
                     else:
-                        user = database.get_user(email)
-                        if user and user["password"] == password:
+                        user = database.authenticate_user(email, password)
+                        if user:
                             st.success("Login successful! Redirecting to dashboard...")
                             time.sleep(0.5)  # Slight delay for better UX
                             st.session_state.logged_in = True
@@ -0,0 +1,84 @@
+"""
+Benchmark the calendar occupancy grid against a per-cell scan, and the
+size and build time of the rendered calendar markup
+
+Usage:
+    python benchmarks/bench_calendar.py [booking counts...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("SLAB_STORAGE", "memory")
+
+from booking import generate_calendar_view
+from booking_index import MINUTES_PER_DAY, to_minutes
+from occupancy import occupancy_grid_for_bookings
+
+DAYS = 14
+SLOT_BOUNDS = [(hour * 60, (hour + 1) * 60) for hour in range(8, 19)]
+
+
+def synthetic_bookings(count, window_start, seed=7):
+    """Generate confirmed bookings of 30 minutes to 3 hours spread over the window"""
+    rng = random.Random(seed)
+    bookings = []
+    for booking_id in range(1, count + 1):
+        start = window_start + rng.randrange(DAYS * MINUTES_PER_DAY)
+        bookings.append({
+            "id": booking_id,
+            "equipment_id": rng.randrange(1, 50),
+            "status": "Confirmed",
+            "start_at": start,
+            "end_at": start + rng.randrange(30, 180)
+        })
+    return bookings
+
+
+def scan_grid(bookings, window_start):
+    """Reference implementation: scan every booking for every cell"""
+    grid = []
+    for day in range(DAYS):
+        day_start = window_start + day * MINUTES_PER_DAY
+        row = []
+        for slot_start, slot_end in SLOT_BOUNDS:
+            cell_start = day_start + slot_start
+            cell_end = day_start + slot_end
+            row.append(sum(
+                1 for booking in bookings
+                if booking["start_at"] < cell_end and booking["end_at"] > cell_start
+            ))
+        grid.append(row)
+    return grid
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main(counts):
+    window_start = to_minutes(datetime.today().date())
+
+    print(f"{'bookings':>10} {'scan ms':>10} {'grid ms':>10} {'speedup':>8} {'render ms':>10} {'html KB':>8}")
+    for count in counts:
+        bookings = synthetic_bookings(count, window_start)
+
+        expected, scan_ms = timed(scan_grid, bookings, window_start)
+        grid, grid_ms = timed(occupancy_grid_for_bookings, bookings, window_start, DAYS, SLOT_BOUNDS)
+
+        assert grid.tolist() == expected, "grid does not match the per-cell scan"
+
+        calendar_html, render_ms = timed(generate_calendar_view, bookings, None, DAYS)
+        print(
+            f"{count:>10} {scan_ms:>10.1f} {grid_ms:>10.2f} {scan_ms / grid_ms:>7.0f}x"
+            f" {render_ms:>10.2f} {len(calendar_html) / 1024:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
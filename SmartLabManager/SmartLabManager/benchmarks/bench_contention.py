@@ -0,0 +1,115 @@
+"""
+Benchmark booking commits under contention: many threads booking the same instrument
+
+Every round, all threads race for the same time slot, so exactly one booking
+per round must win and every other attempt must fail with
+BookingConflictError. The run fails loudly if any slot is double-booked.
+
+Usage:
+    python benchmarks/bench_contention.py [threads] [rounds]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from engine import Engine
+from storage import BookingConflictError, MemoryStorage, SQLiteStorage
+
+EQUIPMENT = [{"id": 1, "name": "Oscilloscope", "description": "", "category": "Electronics",
+              "location": "Lab 1", "status": "Available", "image_url": None}]
+
+
+def contend(engines, threads, rounds):
+    """
+    Have every thread try to book each round's slot on equipment 1
+
+    Threads are spread over the given engines. Separate engines on one
+    database stand in for separate server processes: they share no locks
+    or indexes, so only the storage transaction keeps them apart.
+
+    Returns:
+        dict: Counts of wins and conflicts, elapsed seconds and per-attempt latencies
+    """
+    first_day = date.today() + timedelta(days=1)
+    barrier = threading.Barrier(threads)
+    wins = [0] * threads
+    conflicts = [0] * threads
+    latencies = [[] for _ in range(threads)]
+
+    def worker(worker_id):
+        for round_number in range(rounds):
+            day = first_day + timedelta(days=round_number // 8)
+            hour = 8 + round_number % 8
+            barrier.wait()
+            started = time.perf_counter()
+            try:
+                engines[worker_id % len(engines)].bookings.add(
+                    f"user{worker_id}@example.com", 1, day, day,
+                    start_time=f"{hour:02d}:00", end_time=f"{hour + 1:02d}:00"
+                )
+                wins[worker_id] += 1
+            except BookingConflictError:
+                conflicts[worker_id] += 1
+            latencies[worker_id].append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "wins": sum(wins),
+        "conflicts": sum(conflicts),
+        "elapsed": elapsed,
+        "latencies": sorted(latency for per_thread in latencies for latency in per_thread)
+    }
+
+
+def check_no_double_booking(storage):
+    """Assert that no two confirmed bookings on equipment 1 overlap"""
+    bookings = sorted(storage.list_bookings(equipment_id=1, status="Confirmed"), key=lambda b: b["start_at"])
+    for previous, booking in zip(bookings, bookings[1:]):
+        assert previous["end_at"] <= booking["start_at"], f"double booking: {previous['id']} and {booking['id']}"
+    return len(bookings)
+
+
+def main(threads, rounds):
+    print(f"{threads} threads, {rounds} contended slots")
+    print(f"{'storage':<10} {'won':>5} {'lost':>6} {'attempts/s':>11} {'p50 ms':>8} {'p99 ms':>8}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        memory = MemoryStorage()
+        sqlite_path = os.path.join(directory, "contention.db")
+        shared_path = os.path.join(directory, "shared.db")
+        setups = {
+            "memory": [Engine(memory, EQUIPMENT)],
+            "sqlite": [Engine(SQLiteStorage(sqlite_path), EQUIPMENT)],
+            "sqlite x2": [Engine(SQLiteStorage(shared_path), EQUIPMENT), Engine(SQLiteStorage(shared_path), EQUIPMENT)]
+        }
+        for name, engines in setups.items():
+            result = contend(engines, threads, rounds)
+
+            stored = check_no_double_booking(engines[0].storage)
+            assert result["wins"] == rounds == stored, f"expected {rounds} winners, got {result['wins']} ({stored} stored)"
+
+            latencies = result["latencies"]
+            attempts = len(latencies)
+            print(
+                f"{name:<10} {result['wins']:>5} {result['conflicts']:>6} {attempts / result['elapsed']:>11.0f}"
+                f" {latencies[attempts // 2] * 1000:>8.2f} {latencies[int(attempts * 0.99)] * 1000:>8.2f}"
+            )
+            for engine in engines:
+                engine.close()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 32, args[1] if len(args) > 1 else 200)
@@ -0,0 +1,78 @@
+"""
+Benchmark the Java and Python scheduling backends on booking-page query mixes
+
+Usage:
+    python benchmarks/bench_scheduler.py [booking count] [rounds]
+
+Run from the project directory so the Java bridge finds classes/. The Java
+column is left empty when Java is not installed or not compiled.
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("SLAB_STORAGE", "memory")
+
+import database
+from booking_index import time_slots
+from java_bridge import get_java_bridge
+from scheduler import PythonScheduler, calibration_workload
+
+
+def seed_bookings(count, seed=3):
+    """Add confirmed one-to-three hour bookings over the next 60 days, skipping clashes"""
+    rng = random.Random(seed)
+    equipment_ids = [equipment["id"] for equipment in database.get_all_equipment()]
+    slots = time_slots(8, 18, 30)
+    for _ in range(count):
+        day = date.today() + timedelta(days=rng.randrange(60))
+        first = rng.randrange(len(slots) - 6)
+        last = first + rng.randrange(2, 7)
+        try:
+            database.add_booking(
+                "bench@example.com", rng.choice(equipment_ids), day, day,
+                start_time=slots[first], end_time=slots[last]
+            )
+        except database.BookingConflictError:
+            continue
+
+
+def time_call(method, args, rounds):
+    method(*args)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        method(*args)
+    return (time.perf_counter() - started) / rounds * 1000
+
+
+def main(count, rounds):
+    seed_bookings(count)
+
+    bridge = get_java_bridge()
+    backends = {"python": PythonScheduler()}
+    if bridge.wait_until_ready(timeout=120):
+        backends["java"] = bridge
+
+    workload = calibration_workload()
+    workload["check_time_slots_500"] = (calibration_workload(checks=500)["check_time_slots"][0],)
+
+    print(f"{count} bookings, {rounds} rounds, java mode: {bridge.mode if 'java' in backends else 'unavailable'}")
+    print(f"{'operation':<26} {'python ms':>10} {'java ms':>10}")
+    for operation, args in workload.items():
+        method_name = operation.replace("_500", "")
+        timings = {
+            name: time_call(getattr(backend, method_name), args, rounds)
+            for name, backend in backends.items()
+        }
+        java_ms = f"{timings['java']:>10.3f}" if "java" in timings else f"{'-':>10}"
+        print(f"{operation:<26} {timings['python']:>10.3f} {java_ms}")
+
+    bridge.shutdown()
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(args[0] if args else 10_000, args[1] if len(args) > 1 else 20)
@@ -0,0 +1,103 @@
+"""
+Benchmark the earliest-free-slot search on large catalogs
+
+Compares Engine.earliest_slots (lazy per-equipment free-start streams merged
+through a heap) with checking every aligned start on every instrument.
+
+Usage:
+    python benchmarks/bench_slot_search.py [instrument counts...]
+"""
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from booking_index import MINUTES_PER_DAY, format_time, minutes_to_date, to_minutes
+from engine import Engine
+from storage import MemoryStorage
+
+CATEGORY = "PCR"
+BOOKINGS_PER_INSTRUMENT = 40
+DAYS = 14
+DURATION = 120
+WORK_START, WORK_END = 8 * 60, 18 * 60
+K = 5
+
+
+def build_engine(instruments, seed=5):
+    """An engine over a catalog where every instrument is busy most working hours"""
+    rng = random.Random(seed)
+    storage = MemoryStorage()
+    first_day = to_minutes(date.today() + timedelta(days=1))
+
+    for number in range(instruments):
+        equipment = storage.add_equipment({
+            "name": f"Thermocycler {number + 1}", "description": "", "category": CATEGORY,
+            "location": f"Lab {number % 20 + 1}", "status": "Available", "image_url": None
+        })
+
+        # Back-to-back one-to-three hour bookings with only short gaps in between
+        cursor = first_day + WORK_START
+        for _ in range(BOOKINGS_PER_INSTRUMENT):
+            start = cursor + rng.choice((0, 0, 0, 30, 60))
+            end = start + rng.choice((60, 120, 180))
+            if end > (start // MINUTES_PER_DAY) * MINUTES_PER_DAY + WORK_END:
+                start = (start // MINUTES_PER_DAY + 1) * MINUTES_PER_DAY + WORK_START
+                end = start + 120
+            day = minutes_to_date(start).isoformat()
+            storage.add_booking({
+                "user_email": "bench@example.com", "equipment_id": equipment["id"],
+                "start_date": day, "end_date": day, "start_time": format_time(start), "end_time": format_time(end),
+                "start_at": start, "end_at": end, "status": "Confirmed", "purpose": "", "timestamp": ""
+            })
+            cursor = end
+
+    return Engine(storage)
+
+
+def scan_all_starts(engine, first_day):
+    """Reference: test every 30-minute start on every instrument, then sort"""
+    found = []
+    for equipment in engine.catalog.all():
+        for day in range(DAYS):
+            day_start = first_day + day * MINUTES_PER_DAY
+            for start in range(day_start + WORK_START, day_start + WORK_END - DURATION + 1, 30):
+                if not engine.bookings.has_overlap(equipment["id"], start, start + DURATION):
+                    found.append((start, equipment["id"]))
+    found.sort()
+    return found
+
+
+def timed(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main(counts):
+    first_date = date.today() + timedelta(days=1)
+    first_day = to_minutes(first_date)
+
+    print(f"{'instruments':>12} {'bookings':>9} {'scan ms':>10} {'search ms':>10} {'speedup':>8}  first slot")
+    for count in counts:
+        engine = build_engine(count)
+        expected, scan_ms = timed(scan_all_starts, engine, first_day)
+        slots, search_ms = timed(
+            engine.earliest_slots, CATEGORY, DURATION, first_date, DAYS, "08:00", "18:00", k=K
+        )
+
+        found = [(slot["start_at"], slot["equipment_id"]) for slot in slots]
+        assert found == expected[:K], "search did not return the k earliest slots"
+
+        first = slots[0]
+        print(
+            f"{count:>12} {count * BOOKINGS_PER_INSTRUMENT:>9} {scan_ms:>10.1f} {search_ms:>10.2f}"
+            f" {scan_ms / search_ms:>7.0f}x  {first['name']} {first['date']} {first['start_time']}"
+        )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 5_000])
@@ -1,9 +1,14 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
+import html
 import time
 import random
-from java_bridge import get_java_bridge
+import database
+from booking_index import MINUTES_PER_DAY, to_minutes
+from scheduler import get_time_slots
+from occupancy import occupancy_grid_for_bookings, occupancy_grid_for_masks
+from engine import HOLD_TTL
 
 # Import styles if available
 try:
@@ -106,116 +111,135 @@ def display_equipment_card(equipment):
     """
     st.markdown(card_html, unsafe_allow_html=True)
 
-def generate_calendar_view(bookings, equipment_id=None, days=14):
+# Shared stylesheet for the booking calendar; cells only carry a class name
+CALENDAR_CSS = """<style>
+.slab-cal{overflow-x:auto}
+.slab-cal table{width:100%;border-collapse:collapse;min-width:800px}
+.slab-cal th,.slab-cal td{padding:10px;text-align:center;border:1px solid #ddd;background:#fff}
+.slab-cal th{background:#6f4e37;color:#fff}
+.slab-cal .d{position:sticky;left:0;font-weight:bold}
+.slab-cal .we td{background:#f8f4f0}
+.slab-cal td.b{background:rgba(111,78,55,.3)}
+.slab-cal td.h{background:rgba(240,173,78,.2)}
+.slab-cal td.f::after,.slab-cal td.b::after,.slab-cal td.h::after,.slab-cal-key span{content:"";display:inline-block;width:10px;height:10px;border-radius:50%}
+.slab-cal td.f::after,.slab-cal-key .f{background:#5cb85c}
+.slab-cal td.h::after,.slab-cal-key .h{background:#f0ad4e}
+.slab-cal td.b::after,.slab-cal-key .b{background:#d9534f}
+.slab-cal-key{margin-top:10px;font-size:.9rem}
+.slab-cal-key .h,.slab-cal-key .b{margin-left:15px}
+</style>"""
+
+def generate_calendar_view(bookings, equipment_id=None, days=14, holds=()):
     """
     Generate a calendar view of bookings
     
     Args:
-        bookings (list): List of booking dictionaries
+        bookings (list): List of booking dictionaries, or None to read the equipment's slot bitsets
         equipment_id (int): Equipment ID to filter bookings for, or None for all equipment
         days (int): Number of days to show
+        holds (list): Live slot holds, shown as held where nothing is booked yet
         
     Returns:
         str: HTML for calendar view
     """
-    # Filter bookings for the specified equipment if provided
-    if equipment_id is not None:
-        filtered_bookings = [b for b in bookings if b["equipment_id"] == equipment_id]
-    else:
-        filtered_bookings = bookings
-    
     # Get date range
     start_date = datetime.today().date()
     date_range = [start_date + timedelta(days=i) for i in range(days)]
-    
-    # Generate calendar HTML
-    calendar_html = """
-    <div style="overflow-x: auto;">
-        <table style="width: 100%; border-collapse: collapse; min-width: 800px;">
-            <thead>
-                <tr style="background-color: #6f4e37; color: white;">
-                    <th style="padding: 10px; text-align: center; border: 1px solid #ddd; position: sticky; left: 0; background-color: #6f4e37;">Date</th>
-    """
+    window_start = to_minutes(start_date)
+    window_end = window_start + days * MINUTES_PER_DAY
     
     # Add time slots as columns
     time_slots = ["08:00", "09:00", "10:00", "11:00", "12:00", "13:00", "14:00", "15:00", "16:00", "17:00", "18:00"]
-    for slot in time_slots:
-        calendar_html += f'<th style="padding: 10px; text-align: center; border: 1px solid #ddd;">{slot}</th>'
     
-    calendar_html += """
-                </tr>
-            </thead>
-            <tbody>
-    """
+    # Each slot covers [slot, next slot); the last one is an hour long
+    slot_minutes = [to_minutes(start_date, slot) - window_start for slot in time_slots]
+    slot_bounds = list(zip(slot_minutes, slot_minutes[1:] + [slot_minutes[-1] + 60]))
     
-    # Add a row for each date
-    for date in date_range:
-        date_str = date.strftime("%Y-%m-%d")
-        day_name = date.strftime("%a")
-        date_display = date.strftime("%b %d")
-        
-        # Determine row background color (weekends different)
-        bg_color = "#f8f4f0" if date.weekday() >= 5 else "white"
+    if bookings is None:
+        # One equipment's calendar straight from its per-day slot bitsets
+        grid = occupancy_grid_for_masks(database.get_day_masks(equipment_id, start_date, days), slot_bounds)
+    else:
+        # Keep confirmed bookings in the window (for the specified equipment if provided)
+        filtered_bookings = [
+            b for b in bookings
+            if (equipment_id is None or b["equipment_id"] == equipment_id)
+            and b["status"] == "Confirmed"
+            and b["start_at"] < window_end and b["end_at"] > window_start
+        ]
         
-        calendar_html += f"""
-            <tr>
-                <td style="padding: 10px; text-align: center; border: 1px solid #ddd; background-color: {bg_color}; position: sticky; left: 0; font-weight: bold;">
-                    {day_name}<br>{date_display}
-                </td>
-        """
+        # Number of bookings overlapping each day x slot cell
+        grid = occupancy_grid_for_bookings(filtered_bookings, window_start, days, slot_bounds)
+    held_grid = occupancy_grid_for_bookings(
+        [h for h in holds if equipment_id is None or h["equipment_id"] == equipment_id],
+        window_start, days, slot_bounds
+    )
+    
+    # Bookings in a per-equipment calendar all share one name
+    equipment = database.get_equipment(equipment_id) if equipment_id is not None else None
+    booked_title = html.escape(equipment["name"], quote=True) if equipment else None
+    
+    # Build the table from short class names styled once by CALENDAR_CSS
+    parts = [CALENDAR_CSS, '<div class="slab-cal"><table><thead><tr><th class="d">Date</th>']
+    parts.extend(f"<th>{slot}</th>" for slot in time_slots)
+    parts.append("</tr></thead><tbody>")
+    
+    # Add a row for each date (weekends shaded)
+    for day, date in enumerate(date_range):
+        row_class = ' class="we"' if date.weekday() >= 5 else ""
+        parts.append(f'<tr{row_class}><td class="d">{date.strftime("%a")}<br>{date.strftime("%b %d")}</td>')
         
-        # Check each time slot for bookings
-        for i, slot in enumerate(time_slots):
-            # Find bookings that overlap with this time slot
-            slot_bookings = []
-            for booking in filtered_bookings:
-                if booking["start_date"] == date_str and "start_time" in booking and "end_time" in booking:
-                    # Convert time to comparable format
-                    booking_start = datetime.strptime(booking["start_time"], "%H:%M").time()
-                    booking_end = datetime.strptime(booking["end_time"], "%H:%M").time()
-                    slot_time = datetime.strptime(slot, "%H:%M").time()
-                    next_slot_time = datetime.strptime(time_slots[i+1], "%H:%M").time() if i < len(time_slots)-1 else None
-                    
-                    # Check if booking overlaps with this slot
-                    if booking_start <= slot_time and (next_slot_time is None or booking_end > slot_time):
-                        slot_bookings.append(booking)
-            
-            # Determine cell color based on bookings
-            if slot_bookings:
-                equipment_names = []
-                for booking in slot_bookings:
-                    equipment = next((e for e in st.session_state.equipment_data if e["id"] == booking["equipment_id"]), None)
-                    equipment_names.append(equipment["name"] if equipment else "Unknown")
-                
-                # Create tooltip with booking info
-                tooltip = ", ".join(equipment_names)
-                cell_html = f"""
-                    <td style="padding: 10px; text-align: center; border: 1px solid #ddd; background-color: rgba(111, 78, 55, 0.3);" title="{tooltip}">
-                        <span style="display: inline-block; width: 10px; height: 10px; border-radius: 50%; background-color: #d9534f;"></span>
-                    </td>
-                """
+        for count, held in zip(grid[day].tolist(), held_grid[day].tolist()):
+            if count:
+                title = booked_title or f"{count} booking{'s' if count > 1 else ''}"
+                parts.append(f'<td class="b" title="{title}"></td>')
+            elif held:
+                parts.append('<td class="h" title="Held"></td>')
             else:
-                cell_html = f"""
-                    <td style="padding: 10px; text-align: center; border: 1px solid #ddd; background-color: {bg_color};">
-                        <span style="display: inline-block; width: 10px; height: 10px; border-radius: 50%; background-color: #5cb85c;"></span>
-                    </td>
-                """
-            
-            calendar_html += cell_html
+                parts.append('<td class="f"></td>')
         
-        calendar_html += "</tr>"
+        parts.append("</tr>")
     
-    calendar_html += """
-            </tbody>
-        </table>
-    </div>
-    <div style="margin-top: 10px; font-size: 0.9rem;">
-        <span style="display: inline-block; width: 10px; height: 10px; border-radius: 50%; background-color: #5cb85c; margin-right: 5px;"></span> Available
-        <span style="display: inline-block; width: 10px; height: 10px; border-radius: 50%; background-color: #d9534f; margin-right: 5px; margin-left: 15px;"></span> Booked
-    </div>
-    """
+    parts.append(
+        '</tbody></table></div>'
+        '<div class="slab-cal-key"><span class="f"></span> Available <span class="h"></span> Held <span class="b"></span> Booked</div>'
+    )
     
-    return calendar_html
+    return "".join(parts)
+
+def display_slot_finder(categories):
+    """Let the user find the earliest free slots on any equipment in a category"""
+    with st.expander("🔎 Find the earliest free slot in a category"):
+        col1, col2 = st.columns(2)
+        with col1:
+            category = st.selectbox("Equipment Category", sorted(categories), key="finder_category")
+            duration = st.selectbox(
+                "Duration",
+                options=[30, 60, 90, 120, 180, 240],
+                index=1,
+                format_func=lambda minutes: f"{minutes / 60:g} hour{'' if minutes == 60 else 's'}",
+                key="finder_duration"
+            )
+        
+        with col2:
+            first_date = st.date_input("From", min_value=datetime.today(), value=datetime.today(), key="finder_date")
+            days = st.slider("Days to Search", min_value=1, max_value=30, value=7, key="finder_days")
+        
+        work_start, work_end = st.select_slider(
+            "Working Hours",
+            options=get_time_slots(8, 18, 30),
+            value=("08:00", "18:00"),
+            key="finder_hours"
+        )
+        
+        if st.button("Find Slots", key="finder_search"):
+            slots = database.find_earliest_slots(category, duration, first_date, days, work_start, work_end)
+            if not slots:
+                st.info("No free slot of that length in the selected days and hours.")
+            else:
+                st.table(pd.DataFrame([
+                    {"Equipment": slot["name"], "Date": slot["date"], "Start": slot["start_time"], "End": slot["end_time"]}
+                    for slot in slots
+                ]))
 
 def display_session_options():
     """Display lab session booking and management options"""
@@ -254,16 +278,15 @@ def display_session_options():
     user_category = st.session_state.user_data.get("user_category", "")
     is_lab_staff = user_category in ["Lab Technician", "Lecturer"]
     
-    # Initialize lab sessions if not exists
-    if "lab_sessions" not in st.session_state:
-        st.session_state.lab_sessions = []
+    # Lab sessions are shared by every user and kept in the engine
+    all_sessions = database.get_all_lab_sessions()
     
     # Tabs for session management
     tab1, tab2 = st.tabs(["Available Sessions", "Create Session" if is_lab_staff else "My Registrations"])
     
     with tab1:
         # Display available lab sessions
-        if not st.session_state.lab_sessions:
+        if not all_sessions:
             no_sessions_html = """
             <div style="background-color: rgba(255, 255, 255, 0.8); 
                         border-radius: 15px; 
@@ -278,16 +301,7 @@ def display_session_options():
             st.markdown(no_sessions_html, unsafe_allow_html=True)
         else:
             # Filter to show only future sessions with Open status
-            today = datetime.today().date()
-            open_sessions = []
-            
-            for session in st.session_state.lab_sessions:
-                try:
-                    session_date = datetime.strptime(session["date"], "%Y-%m-%d").date()
-                    if session_date >= today and session["status"] == "Open":
-                        open_sessions.append(session)
-                except:
-                    continue
+            open_sessions = database.get_upcoming_lab_sessions("Open")
             
             if not open_sessions:
                 st.info("No upcoming lab sessions available.")
@@ -347,17 +361,17 @@ def display_session_options():
                         if user_registered:
                             if st.button(f"⛔ Cancel Registration #{session['id']}", key=f"cancel_{session['id']}"):
                                 # Remove user from participants
-                                session["participants"].remove(st.session_state.user_email)
+                                database.unregister_from_lab_session(session["id"], st.session_state.user_email)
                                 st.success("Registration cancelled successfully")
                                 st.rerun()
                         elif not is_full:
                             if st.button(f"✅ Register #{session['id']}", key=f"register_{session['id']}"):
                                 # Add user to participants
-                                if "participants" not in session:
-                                    session["participants"] = []
-                                session["participants"].append(st.session_state.user_email)
-                                st.success("Registered successfully")
-                                st.rerun()
+                                if database.register_for_lab_session(session["id"], st.session_state.user_email):
+                                    st.success("Registered successfully")
+                                    st.rerun()
+                                else:
+                                    st.error("This session is at full capacity")
                         else:
                             st.error("This session is at full capacity")
                     
@@ -395,13 +409,10 @@ def display_session_options():
                 with col1:
                     date = st.date_input("Session Date", min_value=datetime.today())
                 
-                # Time selection with Java bridge or fallback
-                java_bridge = get_java_bridge()
-                
                 with col1:
-                    # Get Java-powered time slots or use Python fallback
+                    # Get time slots from the shared slot table or use Python fallback
                     try:
-                        start_slots = java_bridge.generate_time_slots(8, 17, 30)
+                        start_slots = get_time_slots(8, 17, 30)
                         start_time = st.selectbox("Start Time", options=start_slots)
                     except:
                         # Use Python fallback
@@ -414,7 +425,7 @@ def display_session_options():
                             end_slots = start_slots[start_idx+1:]
                         else:
                             # If using the Python time_input fallback
-                            end_slots = java_bridge.generate_time_slots(9, 18, 30)
+                            end_slots = get_time_slots(9, 18, 30)
                         end_time = st.selectbox("End Time", options=end_slots)
                     except:
                         # Use Python fallback
@@ -446,10 +457,6 @@ def display_session_options():
                         elif not description:
                             st.error("Session description is required")
                         else:
-                            # Check if the lab session already exists in that time slot
-                            if "lab_sessions" not in st.session_state:
-                                st.session_state.lab_sessions = []
-                            
                             # Convert times to string format for comparison
                             if isinstance(start_time, str):
                                 start_time_str = start_time
@@ -461,51 +468,31 @@ def display_session_options():
                             else:
                                 end_time_str = end_time.strftime("%H:%M")
                             
-                            # Check for conflicts
-                            conflict = False
-                            for session in st.session_state.lab_sessions:
-                                if session["lab_room"] == lab_room and session["date"] == date.strftime("%Y-%m-%d"):
-                                    session_start = session["start_time"]
-                                    session_end = session["end_time"]
-                                    
-                                    # Check if time periods overlap
-                                    if (start_time_str <= session_end and end_time_str >= session_start):
-                                        conflict = True
-                                        break
-                            
-                            if conflict:
-                                st.error("There's already a lab session scheduled for this time slot in this room.")
+                            # Create the lab session unless the room is already taken at that time
+                            try:
+                                new_session = database.add_lab_session(
+                                    session_name, lab_room, date, start_time_str, end_time_str,
+                                    capacity, description, topics, st.session_state.user_email
+                                )
+                            except ValueError:
+                                st.error("The end time must be after the start time.")
                             else:
-                                # Create the lab session
-                                new_session = {
-                                    "id": len(st.session_state.lab_sessions) + 1,
-                                    "name": session_name,
-                                    "lab_room": lab_room,
-                                    "date": date.strftime("%Y-%m-%d"),
-                                    "start_time": start_time_str,
-                                    "end_time": end_time_str,
-                                    "capacity": capacity,
-                                    "description": description,
-                                    "topics": topics,
-                                    "created_by": st.session_state.user_email,
-                                    "participants": [],
-                                    "status": "Open"
-                                }
-                                
-                                st.session_state.lab_sessions.append(new_session)
-                                st.success(f"Created lab session: {session_name}")
-                                st.rerun()
+                                if new_session is None:
+                                    st.error("There's already a lab session scheduled for this time slot in this room.")
+                                else:
+                                    st.success(f"Created lab session: {session_name}")
+                                    st.rerun()
             
             st.markdown("</div>", unsafe_allow_html=True)
             
             # Show sessions created by this staff member
             st.markdown("<h3 style='color: #3d2314; margin-top: 2rem;'>Manage Your Lab Sessions</h3>", unsafe_allow_html=True)
             
-            if "lab_sessions" not in st.session_state or not st.session_state.lab_sessions:
+            if not all_sessions:
                 st.info("You haven't created any lab sessions yet.")
             else:
                 # Filter to show only sessions created by this staff member
-                my_sessions = [s for s in st.session_state.lab_sessions if s["created_by"] == st.session_state.user_email]
+                my_sessions = database.get_created_lab_sessions(st.session_state.user_email)
                 
                 if not my_sessions:
                     st.info("You haven't created any lab sessions yet.")
@@ -564,19 +551,19 @@ def display_session_options():
                         with col1:
                             if session["status"] == "Open":
                                 if st.button(f"🔒 Close Registration #{session['id']}", key=f"close_{session['id']}"):
-                                    session["status"] = "Closed"
+                                    database.update_lab_session_status(session["id"], "Closed")
                                     st.success("Session registration closed")
                                     st.rerun()
                             else:
                                 if st.button(f"🔓 Reopen Registration #{session['id']}", key=f"reopen_{session['id']}"):
-                                    session["status"] = "Open"
+                                    database.update_lab_session_status(session["id"], "Open")
                                     st.success("Session registration reopened")
                                     st.rerun()
                         
                         with col2:
                             if st.button(f"❌ Cancel Session #{session['id']}", key=f"delete_{session['id']}"):
-                                # Remove session from list
-                                st.session_state.lab_sessions.remove(session)
+                                # Remove session from the shared list
+                                database.cancel_lab_session(session["id"])
                                 st.success("Session cancelled")
                                 st.rerun()
                         
@@ -586,14 +573,11 @@ def display_session_options():
         with tab2:
             st.markdown("<h3 style='color: #3d2314;'>My Session Registrations</h3>", unsafe_allow_html=True)
             
-            if "lab_sessions" not in st.session_state or not st.session_state.lab_sessions:
+            if not all_sessions:
                 st.info("No lab sessions available.")
             else:
                 # Filter to show only sessions that the user is registered for
-                my_registrations = [
-                    s for s in st.session_state.lab_sessions 
-                    if st.session_state.user_email in s.get("participants", [])
-                ]
+                my_registrations = database.get_registered_lab_sessions(st.session_state.user_email)
                 
                 if not my_registrations:
                     no_reg_html = """
@@ -657,12 +641,23 @@ def display_session_options():
                         if not is_past:
                             if st.button(f"⛔ Cancel Registration #{session['id']}", key=f"my_cancel_{session['id']}"):
                                 # Remove user from participants
-                                session["participants"].remove(st.session_state.user_email)
+                                database.unregister_from_lab_session(session["id"], st.session_state.user_email)
                                 st.success("Registration cancelled successfully")
                                 st.rerun()
                         
                         st.markdown("</div>", unsafe_allow_html=True)
 
+def _pick_slot():
+    """Mark the selected slot as the user's own choice, so the form may hold it"""
+    st.session_state.slot_picked = True
+
+def release_slot_hold():
+    """Give up the slot held for this session, e.g. when the user changes equipment or leaves the page"""
+    st.session_state.slot_picked = False
+    hold_id = st.session_state.pop("slot_hold_id", None)
+    if hold_id is not None:
+        database.release_hold(hold_id)
+
 def show_booking_page():
     """Enhanced booking page with fancy styling"""
     # Apply background image and styling
@@ -697,6 +692,9 @@ def show_booking_page():
         display_session_options()
     
     else:  # Equipment Booking
+        catalog = database.get_catalog()
+        equipment_list = catalog.values()
+        
         # Enhanced header for the equipment booking section
         st.markdown("""
         <div style="background-color: rgba(111, 78, 55, 0.1); 
@@ -726,7 +724,7 @@ def show_booking_page():
             """, unsafe_allow_html=True)
             
             # Get unique categories for filter
-            categories = set(e["category"] for e in st.session_state.equipment_data)
+            categories = set(e["category"] for e in equipment_list)
             category_filter = st.selectbox(
                 "Category",
                 ["All"] + sorted(list(categories))
@@ -743,7 +741,7 @@ def show_booking_page():
         
         # Filter equipment based on criteria
         filtered_equipment = filter_equipment(
-            st.session_state.equipment_data,
+            equipment_list,
             category_filter,
             status_filter,
             search_term
@@ -807,6 +805,10 @@ def show_booking_page():
                             with cols[j]:
                                 display_equipment_card(booked_equipment[i+j])
         
+        # Earliest free slot across a whole category
+        if categories:
+            display_slot_finder(categories)
+        
         # Equipment booking section
         if available_equipment:
             st.markdown("""
@@ -824,14 +826,15 @@ def show_booking_page():
             equipment_options = {f"{e['id']}: {e['name']}" for e in available_equipment}
             selected_equipment = st.selectbox(
                 "Select Equipment to Book",
-                options=sorted(list(equipment_options))
+                options=sorted(list(equipment_options)),
+                on_change=release_slot_hold
             )
             
             # Extract equipment ID from selection
             equipment_id = int(selected_equipment.split(":")[0])
             
             # Get the selected equipment details
-            equipment = next((e for e in available_equipment if e["id"] == equipment_id), None)
+            equipment = database.get_equipment(equipment_id)
             
             if equipment:
                 # Show the equipment details with nice styling
@@ -861,40 +864,47 @@ def show_booking_page():
                     value=today
                 )
                 
-                # Get Java bridge for time slots
-                java_bridge = get_java_bridge()
-                
                 try:
-                    # Generate time slots from Java
-                    time_slots = java_bridge.generate_time_slots(8, 18, 30)
+                    # Get time slots from the shared slot table
+                    time_slots = get_time_slots(8, 18, 30)
+                    
+                    # Only offer starts with at least one free slot after them
+                    free_start_times = database.get_free_start_times(equipment_id, booking_date, time_slots[:-1], 30)
+                    if not free_start_times:
+                        st.warning("This equipment is fully booked on the selected date. Please choose another date.")
+                        free_start_times = time_slots[:-1]
                     
                     # Time selection in two columns
                     col1, col2 = st.columns(2)
                     with col1:
                         start_time = st.selectbox(
                             "Start Time",
-                            options=time_slots[:-1]  # Exclude the last time slot
+                            options=free_start_times,
+                            on_change=_pick_slot
                         )
                     
-                    # Filter end times to only show times after the selected start time
-                    start_idx = time_slots.index(start_time)
-                    available_end_times = time_slots[start_idx+1:]
+                    # Offer end times after the start, up to the next booking
+                    available_end_times = database.get_free_end_times(equipment_id, booking_date, start_time, time_slots)
+                    if not available_end_times:
+                        start_idx = time_slots.index(start_time)
+                        available_end_times = time_slots[start_idx+1:]
                     
                     with col2:
                         end_time = st.selectbox(
                             "End Time",
-                            options=available_end_times
+                            options=available_end_times,
+                            on_change=_pick_slot
                         )
                 except:
                     # Fallback to standard time input if Java bridge fails
                     col1, col2 = st.columns(2)
                     with col1:
-                        start_time = st.time_input("Start Time", value=datetime.strptime("08:00", "%H:%M").time())
+                        start_time = st.time_input("Start Time", value=datetime.strptime("08:00", "%H:%M").time(), on_change=_pick_slot)
                     
                     with col2:
                         # Set a default end time 2 hours after start
                         default_end = datetime.combine(datetime.today(), start_time) + timedelta(hours=2)
-                        end_time = st.time_input("End Time", value=default_end.time())
+                        end_time = st.time_input("End Time", value=default_end.time(), on_change=_pick_slot)
                 
                 # Format time display
                 date_str = booking_date.strftime("%Y-%m-%d")
@@ -909,6 +919,26 @@ def show_booking_page():
                 else:
                     end_time_str = end_time.strftime("%H:%M")
                 
+                # Once the user has picked a time, hold it while the rest of the form
+                # is filled in; every rerun on the same selection extends the hold.
+                # The default selection is never held, so just opening the form
+                # does not block the slot for anyone else.
+                hold = None
+                if st.session_state.get("slot_picked"):
+                    try:
+                        hold = database.hold_slot(st.session_state.user_email, equipment_id, date_str, start_time_str, end_time_str)
+                        st.session_state.slot_hold_id = hold["id"]
+                    except database.BookingConflictError as e:
+                        hold_id = st.session_state.pop("slot_hold_id", None)
+                        if hold_id is not None:
+                            database.release_hold(hold_id)
+                        if e.held:
+                            st.warning("Another user is booking this slot right now. Please choose another time.")
+                        else:
+                            st.warning("This slot is already booked. Please choose another time.")
+                    except ValueError:
+                        st.warning("The end time must be after the start time.")
+                
                 # Show the selected time range in a nice info box
                 st.markdown(f"""
                 <div style="background-color: rgba(111, 78, 55, 0.1); 
@@ -921,12 +951,14 @@ def show_booking_page():
                     You selected: {booking_date.strftime("%A, %B %d, %Y")} from {start_time_str} to {end_time_str}
                 </div>
                 """, unsafe_allow_html=True)
+                if hold:
+                    st.caption(f"This slot is held for you for {HOLD_TTL // 60} minutes while you complete your booking.")
                 
                 # Time slot availability calendar
                 st.markdown("<h4 style='color: #3d2314; margin-top: 1.5rem;'>Equipment Availability</h4>", unsafe_allow_html=True)
                 
                 # Generate and display the calendar view
-                calendar_html = generate_calendar_view(st.session_state.booking_data, equipment_id)
+                calendar_html = generate_calendar_view(None, equipment_id, holds=database.get_holds(equipment_id))
                 st.markdown(calendar_html, unsafe_allow_html=True)
                 
                 # Purpose of booking
@@ -940,49 +972,31 @@ def show_booking_page():
                 # Book button
                 if st.button("Book Equipment", use_container_width=True):
                     with st.spinner("Processing your booking..."):
-                        time.sleep(0.5)  # Add a small delay for UX
-                        
                         if not purpose:
                             st.error("Please provide the purpose of booking.")
                         else:
-                            # Check for booking conflicts
-                            is_available = True
-                            for booking in st.session_state.booking_data:
-                                if booking["equipment_id"] == equipment_id and booking["status"] == "Confirmed":
-                                    # For bookings with time slots
-                                    if booking["start_date"] == date_str and "start_time" in booking and "end_time" in booking:
-                                        booking_start = booking["start_time"]
-                                        booking_end = booking["end_time"]
-                                        
-                                        # Check if time periods overlap
-                                        if (start_time_str <= booking_end and end_time_str >= booking_start):
-                                            is_available = False
-                                            break
-                            
-                            if not is_available:
+                            # Confirm the held slot, or book it directly if the hold lapsed;
+                            # the conflict check and the insert happen atomically
+                            try:
+                                new_booking = database.confirm_hold(hold["id"], purpose) if hold else None
+                                if new_booking is None:
+                                    database.add_booking(
+                                        st.session_state.user_email,
+                                        equipment_id,
+                                        date_str,
+                                        date_str,
+                                        purpose,
+                                        start_time=start_time_str,
+                                        end_time=end_time_str
+                                    )
+                            except database.BookingConflictError:
                                 st.error("The selected time slot is not available. Please choose another time.")
+                            except ValueError:
+                                st.error("The end time must be after the start time.")
                             else:
-                                # Create new booking with time slots
-                                new_booking = {
-                                    "id": len(st.session_state.booking_data) + 1,
-                                    "user_email": st.session_state.user_email,
-                                    "equipment_id": equipment_id,
-                                    "start_date": date_str,
-                                    "end_date": date_str,  # Same day booking with time slots
-                                    "start_time": start_time_str,
-                                    "end_time": end_time_str,
-                                    "purpose": purpose,
-                                    "status": "Confirmed",
-                                    "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                                }
-                                
-                                # Update equipment status
-                                for i, equip in enumerate(st.session_state.equipment_data):
-                                    if equip["id"] == equipment_id:
-                                        st.session_state.equipment_data[i]["status"] = "Booked"
-                                        break
-                                
-                                st.session_state.booking_data.append(new_booking)
+                                # The hold, if any, was consumed by the booking
+                                st.session_state.pop("slot_hold_id", None)
+                                st.session_state.slot_picked = False
                                 st.success(f"Successfully booked {equipment['name']} on {date_str} from {start_time_str} to {end_time_str}")
                                 st.balloons()  # Add a fun animation
                                 time.sleep(1)  # Show success message
@@ -1002,7 +1016,7 @@ def show_booking_page():
             </h3>
         """, unsafe_allow_html=True)
         
-        user_bookings = [b for b in st.session_state.booking_data if b["user_email"] == st.session_state.user_email]
+        user_bookings = database.get_user_bookings(st.session_state.user_email)
         
         if not user_bookings:
             no_bookings_html = """
@@ -1028,7 +1042,7 @@ def show_booking_page():
                     st.info("You don't have any active bookings.")
                 else:
                     for booking in active_bookings:
-                        equipment = next((e for e in st.session_state.equipment_data if e["id"] == booking["equipment_id"]), None)
+                        equipment = catalog.get(booking["equipment_id"])
                         equipment_name = equipment["name"] if equipment else "Unknown Equipment"
                         
                         booking_html = f"""
@@ -1079,21 +1093,11 @@ def show_booking_page():
                             with st.spinner("Processing cancellation..."):
                                 time.sleep(0.5)  # Add a small delay for UX
                                 
-                                for i, b in enumerate(st.session_state.booking_data):
-                                    if b["id"] == booking["id"]:
-                                        st.session_state.booking_data[i]["status"] = "Cancelled"
-                                        
-                                        # Update equipment status back to Available
-                                        equipment_id = b["equipment_id"]
-                                        for j, equip in enumerate(st.session_state.equipment_data):
-                                            if equip["id"] == equipment_id:
-                                                st.session_state.equipment_data[j]["status"] = "Available"
-                                                break
-                                        
-                                        st.success("Booking cancelled successfully.")
-                                        time.sleep(1)  # Show success message
-                                        st.rerun()
-                                        break
+                                # Frees the slot; the live status follows the booking timeline
+                                if database.update_booking_status(booking["id"], "Cancelled"):
+                                    st.success("Booking cancelled successfully.")
+                                    time.sleep(1)  # Show success message
+                                    st.rerun()
             
             # Display completed bookings
             with tab2:
@@ -1101,7 +1105,7 @@ def show_booking_page():
                     st.info("You don't have any completed bookings.")
                 else:
                     for booking in completed_bookings:
-                        equipment = next((e for e in st.session_state.equipment_data if e["id"] == booking["equipment_id"]), None)
+                        equipment = catalog.get(booking["equipment_id"])
                         equipment_name = equipment["name"] if equipment else "Unknown Equipment"
                         
                         booking_html = f"""
@@ -1152,7 +1156,7 @@ def show_booking_page():
                     st.info("You don't have any cancelled bookings.")
                 else:
                     for booking in cancelled_bookings:
-                        equipment = next((e for e in st.session_state.equipment_data if e["id"] == booking["equipment_id"]), None)
+                        equipment = catalog.get(booking["equipment_id"])
                         equipment_name = equipment["name"] if equipment else "Unknown Equipment"
                         
                         booking_html = f"""
@@ -0,0 +1,400 @@
+import bisect
+from datetime import date, datetime
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(day, time_str=None):
+    """
+    Convert a date and optional time to minutes since 0001-01-01
+
+    Args:
+        day (date or str): Date object or string in format YYYY-MM-DD
+        time_str (str): Time in format HH:MM, or None for midnight
+
+    Returns:
+        int: Absolute minute
+    """
+    if isinstance(day, datetime):
+        day = day.date()
+    elif isinstance(day, str):
+        day = date.fromisoformat(day)
+
+    minutes = day.toordinal() * MINUTES_PER_DAY
+    if time_str:
+        minutes += int(time_str[:2]) * 60 + int(time_str[3:5])
+    return minutes
+
+
+def request_span(start_date, end_date=None, start_time=None, end_time=None):
+    """
+    Get the half-open [start, end) minute interval covered by a booking request
+
+    Requests with a start and end time cover that time range on start_date.
+    Requests without times cover whole days from start_date to end_date inclusive.
+
+    Returns:
+        tuple: (start, end) in absolute minutes
+
+    Raises:
+        ValueError: If the request ends at or before its start
+    """
+    start, end = _span(start_date, end_date, start_time, end_time)
+    if end <= start:
+        raise ValueError("A booking must end after it starts")
+    return start, end
+
+
+def _span(start_date, end_date=None, start_time=None, end_time=None):
+    if start_time and end_time:
+        return to_minutes(start_date, start_time), to_minutes(start_date, end_time)
+
+    return to_minutes(start_date), to_minutes(end_date or start_date) + MINUTES_PER_DAY
+
+
+def booking_span(booking):
+    """Get the half-open [start, end) minute interval occupied by a booking record"""
+    if booking.get("start_at") is not None:
+        return booking["start_at"], booking["end_at"]
+
+    # Stored records are taken as they are, even if they predate validation
+    return _span(
+        booking["start_date"],
+        booking.get("end_date"),
+        booking.get("start_time"),
+        booking.get("end_time")
+    )
+
+
+def normalize_booking(booking):
+    """
+    Parse a booking's dates and times once, at write time
+
+    Stores the occupied interval as integer minutes in "start_at" and "end_at"
+    so that comparisons never re-parse the display strings.
+
+    Returns:
+        dict: The same booking record
+    """
+    booking.pop("start_at", None)
+    booking.pop("end_at", None)
+    booking["start_at"], booking["end_at"] = booking_span(booking)
+    return booking
+
+
+def time_slots(start_hour, end_hour, interval):
+    """
+    Generate HH:MM time slots from start_hour to end_hour inclusive
+
+    Returns:
+        tuple: Time slots in format HH:MM
+    """
+    return tuple(
+        f"{minute // 60:02d}:{minute % 60:02d}"
+        for minute in range(start_hour * 60, end_hour * 60 + 1, interval)
+    )
+
+
+def minutes_to_date(minutes):
+    """Get the date an absolute minute falls on"""
+    return date.fromordinal(minutes // MINUTES_PER_DAY)
+
+
+def format_time(minutes):
+    """Format the time of day of an absolute minute as HH:MM"""
+    minute_of_day = minutes % MINUTES_PER_DAY
+    return f"{minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+
+# Intervals longer than this are kept apart from the rest, so one multi-day
+# booking does not widen every lookup on its equipment
+LONG_INTERVAL = MINUTES_PER_DAY
+
+
+class IntervalIndex:
+    """
+    Per-equipment index of booked intervals answering overlap queries
+
+    Each equipment keeps its intervals as (start, end, booking_id) tuples
+    sorted by start. For intervals up to LONG_INTERVAL long, the longest one
+    still indexed bounds how far back an overlap can start, so two bisects
+    bound the only entries that can overlap a query. The rare longer
+    intervals sit in a separate list that is scanned, so a lookup costs
+    O(log n) plus the neighbouring entries and the long intervals.
+    """
+
+    def __init__(self):
+        self._entries = {}     # equipment_id -> sorted list of (start, end, booking_id), up to LONG_INTERVAL
+        self._long = {}        # equipment_id -> sorted list of (start, end, booking_id), longer intervals
+        self._lengths = {}     # equipment_id -> {length: count} over the entries in _entries
+        self._max_length = {}  # equipment_id -> longest interval in _entries
+        self._spans = {}       # booking_id -> (equipment_id, start, end)
+
+    @classmethod
+    def from_bookings(cls, bookings, status="Confirmed"):
+        """Build an index over all bookings with the given status"""
+        index = cls()
+        for booking in bookings:
+            if booking["status"] == status:
+                index.add_booking(booking)
+        return index
+
+    def __contains__(self, booking_id):
+        return booking_id in self._spans
+
+    def __len__(self):
+        return len(self._spans)
+
+    def add(self, booking_id, equipment_id, start, end):
+        """Index a booking occupying [start, end) on the given equipment"""
+        if booking_id in self._spans:
+            self.remove(booking_id)
+
+        length = end - start
+        if length > LONG_INTERVAL:
+            bisect.insort(self._long.setdefault(equipment_id, []), (start, end, booking_id))
+        else:
+            bisect.insort(self._entries.setdefault(equipment_id, []), (start, end, booking_id))
+            lengths = self._lengths.setdefault(equipment_id, {})
+            lengths[length] = lengths.get(length, 0) + 1
+            self._max_length[equipment_id] = max(self._max_length.get(equipment_id, 0), length)
+        self._spans[booking_id] = (equipment_id, start, end)
+
+    def add_booking(self, booking):
+        """Index a booking record"""
+        start, end = booking_span(booking)
+        self.add(booking["id"], booking["equipment_id"], start, end)
+
+    def remove(self, booking_id):
+        """
+        Remove a booking from the index
+
+        Returns:
+            bool: True if the booking was indexed, False otherwise
+        """
+        span = self._spans.pop(booking_id, None)
+        if span is None:
+            return False
+
+        equipment_id, start, end = span
+        length = end - start
+        entries = self._long[equipment_id] if length > LONG_INTERVAL else self._entries[equipment_id]
+        del entries[bisect.bisect_left(entries, (start, end, booking_id))]
+
+        if length <= LONG_INTERVAL:
+            # Shrink the bound once the last interval of the longest length is gone
+            lengths = self._lengths[equipment_id]
+            lengths[length] -= 1
+            if not lengths[length]:
+                del lengths[length]
+                if length == self._max_length[equipment_id]:
+                    self._max_length[equipment_id] = max(lengths, default=0)
+        return True
+
+    def has_equipment(self, equipment_id):
+        """Check whether any booking on the equipment is indexed"""
+        return bool(self._entries.get(equipment_id) or self._long.get(equipment_id))
+
+    def _overlapping_entries(self, equipment_id, start, end):
+        """Get the (start, end, booking_id) entries on the equipment that overlap [start, end), sorted by start"""
+        found = []
+        entries = self._entries.get(equipment_id)
+        if entries:
+            # Entries starting at or after `end` cannot overlap, and neither can
+            # entries starting so early that even the longest interval ends by `start`
+            high = bisect.bisect_left(entries, (end,))
+            low = bisect.bisect_left(entries, (start - self._max_length[equipment_id] + 1,), 0, high)
+            found = [entry for entry in entries[low:high] if entry[1] > start]
+
+        long_entries = self._long.get(equipment_id)
+        if long_entries:
+            high = bisect.bisect_left(long_entries, (end,))
+            extra = [entry for entry in long_entries[:high] if entry[1] > start]
+            if extra:
+                found = sorted(found + extra)
+        return found
+
+    def overlapping(self, equipment_id, start, end, exclude_booking_id=None):
+        """
+        Find bookings on the equipment that overlap [start, end)
+
+        Returns:
+            list: Booking IDs of the overlapping bookings
+        """
+        return [
+            booking_id
+            for entry_start, entry_end, booking_id in self._overlapping_entries(equipment_id, start, end)
+            if booking_id != exclude_booking_id
+        ]
+
+    def has_overlap(self, equipment_id, start, end, exclude_booking_id=None):
+        """Check whether any booking on the equipment overlaps [start, end)"""
+        return bool(self.overlapping(equipment_id, start, end, exclude_booking_id))
+
+    def intervals(self, equipment_id, start, end):
+        """
+        Get the intervals on the equipment that overlap [start, end)
+
+        Returns:
+            list: (start, end) pairs sorted by start
+        """
+        return [
+            (entry_start, entry_end)
+            for entry_start, entry_end, booking_id in self._overlapping_entries(equipment_id, start, end)
+        ]
+
+    def busy_until(self, equipment_id, at):
+        """
+        Find when the equipment next becomes free, if it is busy at minute `at`
+
+        Back-to-back and overlapping bookings count as one busy stretch.
+
+        Returns:
+            int: Absolute minute the busy stretch ends, or None if free at `at`
+        """
+        until = None
+        while True:
+            # The entries overlapping [at, at + 1) are exactly those busy at `at`
+            ends = [entry_end for entry_start, entry_end, booking_id in self._overlapping_entries(equipment_id, at, at + 1)]
+            if not ends:
+                return until
+
+            until = at = max(ends)
+
+    def next_start(self, equipment_id, after):
+        """
+        Find the first booking on the equipment starting at or after minute `after`
+
+        Returns:
+            int: Absolute start minute, or None if there is none
+        """
+        starts = []
+        for entries in (self._entries.get(equipment_id), self._long.get(equipment_id)):
+            if entries:
+                position = bisect.bisect_left(entries, (after,))
+                if position < len(entries):
+                    starts.append(entries[position][0])
+        return min(starts, default=None)
+
+
+class StartIndex:
+    """
+    Confirmed bookings ordered by start time, globally and per user
+
+    Each ordering is a sorted list of (start, booking_id) pairs, so "what
+    starts between t0 and t1" is two bisections plus the k matches.
+    """
+
+    def __init__(self):
+        self._all = []       # [(start, booking_id)] sorted
+        self._by_user = {}   # user_email -> [(start, booking_id)] sorted
+        self._keys = {}      # booking_id -> (user_email, start)
+
+    @classmethod
+    def from_bookings(cls, bookings, status="Confirmed"):
+        """Build an index over all bookings with the given status"""
+        index = cls()
+        for booking in bookings:
+            if booking["status"] == status:
+                index.add_booking(booking)
+        return index
+
+    def __contains__(self, booking_id):
+        return booking_id in self._keys
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, booking_id, user_email, start):
+        """Index a booking starting at the given absolute minute"""
+        if booking_id in self._keys:
+            self.remove(booking_id)
+
+        bisect.insort(self._all, (start, booking_id))
+        bisect.insort(self._by_user.setdefault(user_email, []), (start, booking_id))
+        self._keys[booking_id] = (user_email, start)
+
+    def add_booking(self, booking):
+        """Index a booking record"""
+        self.add(booking["id"], booking["user_email"], booking_span(booking)[0])
+
+    def remove(self, booking_id):
+        """
+        Remove a booking from the index
+
+        Returns:
+            bool: True if the booking was indexed, False otherwise
+        """
+        key = self._keys.pop(booking_id, None)
+        if key is None:
+            return False
+
+        user_email, start = key
+        for entries in (self._all, self._by_user[user_email]):
+            del entries[bisect.bisect_left(entries, (start, booking_id))]
+        return True
+
+    def starting_between(self, start, end, user_email=None):
+        """
+        Get the bookings that start within [start, end)
+
+        Args:
+            start (int): Absolute minute
+            end (int): Absolute minute
+            user_email (str): Only this user's bookings, or None for everyone's
+
+        Returns:
+            list: Booking IDs ordered by start time
+        """
+        entries = self._all if user_email is None else self._by_user.get(user_email, [])
+        low = bisect.bisect_left(entries, (start,))
+        high = bisect.bisect_left(entries, (end,), low)
+        return [booking_id for _, booking_id in entries[low:high]]
+
+
+class UserBookingIndex:
+    """
+    Secondary index from user email to that user's bookings
+
+    Each user maps to an insertion-ordered {booking_id: status} dictionary,
+    so listing one user's bookings costs O(k) in their own bookings.
+    """
+
+    def __init__(self):
+        self._by_user = {}   # user_email -> {booking_id: status}
+        self._owners = {}    # booking_id -> user_email
+
+    @classmethod
+    def from_bookings(cls, bookings):
+        """Build an index over all bookings"""
+        index = cls()
+        for booking in bookings:
+            index.add_booking(booking)
+        return index
+
+    def add_booking(self, booking):
+        """Index a booking record under its user"""
+        self._by_user.setdefault(booking["user_email"], {})[booking["id"]] = booking["status"]
+        self._owners[booking["id"]] = booking["user_email"]
+
+    def update_status(self, booking_id, status):
+        """Record a booking's new status"""
+        user_email = self._owners.get(booking_id)
+        if user_email is not None:
+            self._by_user[user_email][booking_id] = status
+
+    def booking_ids(self, user_email, status=None):
+        """
+        Get the IDs of a user's bookings in the order they were made
+
+        Args:
+            user_email (str): User's email
+            status (str): Only return bookings with this status, or None for all
+
+        Returns:
+            list: Booking IDs
+        """
+        bookings = self._by_user.get(user_email, {})
+        if status is None:
+            return list(bookings)
+        return [booking_id for booking_id, booking_status in bookings.items() if booking_status == status]
@@ -1,9 +1,12 @@
 #!/bin/bash
 
+# Stop on the first error so a failed javac is reported to the caller
+set -e
+
 # Create the classes directory if it doesn't exist
 mkdir -p classes
 
-# Compile Java files
-javac -d classes java_src/*.java
+# Compile Java files (the gateway needs the bundled py4j jar on the classpath)
+javac -d classes -cp java_gateway/lib/py4j-0.10.9.9.jar java_src/*.java java_gateway/*.java
 
-echo "Java compilation completed"
\ No newline at end of file
+echo "Java compilation completed"
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import database
 from datetime import datetime, timedelta
+from booking_index import format_time, minutes_to_date
 import booking
 
 def show_dashboard():
@@ -9,32 +10,35 @@ def show_dashboard():
     st.title("Dashboard")
     st.markdown("### Welcome to the Smart Lab Resource Management System")
     
+    catalog = database.get_catalog()
+    equipment_list = catalog.values()
+    
     # Summary statistics
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.metric(label="Total Equipment", value=len(st.session_state.equipment_data))
+        st.metric(label="Total Equipment", value=len(equipment_list))
     
     with col2:
-        available_count = sum(1 for item in st.session_state.equipment_data if item["status"] == "Available")
+        available_count = sum(1 for item in equipment_list if item["status"] == "Available")
         st.metric(label="Available Equipment", value=available_count)
     
     with col3:
-        user_bookings = [b for b in st.session_state.booking_data if b["user_email"] == st.session_state.user_email]
+        user_bookings = database.get_user_bookings(st.session_state.user_email)
         st.metric(label="My Bookings", value=len(user_bookings))
     
     # Recent bookings
     st.subheader("My Recent Bookings")
     if user_bookings:
         # Sort bookings by date (newest first)
-        user_bookings.sort(key=lambda x: datetime.strptime(x["start_date"], "%Y-%m-%d"), reverse=True)
+        user_bookings.sort(key=lambda x: x["start_at"], reverse=True)
         
         # Display the most recent 5 bookings
         recent_bookings = user_bookings[:5]
         booking_data = []
         
         for b in recent_bookings:
-            equipment = next((e for e in st.session_state.equipment_data if e["id"] == b["equipment_id"]), None)
+            equipment = catalog.get(b["equipment_id"])
             equipment_name = equipment["name"] if equipment else "Unknown"
             booking_data.append({
                 "Equipment": equipment_name,
@@ -55,15 +59,17 @@ def show_dashboard():
     
     # Available equipment
     st.subheader("Available Equipment")
-    available_equipment = [e for e in st.session_state.equipment_data if e["status"] == "Available"]
+    available_equipment = [e for e in equipment_list if e["status"] == "Available"]
     
     if available_equipment:
         equipment_data = []
         for e in available_equipment:
+            busy, free_until = database.get_live_status(e["id"])
             equipment_data.append({
                 "Name": e["name"],
                 "Category": e["category"],
-                "Location": e["location"]
+                "Location": e["location"],
+                "Free Until": f"{minutes_to_date(free_until):%b %d} {format_time(free_until)}" if free_until else "No bookings ahead"
             })
         
         df = pd.DataFrame(equipment_data)
@@ -79,10 +85,14 @@ def show_dashboard():
     st.subheader("Quick Book Equipment")
     
     # Show only available equipment
-    equipment_options = [e["name"] for e in st.session_state.equipment_data if e["status"] == "Available"]
+    equipment_options = [e["id"] for e in equipment_list if e["status"] == "Available"]
     
     if equipment_options:
-        selected_equipment = st.selectbox("Select Equipment", options=equipment_options)
+        selected_id = st.selectbox(
+            "Select Equipment",
+            options=equipment_options,
+            format_func=lambda equipment_id: catalog.get(equipment_id)["name"]
+        )
         
         col1, col2 = st.columns(2)
         with col1:
@@ -92,41 +102,18 @@ def show_dashboard():
         
         if st.button("Book Now"):
             # Find the equipment id
-            equipment = next((e for e in st.session_state.equipment_data if e["name"] == selected_equipment), None)
+            equipment = database.get_equipment(selected_id)
             
             if equipment:
-                # Check for booking conflicts
-                conflict = False
-                for booking in st.session_state.booking_data:
-                    if booking["equipment_id"] == equipment["id"]:
-                        booking_start = datetime.strptime(booking["start_date"], "%Y-%m-%d")
-                        booking_end = datetime.strptime(booking["end_date"], "%Y-%m-%d")
-                        
-                        if (start_date <= booking_end.date() and end_date >= booking_start.date()):
-                            conflict = True
-                            break
-                
-                if conflict:
+                # The conflict check and the insert happen atomically
+                try:
+                    database.add_booking(st.session_state.user_email, equipment["id"], start_date, end_date)
+                except database.BookingConflictError:
                     st.error("This equipment is already booked for the selected dates.")
+                except ValueError:
+                    st.error("The end date must not be before the start date.")
                 else:
-                    new_booking = {
-                        "id": len(st.session_state.booking_data) + 1,
-                        "user_email": st.session_state.user_email,
-                        "equipment_id": equipment["id"],
-                        "start_date": start_date.strftime("%Y-%m-%d"),
-                        "end_date": end_date.strftime("%Y-%m-%d"),
-                        "status": "Confirmed",
-                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    }
-                    
-                    # Update equipment status
-                    for i, equip in enumerate(st.session_state.equipment_data):
-                        if equip["id"] == equipment["id"]:
-                            st.session_state.equipment_data[i]["status"] = "Booked"
-                            break
-                    
-                    st.session_state.booking_data.append(new_booking)
-                    st.success(f"Successfully booked {selected_equipment} from {start_date} to {end_date}")
+                    st.success(f"Successfully booked {equipment['name']} from {start_date} to {end_date}")
                     st.rerun()
     else:
         st.warning("No equipment is currently available for booking.")
@@ -1,5 +1,7 @@
-import streamlit as st
-from datetime import datetime, timedelta
+import threading
+from datetime import timedelta
+from engine import Engine
+from storage import BookingConflictError, create_storage
 
 # Initialize equipment data
 def initialize_equipment():
@@ -96,141 +98,225 @@ def initialize_equipment():
         }
     ]
 
+# Shared engine, created once per server process
+_engine = None
+_lock = threading.Lock()
+
+def get_engine():
+    """Get the booking engine shared by all sessions"""
+    global _engine
+    with _lock:
+        if _engine is None:
+            _engine = Engine(create_storage(), initialize_equipment())
+            _engine.completions.start()
+    return _engine
+
+def get_storage():
+    """Get the storage backend shared by all sessions"""
+    return get_engine().storage
+
 # User database functions
 def get_user(email):
     """Get user data by email"""
-    if "users" not in st.session_state:
-        st.session_state.users = {}
-    
-    return st.session_state.users.get(email)
+    return get_engine().users.get(email)
 
 def add_user(email, password, user_data=None):
     """Add new user with category information"""
-    if "users" not in st.session_state:
-        st.session_state.users = {}
-    
-    user = {
-        "email": email,
-        "password": password,
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    # Add additional user data if provided
-    if user_data:
-        user.update(user_data)
-    
-    st.session_state.users[email] = user
-    
-    return st.session_state.users[email]
+    return get_engine().users.add(email, password, user_data)
 
 def update_user(email, data):
     """Update user data"""
-    if "users" not in st.session_state:
-        st.session_state.users = {}
-    
-    if email in st.session_state.users:
-        st.session_state.users[email].update(data)
-        return st.session_state.users[email]
-    
-    return None
+    return get_engine().users.update(email, data)
+
+def set_user_password(email, password):
+    """Change a user's password"""
+    return get_engine().users.set_password(email, password)
+
+def authenticate_user(email, password):
+    """Get the user if the password is right, otherwise None"""
+    return get_engine().users.authenticate(email, password)
 
 # Equipment database functions
+def get_catalog():
+    """
+    Get the current version of the shared equipment catalog
+    
+    Take one version per page render and read from it, so the page sees a
+    consistent catalog even while an admin is editing it. Statuses are live:
+    equipment is "Booked" only while a confirmed booking is in progress.
+    """
+    return get_engine().equipment_view()
+
+def get_all_equipment():
+    """Get all equipment"""
+    return get_catalog().values()
+
 def get_equipment(equipment_id):
     """Get equipment by ID"""
-    for equipment in st.session_state.equipment_data:
-        if equipment["id"] == equipment_id:
-            return equipment
-    return None
+    return get_catalog().get(equipment_id)
+
+def find_earliest_slots(category, duration, first_date, days=7, work_start="08:00", work_end="18:00", k=5):
+    """Find the k earliest free slots of the given length on any equipment in a category"""
+    return get_engine().earliest_slots(category, duration, first_date, days, work_start, work_end, k)
+
+def get_live_status(equipment_id):
+    """
+    Get whether equipment is in use right now
+    
+    Returns:
+        tuple: (busy, until) where until is the absolute minute the answer
+        changes, or None if the equipment is free with nothing booked ahead
+    """
+    return get_engine().live.state(equipment_id)
 
 def update_equipment_status(equipment_id, status):
     """Update equipment status"""
-    for i, equipment in enumerate(st.session_state.equipment_data):
-        if equipment["id"] == equipment_id:
-            st.session_state.equipment_data[i]["status"] = status
-            return True
-    return False
+    return get_engine().catalog.set_status(equipment_id, status)
 
 def add_equipment(name, description, category, location, status="Available", image_url=None):
     """Add new equipment"""
-    new_id = max([item["id"] for item in st.session_state.equipment_data], default=0) + 1
-    
-    new_equipment = {
-        "id": new_id,
-        "name": name,
-        "description": description,
-        "category": category,
-        "location": location,
-        "status": status,
-        "image_url": image_url
-    }
-    
-    st.session_state.equipment_data.append(new_equipment)
-    return new_equipment
+    return get_engine().catalog.add(name, description, category, location, status, image_url)
 
 def update_equipment(equipment_id, data):
     """Update equipment data"""
-    for i, equipment in enumerate(st.session_state.equipment_data):
-        if equipment["id"] == equipment_id:
-            st.session_state.equipment_data[i].update(data)
-            return st.session_state.equipment_data[i]
-    return None
+    return get_engine().catalog.update(equipment_id, data)
+
+def has_confirmed_bookings(equipment_id):
+    """Check if equipment has any confirmed bookings"""
+    return get_engine().bookings.has_confirmed(equipment_id)
 
 def delete_equipment(equipment_id):
     """Delete equipment by ID"""
-    # Check if equipment is currently booked
-    for booking in st.session_state.booking_data:
-        if booking["equipment_id"] == equipment_id and booking["status"] == "Confirmed":
-            return False, "Cannot delete equipment that is currently booked"
-    
-    # Remove equipment
-    for i, equipment in enumerate(st.session_state.equipment_data):
-        if equipment["id"] == equipment_id:
-            del st.session_state.equipment_data[i]
-            return True, f"Equipment with ID {equipment_id} deleted successfully"
-    
-    return False, f"Equipment with ID {equipment_id} not found"
+    return get_engine().delete_equipment(equipment_id)
 
 # Booking database functions
-def add_booking(user_email, equipment_id, start_date, end_date, purpose=""):
-    """Add new booking"""
-    if "booking_data" not in st.session_state:
-        st.session_state.booking_data = []
-    
-    new_booking = {
-        "id": len(st.session_state.booking_data) + 1,
-        "user_email": user_email,
-        "equipment_id": equipment_id,
-        "start_date": start_date.strftime("%Y-%m-%d") if isinstance(start_date, datetime) else start_date,
-        "end_date": end_date.strftime("%Y-%m-%d") if isinstance(end_date, datetime) else end_date,
-        "purpose": purpose,
-        "status": "Confirmed",
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    
-    st.session_state.booking_data.append(new_booking)
-    
-    # Update equipment status
-    update_equipment_status(equipment_id, "Booked")
+def get_all_bookings():
+    """Get all bookings"""
+    return get_engine().bookings.all()
+
+def get_booking(booking_id):
+    """Get booking by ID"""
+    return get_engine().bookings.get(booking_id)
+
+def get_booking_index():
+    """Get the interval index over confirmed bookings"""
+    return get_engine().bookings.index
+
+def get_user_index():
+    """Get the user-to-bookings index"""
+    return get_engine().bookings.user_index
+
+def add_booking_listener(listener):
+    """Register a callable to be told when a booking starts or stops blocking its equipment"""
+    get_engine().bookings.add_listener(listener)
+
+def find_booking_conflicts(equipment_id, start_date, end_date=None, start_time=None, end_time=None, exclude_booking_id=None):
+    """Find confirmed bookings that overlap the requested period"""
+    return get_engine().bookings.find_conflicts(equipment_id, start_date, end_date, start_time, end_time, exclude_booking_id)
+
+def get_day_masks(equipment_id, first_date, days):
+    """Get the booked 5-minute cells of each day from first_date on, one bitset per day"""
+    bookings = get_engine().bookings
+    return [bookings.day_mask(equipment_id, first_date + timedelta(days=i)) for i in range(days)]
+
+def get_free_start_times(equipment_id, day, times, length=30):
+    """Keep the HH:MM start times on a day that are free for at least `length` minutes"""
+    return get_engine().bookings.free_starts(equipment_id, day, times, length)
+
+def get_free_end_times(equipment_id, day, start_time, times):
+    """Keep the HH:MM end times after start_time that do not run into a booking"""
+    free_until = get_engine().bookings.free_until(equipment_id, day, start_time)
+    return [t for t in times if start_time < t and int(t[:2]) * 60 + int(t[3:5]) <= free_until]
+
+def add_booking(user_email, equipment_id, start_date, end_date, purpose="", start_time=None, end_time=None):
+    """
+    Add new booking
     
-    return new_booking
+    Raises:
+        BookingConflictError: If the equipment is already booked for that period
+        ValueError: If the booking ends at or before its start
+    """
+    return get_engine().bookings.add(user_email, equipment_id, start_date, end_date, purpose, start_time, end_time)
 
 def update_booking_status(booking_id, status):
-    """Update booking status"""
-    for i, booking in enumerate(st.session_state.booking_data):
-        if booking["id"] == booking_id:
-            st.session_state.booking_data[i]["status"] = status
-            
-            # If cancelled, update equipment status back to Available
-            if status == "Cancelled":
-                equipment_id = booking["equipment_id"]
-                update_equipment_status(equipment_id, "Available")
-            
-            return True
-    return False
-
-def get_user_bookings(user_email):
-    """Get all bookings for a user"""
-    if "booking_data" not in st.session_state:
-        st.session_state.booking_data = []
+    """
+    Update booking status
+    
+    Raises:
+        BookingConflictError: If a booking is confirmed again but its time is now taken
+    """
+    return get_engine().bookings.update_status(booking_id, status)
+
+def get_user_bookings(user_email, status=None):
+    """Get all bookings for a user, optionally only those with the given status"""
+    return get_engine().bookings.for_user(user_email, status)
+
+def get_bookings_starting(start, end, user_email=None):
+    """Get the confirmed bookings starting within [start, end) in absolute minutes, optionally for one user"""
+    return get_engine().bookings.starting_between(start, end, user_email)
+
+# Slot hold functions
+def hold_slot(user_email, equipment_id, start_date, start_time=None, end_time=None, end_date=None):
+    """
+    Hold a slot for a user while they fill in the booking form
     
-    return [b for b in st.session_state.booking_data if b["user_email"] == user_email]
+    Raises:
+        BookingConflictError: If the slot is booked or held by another user
+        ValueError: If the slot ends at or before its start
+    """
+    return get_engine().bookings.hold(user_email, equipment_id, start_date, start_time, end_time, end_date)
+
+def get_holds(equipment_id=None):
+    """Get the live holds, optionally for one piece of equipment"""
+    return get_engine().bookings.holds(equipment_id)
+
+def release_hold(hold_id):
+    """Give up a hold"""
+    return get_engine().bookings.release_hold(hold_id)
+
+def confirm_hold(hold_id, purpose=""):
+    """Turn a hold into a confirmed booking; returns None if the hold has lapsed"""
+    return get_engine().bookings.confirm_hold(hold_id, purpose)
+
+# Lab session database functions
+def get_all_lab_sessions():
+    """Get all lab sessions"""
+    return get_engine().sessions.all()
+
+def get_lab_session(session_id):
+    """Get a lab session by ID"""
+    return get_engine().sessions.get(session_id)
+
+def get_upcoming_lab_sessions(status="Open"):
+    """Get sessions from today onwards with the given status"""
+    return get_engine().sessions.upcoming(status)
+
+def get_created_lab_sessions(user_email):
+    """Get the sessions a staff member created"""
+    return get_engine().sessions.created_by(user_email)
+
+def get_registered_lab_sessions(user_email):
+    """Get the sessions a user is registered for"""
+    return get_engine().sessions.registered(user_email)
+
+def add_lab_session(name, lab_room, session_date, start_time, end_time, capacity, description, topics, created_by):
+    """Schedule a lab session; returns None if the room is already taken"""
+    return get_engine().sessions.create(
+        name, lab_room, session_date, start_time, end_time, capacity, description, topics, created_by
+    )
+
+def register_for_lab_session(session_id, user_email):
+    """Register a user for a lab session"""
+    return get_engine().sessions.register(session_id, user_email)
+
+def unregister_from_lab_session(session_id, user_email):
+    """Remove a user from a lab session"""
+    return get_engine().sessions.unregister(session_id, user_email)
+
+def update_lab_session_status(session_id, status):
+    """Open or close registration for a lab session"""
+    return get_engine().sessions.set_status(session_id, status)
+
+def cancel_lab_session(session_id):
+    """Cancel a lab session"""
+    return get_engine().sessions.cancel(session_id)
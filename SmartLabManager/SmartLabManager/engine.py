@@ -0,0 +1,1165 @@
+import hashlib
+import heapq
+import hmac
+import itertools
+import os
+import threading
+import time
+from datetime import date, datetime
+
+from booking_index import (
+    MINUTES_PER_DAY, IntervalIndex, StartIndex, UserBookingIndex, format_time, minutes_to_date, request_span,
+    to_minutes
+)
+from records import KeyedCollection
+from slot_bitsets import CELL_MINUTES, SlotBitsets
+from slot_search import earliest_slots, free_starts
+from storage import BookingConflictError
+
+# Seconds a slot stays held for a user filling in the booking form
+HOLD_TTL = int(os.environ.get("SLAB_HOLD_TTL", "300"))
+
+# Longest the completion sweeper sleeps, so a changed system clock is noticed
+SWEEP_MAX_SLEEP = 60  # seconds
+
+
+def _date_string(value):
+    """Format a date as YYYY-MM-DD, passing strings through unchanged"""
+    return value.strftime("%Y-%m-%d") if hasattr(value, "strftime") else value
+
+
+# scrypt cost parameters for stored password hashes
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 2 ** 14, 8, 1
+
+
+def hash_password(password, salt=None):
+    """
+    Hash a password with a random salt for storage
+
+    Returns:
+        str: "scrypt$<salt hex>$<hash hex>"
+    """
+    salt = salt or os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    return f"scrypt${salt.hex()}${digest.hex()}"
+
+
+def _is_password_hash(value):
+    return isinstance(value, str) and value.startswith("scrypt$")
+
+
+def verify_password(stored, password):
+    """
+    Check a password against a stored hash
+
+    Accounts created before passwords were hashed still hold the plain
+    password; those are compared directly.
+    """
+    if not stored or not password:
+        return False
+    if not _is_password_hash(stored):
+        return hmac.compare_digest(stored.encode(), password.encode())
+
+    _, salt, _ = stored.split("$")
+    return hmac.compare_digest(hash_password(password, bytes.fromhex(salt)), stored)
+
+
+class UserStore:
+    """User accounts, read and written straight through to storage; passwords are stored hashed"""
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._lock = threading.Lock()
+
+    def get(self, email):
+        """Get user data by email"""
+        return self.storage.get_user(email)
+
+    def add(self, email, password, user_data=None):
+        """Add new user with category information"""
+        user = {
+            "email": email,
+            "password": hash_password(password),
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+        # Add additional user data if provided
+        if user_data:
+            user.update({key: value for key, value in user_data.items() if key != "password"})
+
+        return self.storage.save_user(user)
+
+    def authenticate(self, email, password):
+        """
+        Check a user's password
+
+        A plain password left over from before hashing is replaced with a
+        hash on the first successful login.
+
+        Returns:
+            dict: The user, or None if the email or password is wrong
+        """
+        user = self.storage.get_user(email)
+        if user is None or not verify_password(user.get("password"), password):
+            return None
+
+        if not _is_password_hash(user["password"]):
+            with self._lock:
+                user["password"] = hash_password(password)
+                user = self.storage.save_user(user)
+        return user
+
+    def update(self, email, data):
+        """
+        Update user data
+
+        Any "password" in the data is ignored, so saving a stale copy of the
+        user never touches the stored hash; use set_password to change it.
+
+        Returns:
+            dict: The updated user, or None if the user does not exist
+        """
+        with self._lock:
+            user = self.storage.get_user(email)
+            if user is None:
+                return None
+
+            user.update({key: value for key, value in data.items() if key != "password"})
+            return self.storage.save_user(user)
+
+    def set_password(self, email, password):
+        """
+        Replace a user's password with a hash of the new plain password
+
+        Returns:
+            dict: The updated user, or None if the user does not exist
+        """
+        with self._lock:
+            user = self.storage.get_user(email)
+            if user is None:
+                return None
+
+            user["password"] = hash_password(password)
+            return self.storage.save_user(user)
+
+
+class CatalogVersion:
+    """
+    One published version of the equipment catalog
+
+    A version is never modified after it is published, so any number of
+    sessions can read the same one without copying or locking. Writes build
+    the next version instead; records are shared between versions and must
+    be treated as read-only.
+    """
+
+    def __init__(self, number, records):
+        self.number = number
+        self._records = records  # equipment_id -> record, in insertion order
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def __contains__(self, equipment_id):
+        return equipment_id in self._records
+
+    def get(self, equipment_id, default=None):
+        """Get equipment by ID"""
+        return self._records.get(equipment_id, default)
+
+    def values(self):
+        """Get all equipment as a list, in insertion order"""
+        return list(self._records.values())
+
+    def with_record(self, record):
+        """Get the next version, with the record added or replaced"""
+        records = dict(self._records)
+        records[record["id"]] = record
+        return CatalogVersion(self.number + 1, records)
+
+    def without(self, equipment_id):
+        """Get the next version, with the equipment removed"""
+        records = dict(self._records)
+        del records[equipment_id]
+        return CatalogVersion(self.number + 1, records)
+
+
+class Catalog:
+    """
+    The equipment catalog shared by every session
+
+    Readers take the current CatalogVersion, a single reference read. Writers
+    serialise on a lock, write through to storage and publish a new version
+    with copied-on-write records, so a page that is halfway through
+    rendering keeps a consistent view.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._lock = threading.Lock()
+        self._current = CatalogVersion(1, {equipment["id"]: equipment for equipment in storage.list_equipment()})
+
+    @property
+    def current(self):
+        """The latest published version"""
+        return self._current
+
+    @property
+    def version(self):
+        """Number of the latest published version"""
+        return self._current.number
+
+    def all(self):
+        """Get all equipment"""
+        return self._current.values()
+
+    def get(self, equipment_id):
+        """Get equipment by ID"""
+        return self._current.get(equipment_id)
+
+    def add(self, name, description, category, location, status="Available", image_url=None):
+        """Add new equipment"""
+        new_equipment = {
+            "name": name,
+            "description": description,
+            "category": category,
+            "location": location,
+            "status": status,
+            "image_url": image_url
+        }
+
+        with self._lock:
+            new_equipment = self.storage.add_equipment(new_equipment)
+            self._current = self._current.with_record(new_equipment)
+        return new_equipment
+
+    def update(self, equipment_id, data):
+        """
+        Update equipment data
+
+        Returns:
+            dict: The updated equipment, or None if it does not exist
+        """
+        with self._lock:
+            equipment = self._current.get(equipment_id)
+            if equipment is None:
+                return None
+
+            # Re-saving an unchanged edit form is a no-op; skip the write and the new version
+            if all(equipment.get(key) == value for key, value in data.items()):
+                return equipment
+
+            self.storage.update_equipment(equipment_id, data)
+            equipment = {**equipment, **data}
+            self._current = self._current.with_record(equipment)
+        return equipment
+
+    def set_status(self, equipment_id, status):
+        """Update equipment status"""
+        return self.update(equipment_id, {"status": status}) is not None
+
+    def delete(self, equipment_id):
+        """
+        Delete equipment by ID
+
+        Returns:
+            bool: True if the equipment existed, False otherwise
+        """
+        with self._lock:
+            deleted = self.storage.delete_equipment(equipment_id)
+            if equipment_id in self._current:
+                self._current = self._current.without(equipment_id)
+        return deleted
+
+
+def _now_minute():
+    """The current local time as an absolute minute"""
+    now = datetime.now()
+    return to_minutes(now.date()) + now.hour * 60 + now.minute
+
+
+class LiveStatus:
+    """
+    Whether each piece of equipment is in use right now, derived from the booking timeline
+
+    Answers ("busy until" or "free until" some minute) are cached per
+    equipment. Every booking start and end still ahead is kept in a min-heap
+    of transitions; a lookup pops the transitions that have passed and drops
+    just the answers they affect, so a status lookup is O(1) between events.
+    """
+
+    # Stored statuses that mean "whatever the bookings say"; anything else
+    # (e.g. "Maintenance") is an admin override shown as is
+    DERIVED_STATUSES = ("Available", "Booked")
+
+    def __init__(self, bookings, clock=_now_minute):
+        self.bookings = bookings
+        self.clock = clock
+        self.epoch = 0            # bumped whenever any cached answer is dropped
+        self._lock = threading.Lock()
+        self._answers = {}        # equipment_id -> (busy, until)
+        self._transitions = []    # min-heap of (minute, equipment_id)
+
+        now = clock()
+        for booking in bookings.all():
+            if booking["status"] == "Confirmed":
+                self._schedule(booking, now)
+        heapq.heapify(self._transitions)
+        bookings.add_listener(self._on_booking_change)
+
+    def _schedule(self, booking, now):
+        for minute in (booking["start_at"], booking["end_at"]):
+            if minute > now:
+                self._transitions.append((minute, booking["equipment_id"]))
+
+    def _on_booking_change(self, event, booking):
+        with self._lock:
+            if event == "confirmed":
+                for minute in (booking["start_at"], booking["end_at"]):
+                    if minute > self.clock():
+                        heapq.heappush(self._transitions, (minute, booking["equipment_id"]))
+
+            # A released booking leaves its transitions behind; they only cause a harmless refresh
+            self._answers.pop(booking["equipment_id"], None)
+            self.epoch += 1
+
+    def refresh(self):
+        """
+        Drop the answers invalidated by transitions that have now passed
+
+        Returns:
+            int: The current minute
+        """
+        now = self.clock()
+        with self._lock:
+            while self._transitions and self._transitions[0][0] <= now:
+                minute, equipment_id = heapq.heappop(self._transitions)
+                if self._answers.pop(equipment_id, None) is not None:
+                    self.epoch += 1
+        return now
+
+    def state(self, equipment_id):
+        """
+        Get whether the equipment is busy now, and until when that holds
+
+        Returns:
+            tuple: (busy, until) where until is an absolute minute, or None if
+            the equipment is free with nothing booked ahead
+        """
+        now = self.refresh()
+        with self._lock:
+            answer = self._answers.get(equipment_id)
+            if answer is None:
+                busy_until = self.bookings.busy_until(equipment_id, now)
+                if busy_until is not None:
+                    answer = (True, busy_until)
+                else:
+                    answer = (False, self.bookings.next_start(equipment_id, now))
+                self._answers[equipment_id] = answer
+            return answer
+
+    def status(self, equipment):
+        """Get the status to show for an equipment record"""
+        if equipment["status"] not in self.DERIVED_STATUSES:
+            return equipment["status"]
+
+        busy, until = self.state(equipment["id"])
+        return "Booked" if busy else "Available"
+
+
+class BookingStore:
+    """
+    Equipment bookings with their interval, per-user and start-time indexes and slot bitsets
+
+    Every write goes to storage, the ID-keyed cache, the indexes and the
+    bitsets under one lock, so reads never see a booking in one structure but
+    not another.
+    """
+
+    def __init__(self, storage, catalog):
+        self.storage = storage
+        self.catalog = catalog
+        self._lock = threading.RLock()
+        self._bookings = KeyedCollection(storage.list_bookings())
+        self._index = IntervalIndex.from_bookings(self._bookings)
+        self._user_index = UserBookingIndex.from_bookings(self._bookings)
+        self._starts = StartIndex.from_bookings(self._bookings)
+        self._slots = SlotBitsets.from_bookings(self._bookings)
+        self._listeners = []
+        self._equipment_locks = {}
+
+        # Soft holds: in-process only, never written to storage
+        self._holds = {}          # hold_id -> hold record
+        self._user_holds = {}     # user_email -> hold_id (one form, one hold)
+        self._hold_index = IntervalIndex()
+        self._hold_expiry = []    # min-heap of (expires_at, hold_id)
+        self._hold_ids = itertools.count(1)
+        self._holds_changed = threading.Condition(self._lock)
+        self._sweeper = None
+
+    @property
+    def index(self):
+        """Interval index over confirmed bookings"""
+        return self._index
+
+    @property
+    def user_index(self):
+        """Index from user email to bookings"""
+        return self._user_index
+
+    def all(self):
+        """Get all bookings"""
+        return self._bookings.values()
+
+    def get(self, booking_id):
+        """Get booking by ID"""
+        return self._bookings.get(booking_id)
+
+    def has_confirmed(self, equipment_id):
+        """Check if equipment has any confirmed bookings"""
+        with self._lock:
+            return self._index.has_equipment(equipment_id)
+
+    def for_user(self, user_email, status=None):
+        """Get all bookings for a user, optionally only those with the given status"""
+        with self._lock:
+            return [self._bookings[booking_id] for booking_id in self._user_index.booking_ids(user_email, status)]
+
+    def starting_between(self, start, end, user_email=None):
+        """Get the confirmed bookings that start within [start, end) in minutes, earliest first"""
+        with self._lock:
+            return [self._bookings[booking_id] for booking_id in self._starts.starting_between(start, end, user_email)]
+
+    def add_listener(self, listener):
+        """
+        Register a callable to be told when a booking starts or stops blocking its equipment
+
+        Listeners are called as listener(event, booking) with event "confirmed" or
+        "released", after the booking has been written and indexed.
+        """
+        self._listeners.append(listener)
+
+    def _notify(self, event, booking):
+        """Pass a booking change on to every registered listener"""
+        for listener in list(self._listeners):
+            try:
+                listener(event, booking)
+            except Exception as e:
+                print(f"Warning: Booking listener failed: {str(e)}")
+
+    def equipment_lock(self, equipment_id):
+        """Get the lock that serialises booking commits for one piece of equipment"""
+        with self._lock:
+            return self._equipment_locks.setdefault(equipment_id, threading.Lock())
+
+    def _overlapping(self, equipment_id, start, end):
+        """
+        Get the IDs of confirmed bookings overlapping [start, end) (called with self._lock held)
+
+        The bitsets clear most requests with one AND. A hit may only be a
+        neighbour sharing an edge cell, so it is confirmed on the interval index.
+        """
+        if self._slots.is_free(equipment_id, start, end):
+            return []
+        return self._index.overlapping(equipment_id, start, end)
+
+    def has_overlap(self, equipment_id, start, end, exclude_booking_id=None):
+        """Check whether a confirmed booking on the equipment overlaps [start, end) in minutes"""
+        with self._lock:
+            if exclude_booking_id is None:
+                return bool(self._overlapping(equipment_id, start, end))
+            return self._index.has_overlap(equipment_id, start, end, exclude_booking_id)
+
+    def day_mask(self, equipment_id, day):
+        """Get the bitset of 5-minute cells booked on one day (date or YYYY-MM-DD)"""
+        with self._lock:
+            return self._slots.day_mask(equipment_id, to_minutes(day) // MINUTES_PER_DAY)
+
+    def free_starts(self, equipment_id, day, starts, length):
+        """
+        Filter candidate start times on one day down to those free for `length` minutes
+
+        Args:
+            equipment_id (int): Equipment ID
+            day (date or str): Date of the candidates
+            starts (list): Candidate start times in format HH:MM
+            length (int): Minutes that must be free after each start
+
+        Returns:
+            list: The free start times, in the given order
+        """
+        by_minute = {int(start[:2]) * 60 + int(start[3:5]): start for start in starts}
+        day_start = to_minutes(day)
+        with self._lock:
+            free = set(self._slots.free_starts(equipment_id, day_start // MINUTES_PER_DAY, by_minute, length))
+            # Starts the bitsets reject may only share an edge cell with a booking
+            free.update(
+                minute for minute in by_minute
+                if minute not in free
+                and not self._index.has_overlap(equipment_id, day_start + minute, day_start + minute + length)
+            )
+        return [start for minute, start in by_minute.items() if minute in free]
+
+    def free_until(self, equipment_id, day, start_time):
+        """
+        Find when the free stretch starting at start_time on one day ends
+
+        Returns:
+            int: Minute of the day of the next booked cell, or MINUTES_PER_DAY if none
+        """
+        with self._lock:
+            return self._slots.free_until(
+                equipment_id, to_minutes(day) // MINUTES_PER_DAY, to_minutes(day, start_time) % MINUTES_PER_DAY
+            )
+
+    def _release_cells(self, booking):
+        """Clear a booking's cells, keeping any that another confirmed booking still covers"""
+        equipment_id, start, end = booking["equipment_id"], booking["start_at"], booking["end_at"]
+        self._slots.remove(equipment_id, start, end)
+        # Widen to whole cells so a neighbour sharing an edge cell keeps it
+        cell_start = start - start % CELL_MINUTES
+        cell_end = -(-end // CELL_MINUTES) * CELL_MINUTES
+        for other_start, other_end in self._index.intervals(equipment_id, cell_start, cell_end):
+            self._slots.add(equipment_id, other_start, other_end)
+
+    def busy_until(self, equipment_id, at):
+        """Get the minute the equipment's current busy stretch ends, or None if it is free at `at`"""
+        with self._lock:
+            return self._index.busy_until(equipment_id, at)
+
+    def busy_intervals(self, equipment_id, start, end):
+        """
+        Get the time the equipment is taken within [start, end), by bookings or live holds
+
+        Returns:
+            list: (start, end) pairs sorted by start
+        """
+        with self._lock:
+            self._expire_holds()
+            booked = self._index.intervals(equipment_id, start, end)
+            held = self._hold_index.intervals(equipment_id, start, end)
+        return sorted(booked + held) if held else booked
+
+    def next_start(self, equipment_id, after):
+        """Get the start minute of the equipment's next confirmed booking, or None"""
+        with self._lock:
+            return self._index.next_start(equipment_id, after)
+
+    def find_conflicts(self, equipment_id, start_date, end_date=None, start_time=None, end_time=None, exclude_booking_id=None):
+        """
+        Find confirmed bookings that overlap the requested period
+
+        Args:
+            equipment_id (int): Equipment ID
+            start_date (date or str): First day of the request
+            end_date (date or str): Last day of the request (defaults to start_date)
+            start_time (str): Start time in format HH:MM for same-day bookings
+            end_time (str): End time in format HH:MM for same-day bookings
+            exclude_booking_id (int): Booking to ignore, e.g. the one being updated
+
+        Returns:
+            list: IDs of the conflicting bookings
+        """
+        start, end = request_span(start_date, end_date, start_time, end_time)
+        with self._lock:
+            return self._index.overlapping(equipment_id, start, end, exclude_booking_id)
+
+    def add(self, user_email, equipment_id, start_date, end_date, purpose="", start_time=None, end_time=None):
+        """
+        Add new booking, checking for conflicts and inserting in one atomic step
+
+        Commits for the same equipment are serialised by a per-equipment lock,
+        and the storage backend repeats the check inside its write transaction
+        so other processes sharing the database are covered too.
+
+        The user's own hold on the slot is consumed; anyone else's live hold
+        on it blocks the booking.
+
+        Raises:
+            BookingConflictError: If a confirmed booking or another user's hold overlaps the request
+            ValueError: If the request ends at or before its start
+        """
+        new_booking = {
+            "user_email": user_email,
+            "equipment_id": equipment_id,
+            "start_date": _date_string(start_date),
+            "end_date": _date_string(end_date),
+            "purpose": purpose,
+            "status": "Confirmed",
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+        # Same-day bookings with time slots
+        if start_time and end_time:
+            new_booking["start_time"] = start_time
+            new_booking["end_time"] = end_time
+
+        # Parse the dates and times once; comparisons use the integer interval
+        new_booking["start_at"], new_booking["end_at"] = request_span(start_date, end_date, start_time, end_time)
+
+        with self.equipment_lock(equipment_id):
+            # Fail fast on the in-memory indexes before touching storage
+            held = self._check_free(new_booking)
+            new_booking = self.storage.add_booking_if_free(new_booking)
+            with self._lock:
+                self._bookings.add(new_booking)
+                self._index.add_booking(new_booking)
+                self._user_index.add_booking(new_booking)
+                self._starts.add_booking(new_booking)
+                self._slots.add(equipment_id, new_booking["start_at"], new_booking["end_at"])
+                for hold_id in held:
+                    self._drop_hold(hold_id)
+
+        self._notify("confirmed", new_booking)
+
+        return new_booking
+
+    def _check_free(self, booking):
+        """
+        Check that a booking's time is free before it is committed (called with its equipment lock held)
+
+        Returns:
+            list: IDs of the booking owner's own holds on the time, to drop once it is committed
+
+        Raises:
+            BookingConflictError: If a confirmed booking or another user's hold overlaps it
+        """
+        equipment_id, start, end = booking["equipment_id"], booking["start_at"], booking["end_at"]
+        with self._lock:
+            self._expire_holds()
+            conflicts = self._overlapping(equipment_id, start, end)
+            if conflicts:
+                raise BookingConflictError(equipment_id, conflicts)
+            held = self._overlapping_holds(equipment_id, start, end)
+            if any(self._holds[hold_id]["user_email"] != booking["user_email"] for hold_id in held):
+                raise BookingConflictError(equipment_id, [], held=True)
+        return held
+
+    def _reconfirm(self, booking):
+        """Confirm a cancelled or completed booking again, through the same checks as add"""
+        booking_id, equipment_id = booking["id"], booking["equipment_id"]
+        with self.equipment_lock(equipment_id):
+            if booking_id in self._index:
+                # Confirmed by another caller meanwhile
+                return True
+            held = self._check_free(booking)
+            self.storage.confirm_booking_if_free(booking_id)
+            with self._lock:
+                booking = self._bookings.update(booking_id, {"status": "Confirmed"})
+                self._user_index.update_status(booking_id, "Confirmed")
+                self._index.add_booking(booking)
+                self._starts.add_booking(booking)
+                self._slots.add(equipment_id, booking["start_at"], booking["end_at"])
+                for hold_id in held:
+                    self._drop_hold(hold_id)
+
+        self._notify("confirmed", booking)
+
+        return True
+
+    def update_status(self, booking_id, status):
+        """
+        Update booking status
+
+        Confirming a booking that is not currently confirmed goes through the
+        same conflict checks as add, so it cannot double-book the equipment.
+
+        Returns:
+            bool: True if the booking exists, False otherwise
+
+        Raises:
+            BookingConflictError: If the booking is being confirmed again and its time is taken
+        """
+        booking = self._bookings.get(booking_id)
+        if booking is None:
+            return False
+        if status == "Confirmed" and booking_id not in self._index:
+            return self._reconfirm(booking)
+
+        with self._lock:
+            if booking_id not in self._bookings:
+                return False
+
+            was_confirmed = booking_id in self._index
+            self.storage.update_booking(booking_id, {"status": status})
+            booking = self._bookings.update(booking_id, {"status": status})
+            self._user_index.update_status(booking_id, status)
+
+            # Only confirmed bookings block the equipment; the bitsets change
+            # only when a booking starts or stops being confirmed
+            if status == "Confirmed":
+                self._index.add_booking(booking)
+                self._starts.add_booking(booking)
+                if not was_confirmed:
+                    self._slots.add(booking["equipment_id"], booking["start_at"], booking["end_at"])
+            else:
+                self._index.remove(booking_id)
+                self._starts.remove(booking_id)
+                if was_confirmed:
+                    self._release_cells(booking)
+
+        self._notify("confirmed" if status == "Confirmed" else "released", booking)
+
+        return True
+
+    def hold(self, user_email, equipment_id, start_date, start_time=None, end_time=None, end_date=None, ttl=HOLD_TTL):
+        """
+        Reserve a slot for a user while they fill in the booking form
+
+        A user has at most one hold: holding a new slot releases the old one,
+        and holding the same slot again just extends it.
+
+        Args:
+            user_email (str): User's email
+            equipment_id (int): Equipment ID
+            start_date (date or str): Day of the slot
+            start_time (str): Start time in format HH:MM
+            end_time (str): End time in format HH:MM
+            end_date (date or str): Last day, for whole-day holds without times
+            ttl (int): Seconds until the hold lapses
+
+        Returns:
+            dict: The hold
+
+        Raises:
+            BookingConflictError: If the slot is booked or held by another user
+        """
+        start, end = request_span(start_date, end_date, start_time, end_time)
+        with self.equipment_lock(equipment_id), self._lock:
+            self._expire_holds()
+            expires_at = time.time() + ttl
+
+            current = self._holds.get(self._user_holds.get(user_email))
+            if current is not None and (current["equipment_id"], current["start_at"], current["end_at"]) == (equipment_id, start, end):
+                current["expires_at"] = expires_at
+                heapq.heappush(self._hold_expiry, (expires_at, current["id"]))
+                return dict(current)
+
+            conflicts = self._index.overlapping(equipment_id, start, end)
+            if conflicts:
+                raise BookingConflictError(equipment_id, conflicts)
+            if any(self._holds[hold_id]["user_email"] != user_email for hold_id in self._overlapping_holds(equipment_id, start, end)):
+                raise BookingConflictError(equipment_id, [], held=True)
+
+            if current is not None:
+                self._drop_hold(current["id"])
+
+            hold = {
+                "id": next(self._hold_ids),
+                "user_email": user_email,
+                "equipment_id": equipment_id,
+                "start_date": _date_string(start_date),
+                "end_date": _date_string(end_date or start_date),
+                "start_time": start_time,
+                "end_time": end_time,
+                "start_at": start,
+                "end_at": end,
+                "expires_at": expires_at
+            }
+            self._holds[hold["id"]] = hold
+            self._user_holds[user_email] = hold["id"]
+            self._hold_index.add(hold["id"], equipment_id, start, end)
+            heapq.heappush(self._hold_expiry, (expires_at, hold["id"]))
+
+            self._start_sweeper()
+            self._holds_changed.notify()
+            return dict(hold)
+
+    def get_hold(self, hold_id):
+        """Get a live hold by ID, or None if it was released or has lapsed"""
+        with self._lock:
+            self._expire_holds()
+            hold = self._holds.get(hold_id)
+            return dict(hold) if hold else None
+
+    def holds(self, equipment_id=None):
+        """Get the live holds, optionally for one piece of equipment"""
+        with self._lock:
+            self._expire_holds()
+            return [
+                dict(hold) for hold in self._holds.values()
+                if equipment_id is None or hold["equipment_id"] == equipment_id
+            ]
+
+    def release_hold(self, hold_id):
+        """
+        Give up a hold
+
+        Returns:
+            bool: True if the hold was live, False otherwise
+        """
+        with self._lock:
+            return self._drop_hold(hold_id)
+
+    def confirm_hold(self, hold_id, purpose=""):
+        """
+        Turn a hold into a confirmed booking
+
+        Returns:
+            dict: The new booking, or None if the hold has lapsed
+
+        Raises:
+            BookingConflictError: If the slot was taken regardless, e.g. by another process
+        """
+        hold = self.get_hold(hold_id)
+        if hold is None:
+            return None
+
+        return self.add(
+            hold["user_email"], hold["equipment_id"], hold["start_date"], hold["end_date"], purpose,
+            start_time=hold["start_time"], end_time=hold["end_time"]
+        )
+
+    def _overlapping_holds(self, equipment_id, start, end):
+        return self._hold_index.overlapping(equipment_id, start, end)
+
+    def _drop_hold(self, hold_id):
+        hold = self._holds.pop(hold_id, None)
+        if hold is None:
+            return False
+
+        self._hold_index.remove(hold_id)
+        if self._user_holds.get(hold["user_email"]) == hold_id:
+            del self._user_holds[hold["user_email"]]
+        return True
+
+    def _expire_holds(self):
+        """Drop every hold whose time is up (called with self._lock held)"""
+        now = time.time()
+        while self._hold_expiry and self._hold_expiry[0][0] <= now:
+            expires_at, hold_id = heapq.heappop(self._hold_expiry)
+            hold = self._holds.get(hold_id)
+
+            # Extending a hold leaves its earlier heap entry behind; skip those
+            if hold is not None and hold["expires_at"] == expires_at:
+                self._drop_hold(hold_id)
+
+    def _start_sweeper(self):
+        if self._sweeper is None:
+            self._sweeper = threading.Thread(target=self._sweep, name="booking-hold-sweeper", daemon=True)
+            self._sweeper.start()
+
+    def _sweep(self):
+        """Expire holds as they lapse, sleeping until the earliest expiry"""
+        with self._holds_changed:
+            while True:
+                self._expire_holds()
+                timeout = self._hold_expiry[0][0] - time.time() if self._hold_expiry else None
+                self._holds_changed.wait(timeout)
+
+
+class CompletionSweeper:
+    """
+    Moves confirmed bookings to "Completed" once they have ended
+
+    Confirmed bookings wait in a min-heap keyed on end time, so each sweep
+    only looks at the bookings that are actually due. Completing a booking
+    takes it out of the interval index and the confirmed set in storage,
+    keeping both proportional to bookings still ahead rather than all history.
+    """
+
+    def __init__(self, bookings, clock=_now_minute):
+        self.bookings = bookings
+        self.clock = clock
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._due = [(booking["end_at"], booking["id"]) for booking in bookings.all() if booking["status"] == "Confirmed"]
+        heapq.heapify(self._due)
+        self._wake = threading.Event()
+        self._thread = None
+        bookings.add_listener(self._on_booking_change)
+
+    def _on_booking_change(self, event, booking):
+        if event == "confirmed":
+            with self._lock:
+                heapq.heappush(self._due, (booking["end_at"], booking["id"]))
+                earliest = self._due[0][1] == booking["id"]
+            if earliest:
+                self._wake.set()
+
+    def sweep(self):
+        """
+        Complete every confirmed booking whose end time has passed
+
+        Returns:
+            int: Number of bookings completed
+        """
+        now = self.clock()
+        completed = 0
+        while True:
+            with self._lock:
+                if not self._due or self._due[0][0] > now:
+                    break
+                end_at, booking_id = heapq.heappop(self._due)
+
+            # Cancelled or rescheduled bookings leave stale entries behind
+            booking = self.bookings.get(booking_id)
+            if booking is not None and booking["status"] == "Confirmed" and booking["end_at"] == end_at:
+                self.bookings.update_status(booking_id, "Completed")
+                completed += 1
+
+        self.completed += completed
+        return completed
+
+    def start(self):
+        """Sweep on a daemon thread from now on"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="booking-completion-sweeper", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Warning: Booking completion sweep failed: {str(e)}")
+
+            with self._lock:
+                next_end = self._due[0][0] if self._due else None
+            timeout = SWEEP_MAX_SLEEP if next_end is None else min(SWEEP_MAX_SLEEP, max(0, next_end - self.clock()) * 60)
+            self._wake.wait(timeout)
+
+
+class SessionStore:
+    """
+    Lab sessions shared by every user
+
+    Sessions that are not cancelled are kept in an interval index keyed by
+    lab room, so scheduling a session checks only its own room.
+    """
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._lock = threading.RLock()
+        self._sessions = KeyedCollection(storage.list_lab_sessions())
+        self._rooms = IntervalIndex()
+        for session in self._sessions:
+            self._rooms.add(session["id"], session["lab_room"], session["start_at"], session["end_at"])
+
+    def all(self):
+        """Get all lab sessions"""
+        return self._sessions.values()
+
+    def get(self, session_id):
+        """Get a lab session by ID"""
+        return self._sessions.get(session_id)
+
+    def upcoming(self, status="Open", today=None):
+        """Get sessions on or after today with the given status"""
+        day_start = to_minutes(today or date.today())
+        with self._lock:
+            return [s for s in self._sessions if s["start_at"] >= day_start and s["status"] == status]
+
+    def created_by(self, user_email):
+        """Get the sessions a staff member created"""
+        with self._lock:
+            return [s for s in self._sessions if s["created_by"] == user_email]
+
+    def registered(self, user_email):
+        """Get the sessions a user is registered for"""
+        with self._lock:
+            return [s for s in self._sessions if user_email in s["participants"]]
+
+    def has_conflict(self, lab_room, start_at, end_at):
+        """Check whether a session in the room overlaps [start_at, end_at) in minutes"""
+        with self._lock:
+            return self._rooms.has_overlap(lab_room, start_at, end_at)
+
+    def create(self, name, lab_room, session_date, start_time, end_time, capacity, description, topics, created_by):
+        """
+        Schedule a lab session unless the room is already taken
+
+        Returns:
+            dict: The new session, or None if it overlaps another session in the room
+        """
+        start_at, end_at = request_span(session_date, None, start_time, end_time)
+        new_session = {
+            "name": name,
+            "lab_room": lab_room,
+            "date": _date_string(session_date),
+            "start_time": start_time,
+            "end_time": end_time,
+            "start_at": start_at,
+            "end_at": end_at,
+            "capacity": capacity,
+            "description": description,
+            "topics": topics,
+            "created_by": created_by,
+            "participants": [],
+            "status": "Open"
+        }
+
+        with self._lock:
+            if self._rooms.has_overlap(lab_room, start_at, end_at):
+                return None
+
+            new_session = self.storage.add_lab_session(new_session)
+            self._sessions.add(new_session)
+            self._rooms.add(new_session["id"], lab_room, start_at, end_at)
+        return new_session
+
+    def _save(self, session_id, data):
+        self.storage.update_lab_session(session_id, data)
+        return self._sessions.update(session_id, data)
+
+    def register(self, session_id, user_email):
+        """
+        Add a user to a session's participants
+
+        Returns:
+            bool: True if registered, False if the session is missing or full
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or len(session["participants"]) >= session["capacity"]:
+                return False
+            if user_email not in session["participants"]:
+                self._save(session_id, {"participants": session["participants"] + [user_email]})
+            return True
+
+    def unregister(self, session_id, user_email):
+        """Remove a user from a session's participants"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None or user_email not in session["participants"]:
+                return False
+            self._save(session_id, {"participants": [p for p in session["participants"] if p != user_email]})
+            return True
+
+    def set_status(self, session_id, status):
+        """Open or close registration for a session"""
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._save(session_id, {"status": status})
+            return True
+
+    def cancel(self, session_id):
+        """Cancel (delete) a session, freeing its room"""
+        with self._lock:
+            self._rooms.remove(session_id)
+            self._sessions.remove(session_id)
+            return self.storage.delete_lab_session(session_id)
+
+
+class Engine:
+    """
+    The booking engine: users, equipment, bookings and lab sessions over one storage handle
+
+    Nothing here depends on Streamlit, so the engine can be driven from
+    benchmarks, load tests and batch jobs as well as the UI.
+    """
+
+    def __init__(self, storage, seed_equipment=None):
+        self.storage = storage
+        if seed_equipment is not None:
+            storage.seed_equipment(seed_equipment)
+
+        self.users = UserStore(storage)
+        self.catalog = Catalog(storage)
+        self.bookings = BookingStore(storage, self.catalog)
+        self.sessions = SessionStore(storage)
+        self.live = LiveStatus(self.bookings)
+        self.completions = CompletionSweeper(self.bookings)
+        self._view = None
+        self._view_lock = threading.Lock()
+
+    def equipment_view(self):
+        """
+        Get the current catalog version with each status made live
+
+        The view is rebuilt only when the catalog changes or some equipment
+        starts or stops being in use; otherwise every caller shares one.
+
+        Returns:
+            CatalogVersion: Equipment records whose status reflects bookings now
+        """
+        self.live.refresh()
+        catalog = self.catalog.current
+        key = (catalog.number, self.live.epoch)
+        with self._view_lock:
+            if self._view is None or self._view[0] != key:
+                records = {}
+                for equipment in catalog:
+                    status = self.live.status(equipment)
+                    records[equipment["id"]] = equipment if status == equipment["status"] else {**equipment, "status": status}
+                self._view = (key, CatalogVersion(catalog.number, records))
+            return self._view[1]
+
+    def earliest_slots(self, category, duration, first_date, days=7, work_start="08:00", work_end="18:00", k=5, step=30):
+        """
+        Find the k earliest free slots on any equipment in a category
+
+        Each usable piece of equipment contributes a lazy stream of free
+        starts built from its busy intervals; a heap merge across the
+        streams picks the earliest k overall.
+
+        Args:
+            category (str): Equipment category
+            duration (int): Minutes needed
+            first_date (date or str): First day to search
+            days (int): Number of days to search
+            work_start (str): Earliest start each day, in format HH:MM
+            work_end (str): Latest end each day, in format HH:MM
+            k (int): Number of slots to return
+            step (int): Starts are aligned to this many minutes
+
+        Returns:
+            list: Slot dictionaries with equipment_id, name, date, start_time,
+            end_time, start_at and end_at, earliest first
+        """
+        first_day = to_minutes(first_date)
+        window_end = first_day + days * MINUTES_PER_DAY
+        work_start = to_minutes(first_date, work_start) - first_day
+        work_end = to_minutes(first_date, work_end) - first_day
+        not_before = _now_minute()
+
+        catalog = self.catalog.current
+        candidates = {}
+        for equipment in catalog:
+            # Equipment under an admin override (e.g. Maintenance) is not offered
+            if equipment["category"] != category or equipment["status"] not in LiveStatus.DERIVED_STATUSES:
+                continue
+
+            busy = self.bookings.busy_intervals(equipment["id"], first_day, window_end)
+            candidates[equipment["id"]] = free_starts(
+                busy, first_day, days, work_start, work_end, duration, step, not_before
+            )
+
+        return [
+            {
+                "equipment_id": equipment_id,
+                "name": catalog.get(equipment_id)["name"],
+                "date": minutes_to_date(start).isoformat(),
+                "start_time": format_time(start),
+                "end_time": format_time(start + duration),
+                "start_at": start,
+                "end_at": start + duration
+            }
+            for start, equipment_id in earliest_slots(candidates, k)
+        ]
+
+    def delete_equipment(self, equipment_id):
+        """
+        Delete equipment that has no confirmed bookings
+
+        Returns:
+            tuple: (success, message)
+        """
+        # Hold the equipment's booking lock so no booking lands between the check and the delete
+        with self.bookings.equipment_lock(equipment_id):
+            if self.bookings.has_confirmed(equipment_id):
+                return False, "Cannot delete equipment that is currently booked"
+
+            if self.catalog.delete(equipment_id):
+                return True, f"Equipment with ID {equipment_id} deleted successfully"
+
+        return False, f"Equipment with ID {equipment_id} not found"
+
+    def close(self):
+        """Release the storage handle"""
+        self.storage.close()
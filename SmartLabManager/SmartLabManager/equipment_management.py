@@ -1,6 +1,16 @@
 import streamlit as st
 import pandas as pd
+import json
 import database
+import java_bridge
+from scheduler import get_scheduler
+
+# Statuses an admin can set; "Booked" is derived from the booking timeline
+ADMIN_STATUSES = ["Available", "Maintenance"]
+
+def _admin_status(equipment):
+    """Map a live status onto the admin choices (a booked instrument is otherwise available)"""
+    return "Maintenance" if equipment["status"] == "Maintenance" else "Available"
 
 def show_equipment_management():
     st.image("assets/badge.png", width=150)
@@ -11,6 +21,8 @@ def show_equipment_management():
         st.error("You do not have permission to access this page.")
         st.stop()
     
+    equipment_list = database.get_all_equipment()
+    
     tab1, tab2, tab3, tab4 = st.tabs(["Equipment List", "Add Equipment", "Edit Equipment", "Reports"])
     
     with tab1:
@@ -18,7 +30,7 @@ def show_equipment_management():
         
         # Filters
         st.sidebar.header("Filters")
-        categories = set(e["category"] for e in st.session_state.equipment_data)
+        categories = set(e["category"] for e in equipment_list)
         category_filter = st.sidebar.selectbox(
             "Category",
             ["All"] + sorted(list(categories))
@@ -32,7 +44,7 @@ def show_equipment_management():
         search_term = st.sidebar.text_input("Search Equipment")
         
         # Filter equipment
-        filtered_equipment = st.session_state.equipment_data
+        filtered_equipment = equipment_list
         
         if category_filter != "All":
             filtered_equipment = [e for e in filtered_equipment if e["category"] == category_filter]
@@ -86,31 +98,15 @@ def show_equipment_management():
                 # Status change options
                 new_status = st.selectbox(
                     "Change Status",
-                    options=["Available", "Booked", "Maintenance"],
-                    index=["Available", "Booked", "Maintenance"].index(equipment["status"])
+                    options=ADMIN_STATUSES,
+                    index=ADMIN_STATUSES.index(_admin_status(equipment))
                 )
                 
                 if st.button("Update Status"):
                     if new_status != equipment["status"]:
-                        # Check if equipment can be made available if it's booked
-                        if equipment["status"] == "Booked" and new_status == "Available":
-                            # Check if any active bookings exist
-                            active_bookings = False
-                            for booking in st.session_state.booking_data:
-                                if booking["equipment_id"] == equipment_id and booking["status"] == "Confirmed":
-                                    active_bookings = True
-                                    break
-                            
-                            if active_bookings:
-                                st.error("Cannot change status to Available as this equipment has active bookings.")
-                            else:
-                                database.update_equipment_status(equipment_id, new_status)
-                                st.success(f"Status updated to {new_status}")
-                                st.rerun()
-                        else:
-                            database.update_equipment_status(equipment_id, new_status)
-                            st.success(f"Status updated to {new_status}")
-                            st.rerun()
+                        database.update_equipment_status(equipment_id, new_status)
+                        st.success(f"Status updated to {new_status}")
+                        st.rerun()
                 
                 # Delete equipment button
                 if st.button("Delete Equipment", type="primary", help="This will permanently remove the equipment"):
@@ -130,7 +126,7 @@ def show_equipment_management():
             description = st.text_area("Description")
             
             # Get existing categories for dropdown
-            existing_categories = sorted(set(e["category"] for e in st.session_state.equipment_data))
+            existing_categories = sorted(set(e["category"] for e in equipment_list))
             category_option = st.selectbox(
                 "Category",
                 options=["Select Category"] + existing_categories + ["Add New Category"]
@@ -147,7 +143,7 @@ def show_equipment_management():
             
             status = st.selectbox(
                 "Status",
-                options=["Available", "Maintenance"]
+                options=ADMIN_STATUSES
             )
             
             submit_button = st.form_submit_button("Add Equipment")
@@ -177,7 +173,7 @@ def show_equipment_management():
         st.subheader("Edit Equipment")
         
         # Select equipment to edit
-        edit_equipment_options = [f"{e['id']}: {e['name']}" for e in st.session_state.equipment_data]
+        edit_equipment_options = [f"{e['id']}: {e['name']}" for e in equipment_list]
         if not edit_equipment_options:
             st.info("No equipment available to edit.")
         else:
@@ -197,7 +193,7 @@ def show_equipment_management():
                     edit_description = st.text_area("Description", value=equipment["description"])
                     
                     # Get existing categories for dropdown
-                    existing_categories = sorted(set(e["category"] for e in st.session_state.equipment_data))
+                    existing_categories = sorted(set(e["category"] for e in equipment_list))
                     
                     # Pre-select current category
                     current_category_index = 0
@@ -223,8 +219,8 @@ def show_equipment_management():
                     
                     edit_status = st.selectbox(
                         "Status",
-                        options=["Available", "Booked", "Maintenance"],
-                        index=["Available", "Booked", "Maintenance"].index(equipment["status"])
+                        options=ADMIN_STATUSES,
+                        index=ADMIN_STATUSES.index(_admin_status(equipment))
                     )
                     
                     update_button = st.form_submit_button("Update Equipment")
@@ -239,19 +235,6 @@ def show_equipment_management():
                         elif not edit_location:
                             st.error("Location is required")
                         else:
-                            # Check if status change is allowed
-                            if equipment["status"] == "Booked" and edit_status == "Available":
-                                # Check if any active bookings exist
-                                active_bookings = False
-                                for booking in st.session_state.booking_data:
-                                    if booking["equipment_id"] == edit_id and booking["status"] == "Confirmed":
-                                        active_bookings = True
-                                        break
-                                
-                                if active_bookings:
-                                    st.error("Cannot change status to Available as this equipment has active bookings.")
-                                    st.stop()
-                            
                             # Update equipment
                             updated_data = {
                                 "name": edit_name,
@@ -270,7 +253,7 @@ def show_equipment_management():
         
         report_type = st.radio(
             "Report Type",
-            options=["Equipment Status", "Equipment Usage", "Availability Summary"],
+            options=["Equipment Status", "Equipment Usage", "Availability Summary", "Java Bridge"],
             horizontal=True
         )
         
@@ -280,7 +263,7 @@ def show_equipment_management():
             status_counts = {}
             
             for status in statuses:
-                status_counts[status] = len([e for e in st.session_state.equipment_data if e["status"] == status])
+                status_counts[status] = len([e for e in equipment_list if e["status"] == status])
             
             # Display status chart
             st.bar_chart(status_counts)
@@ -291,7 +274,7 @@ def show_equipment_management():
                 status_data.append({
                     "Status": status,
                     "Count": count,
-                    "Percentage": f"{count / len(st.session_state.equipment_data) * 100:.1f}%"
+                    "Percentage": f"{count / len(equipment_list) * 100:.1f}%"
                 })
             
             st.table(pd.DataFrame(status_data))
@@ -299,12 +282,13 @@ def show_equipment_management():
         elif report_type == "Equipment Usage":
             # Equipment most frequently booked
             booking_counts = {}
+            all_bookings = database.get_all_bookings()
             
-            for equipment in st.session_state.equipment_data:
+            for equipment in equipment_list:
                 equipment_id = equipment["id"]
                 booking_counts[equipment["name"]] = 0
                 
-                for booking in st.session_state.booking_data:
+                for booking in all_bookings:
                     if booking["equipment_id"] == equipment_id:
                         booking_counts[equipment["name"]] += 1
             
@@ -330,7 +314,7 @@ def show_equipment_management():
             # Group equipment by category
             categories = {}
             
-            for equipment in st.session_state.equipment_data:
+            for equipment in equipment_list:
                 category = equipment["category"]
                 if category not in categories:
                     categories[category] = {
@@ -352,4 +336,94 @@ def show_equipment_management():
                     "Availability %": f"{counts['available'] / counts['total'] * 100:.1f}%"
                 })
             
-            st.table(pd.DataFrame(availability_data))
\ No newline at end of file
+            st.table(pd.DataFrame(availability_data))
+            
+        elif report_type == "Java Bridge":
+            show_bridge_metrics()
+
+def show_bridge_metrics():
+    """Display Java bridge call counts, latencies, fallbacks and cache hit ratios"""
+    bridge = java_bridge.get_java_bridge()
+    snapshot = java_bridge.metrics.snapshot()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric(label="Bridge Mode", value=bridge.mode)
+    with col2:
+        st.metric(label="JVMs Started", value=sum(snapshot["jvm_spawns"].values()))
+    with col3:
+        st.metric(label="Java Errors", value=sum(snapshot["errors"].values()))
+    
+    st.markdown("#### Calls by Method")
+    if snapshot["methods"]:
+        method_data = []
+        for method, stats in snapshot["methods"].items():
+            method_data.append({
+                "Method": method,
+                "Calls": stats["calls"],
+                "Fallbacks": stats["fallbacks"],
+                "Fallback %": f"{stats['fallback_rate'] * 100:.1f}%" if stats["fallback_rate"] is not None else "-",
+                "p50 (ms)": stats["p50_ms"],
+                "p95 (ms)": stats["p95_ms"],
+                "p99 (ms)": stats["p99_ms"]
+            })
+        st.table(pd.DataFrame(method_data))
+    else:
+        st.info("No bridge calls recorded yet.")
+    
+    st.markdown("#### Java Call Latency")
+    latency = bridge.latency_report()
+    st.table(pd.DataFrame([
+        {"Backend": backend.capitalize(), "Calls": latency[f"{backend}_calls"], "Average (ms)": latency[f"{backend}_avg_ms"]}
+        for backend in ("gateway", "subprocess")
+    ]))
+    if latency["saved_ms_per_call"] is not None:
+        st.caption(f"The gateway saves about {latency['saved_ms_per_call']:.0f} ms per call over a fresh JVM.")
+    
+    st.markdown("#### Caches")
+    cache_data = []
+    for name, stats in snapshot["caches"].items():
+        cache_data.append({
+            "Cache": name,
+            "Hits": stats["hits"],
+            "Misses": stats["misses"],
+            "Hit Ratio": f"{stats['hit_ratio'] * 100:.1f}%" if stats["hit_ratio"] is not None else "-"
+        })
+    st.table(pd.DataFrame(cache_data))
+    
+    if snapshot["errors"]:
+        st.markdown("#### Errors by Java Operation")
+        st.table(pd.DataFrame(
+            [{"Operation": operation, "Errors": count} for operation, count in snapshot["errors"].items()]
+        ))
+    
+    st.markdown("#### Scheduling Backends")
+    st.table(pd.DataFrame([
+        {"Operation": operation, "Backend": info["backend"], "Java (ms)": info["java_ms"], "Python (ms)": info["python_ms"]}
+        for operation, info in get_scheduler().report().items()
+    ]))
+    
+    # Export for offline analysis or a Prometheus textfile collector
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "Download JSON",
+            data=json.dumps(snapshot, indent=2),
+            file_name="bridge_metrics.json",
+            mime="application/json"
+        )
+    with col2:
+        st.download_button(
+            "Download Prometheus",
+            data=java_bridge.metrics.to_prometheus(),
+            file_name="bridge_metrics.prom",
+            mime="text/plain"
+        )
+    
+    # Server-side copy for a textfile collector; the directory is fixed by SLAB_METRICS_DIR
+    if st.button("Write Metrics Files"):
+        try:
+            paths = java_bridge.metrics.dump()
+            st.success(f"Metrics written to {', '.join(paths)}")
+        except OSError as e:
+            st.error(f"Could not write metrics: {str(e)}")
@@ -1,12 +1,390 @@
 import os
+import glob
+import asyncio
+import functools
+import hashlib
+import json
+import shutil
 import subprocess
 import atexit
 import uuid
+import threading
+import time
+import queue
+from collections import deque
+
+import database
+from scheduler import PythonScheduler, time_slot_cache_stats
+
+# Py4J is optional; without it the bridge uses one subprocess per call
+try:
+    from py4j.java_gateway import JavaGateway, GatewayParameters
+    from py4j.protocol import Py4JError, Py4JNetworkError
+except ImportError:
+    JavaGateway = None
+    GatewayParameters = None
+    Py4JError = Py4JNetworkError = Exception
+
+# Bridge mode: "gateway" (one long-lived JVM), "subprocess" (one JVM per call)
+# or "python" (never start a JVM)
+BRIDGE_MODE = os.environ.get("SLAB_JAVA_BRIDGE_MODE", "gateway")
+
+PY4J_JAR = os.path.join("java_gateway", "lib", "py4j-0.10.9.9.jar")
+GATEWAY_STARTUP_TIMEOUT = 20  # seconds
+GATEWAY_RETRY_INTERVAL = 60  # seconds to wait before restarting a dead gateway
+READY_POLL_INTERVAL = 0.1  # seconds between checks while waiting for the gateway to start
+
+# Upper bound on any single Java call, and on how many may run at once
+JAVA_CALL_TIMEOUT = float(os.environ.get("SLAB_JAVA_TIMEOUT", "5"))  # seconds
+JAVA_MAX_CONCURRENCY = int(os.environ.get("SLAB_JAVA_MAX_CONCURRENCY", "4"))
+
+# Consecutive Java failures before calls go straight to Python, and how long
+# to wait between background recovery probes
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_PROBE_INTERVAL = 30  # seconds
+
+# Latency samples kept per bridge method for the percentiles in BridgeMetrics
+METRICS_SAMPLE_SIZE = 2048
+# Directory BridgeMetrics.dump writes to; set by whoever runs the server,
+# never taken from the UI
+METRICS_DIR = os.environ.get("SLAB_METRICS_DIR", "metrics")
+
+# Java sources compiled by compile_java.sh, and the file recording the hash
+# of the sources the current classes were built from
+JAVA_SOURCE_PATTERNS = (os.path.join("java_src", "*.java"), os.path.join("java_gateway", "*.java"))
+COMPILE_STAMP = os.path.join("classes", ".source_hash")
+
+# Result of the one-time JVM detection, see detect_java()
+_java_runtime = None
+_java_runtime_lock = threading.Lock()
+
+
+def detect_java():
+    """
+    Detect once per process whether a working JVM and compiler are installed
+    
+    Returns:
+        dict: {"java": bool, "javac": bool}
+    """
+    global _java_runtime
+    with _java_runtime_lock:
+        if _java_runtime is None:
+            java = False
+            if shutil.which("java"):
+                try:
+                    java = subprocess.run(
+                        ['java', '-version'],
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        timeout=JAVA_CALL_TIMEOUT * 2
+                    ).returncode == 0
+                except (OSError, subprocess.TimeoutExpired):
+                    java = False
+            _java_runtime = {"java": java, "javac": shutil.which("javac") is not None}
+    return _java_runtime
+
+
+class GatewayProcess:
+    """
+    A long-lived JVM running java_gateway.JavaGateway
+    Started once per server process and shared by every Streamlit session
+    """
+    
+    def __init__(self, startup_timeout=GATEWAY_STARTUP_TIMEOUT):
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.gateway = None
+        self.startup_seconds = None
+    
+    def start(self):
+        """
+        Launch the JVM and connect to it
+        
+        Returns:
+            bool: True if the gateway is ready, False otherwise
+        """
+        started = time.perf_counter()
+        classpath = os.pathsep.join(["classes", PY4J_JAR])
+        metrics.record_spawn("gateway")
+        
+        # Port 0 lets the JVM pick a free port, which it reports on stdout.
+        # stdin stays open for the JVM's lifetime; it exits when we close it.
+        self.process = subprocess.Popen(
+            ['java', '-cp', classpath, 'java_gateway.JavaGateway', '0'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True
+        )
+        
+        # Read the startup banner on a helper thread so a silent JVM cannot block us
+        banner = queue.Queue()
+        threading.Thread(
+            target=lambda: banner.put(self.process.stdout.readline()),
+            daemon=True
+        ).start()
+        
+        try:
+            line = banner.get(timeout=self.startup_timeout)
+        except queue.Empty:
+            line = ""
+        
+        if "Started on port" not in line:
+            print(f"Warning: Java gateway failed to start: {line.strip() or 'no response'}")
+            self.stop()
+            return False
+        
+        port = int(line.rsplit(" ", 1)[1])
+        self.gateway = JavaGateway(gateway_parameters=GatewayParameters(port=port, auto_convert=True, read_timeout=JAVA_CALL_TIMEOUT))
+        self.startup_seconds = time.perf_counter() - started
+        return True
+    
+    @property
+    def entry_point(self):
+        return self.gateway.entry_point
+    
+    def is_alive(self):
+        """Check whether the JVM process is still running"""
+        return self.process is not None and self.process.poll() is None
+    
+    def stop(self):
+        """Disconnect from and terminate the JVM"""
+        if self.gateway is not None:
+            try:
+                self.gateway.close()
+            except Exception:
+                pass
+            self.gateway = None
+        
+        if self.process is not None:
+            try:
+                # Closing stdin asks the JVM to shut down cleanly
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except Exception:
+                self.process.kill()
+            self.process = None
+
+
+class BridgeMetrics:
+    """
+    Counters and latency samples describing what the Java bridge costs
+    
+    Records per-method call counts and latencies (the most recent
+    METRICS_SAMPLE_SIZE per method, for percentiles), fallbacks to Python,
+    JVM spawns, failed Java operations and cache hits and misses.
+    """
+    
+    def __init__(self, sample_size=METRICS_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Clear every counter and sample"""
+        with self._lock:
+            self._calls = {}      # method -> call count
+            self._latencies = {}  # method -> deque of recent latencies in seconds
+            self._errors = {}     # Java entry point or class -> failed calls
+            self._fallbacks = {}  # method -> calls answered by Python instead of Java
+            self._spawns = {}     # "gateway" or "subprocess" -> JVMs started
+            self._caches = {}     # cache name -> [hits, misses]
+    
+    def record_call(self, method, seconds):
+        with self._lock:
+            self._calls[method] = self._calls.get(method, 0) + 1
+            if method not in self._latencies:
+                self._latencies[method] = deque(maxlen=self.sample_size)
+            self._latencies[method].append(seconds)
+    
+    def record_error(self, operation):
+        with self._lock:
+            self._errors[operation] = self._errors.get(operation, 0) + 1
+    
+    def record_fallback(self, method):
+        with self._lock:
+            self._fallbacks[method] = self._fallbacks.get(method, 0) + 1
+    
+    def fallback_count(self, method):
+        """Get how many calls to a method were answered by Python instead of Java"""
+        with self._lock:
+            return self._fallbacks.get(method, 0)
+    
+    def record_spawn(self, kind):
+        with self._lock:
+            self._spawns[kind] = self._spawns.get(kind, 0) + 1
+    
+    def record_cache(self, name, hit):
+        with self._lock:
+            counts = self._caches.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+    
+    def snapshot(self):
+        """
+        Get the current metrics
+        
+        Returns:
+            dict: "methods" (calls, fallbacks, fallback_rate and p50/p95/p99
+                latency in ms per bridge method), "errors" (failed calls per
+                Java operation), "jvm_spawns" and "caches" (hits, misses and
+                hit_ratio per cache)
+        """
+        with self._lock:
+            calls = dict(self._calls)
+            latencies = {method: sorted(samples) for method, samples in self._latencies.items()}
+            errors = dict(self._errors)
+            fallbacks = dict(self._fallbacks)
+            spawns = dict(self._spawns)
+            caches = {name: tuple(counts) for name, counts in self._caches.items()}
+        
+        caches["time_slots"] = time_slot_cache_stats()
+        
+        methods = {}
+        for method in sorted(set(calls) | set(fallbacks)):
+            count = calls.get(method, 0)
+            samples = latencies.get(method, [])
+            stats = {
+                "calls": count,
+                "fallbacks": fallbacks.get(method, 0),
+                "fallback_rate": fallbacks.get(method, 0) / count if count else None
+            }
+            for quantile in (50, 95, 99):
+                # Nearest-rank percentile over the retained samples: the
+                # ceil(q / 100 * n)-th smallest, counting from 1
+                value = samples[-(-len(samples) * quantile // 100) - 1] if samples else None
+                stats[f"p{quantile}_ms"] = value * 1000 if value is not None else None
+            methods[method] = stats
+        
+        return {
+            "methods": methods,
+            "errors": errors,
+            "jvm_spawns": spawns,
+            "caches": {
+                name: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": hits / (hits + misses) if hits + misses else None
+                }
+                for name, (hits, misses) in caches.items()
+            }
+        }
+    
+    def to_prometheus(self):
+        """
+        Format the current metrics in the Prometheus text exposition format
+        
+        Returns:
+            str: Metrics text
+        """
+        snapshot = self.snapshot()
+        lines = []
+        
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                if value is not None:
+                    label_text = ",".join(f'{key}="{label}"' for key, label in labels.items())
+                    lines.append(f"{name}{{{label_text}}} {value}")
+        
+        methods = snapshot["methods"]
+        metric("slab_bridge_calls_total", "counter", "Java bridge calls by method",
+               [({"method": method}, stats["calls"]) for method, stats in methods.items()])
+        metric("slab_bridge_call_latency_ms", "summary", "Java bridge call latency in milliseconds",
+               [({"method": method, "quantile": str(quantile / 100)}, stats[f"p{quantile}_ms"])
+                for method, stats in methods.items() for quantile in (50, 95, 99)])
+        metric("slab_bridge_errors_total", "counter", "Failed Java calls by Java operation",
+               [({"operation": operation}, count) for operation, count in snapshot["errors"].items()])
+        metric("slab_bridge_fallbacks_total", "counter", "Calls answered by Python instead of Java",
+               [({"method": method}, stats["fallbacks"]) for method, stats in methods.items()])
+        metric("slab_bridge_jvm_spawns_total", "counter", "JVMs started by the bridge",
+               [({"kind": kind}, count) for kind, count in snapshot["jvm_spawns"].items()])
+        metric("slab_bridge_cache_hits_total", "counter", "Bridge cache hits",
+               [({"cache": name}, stats["hits"]) for name, stats in snapshot["caches"].items()])
+        metric("slab_bridge_cache_misses_total", "counter", "Bridge cache misses",
+               [({"cache": name}, stats["misses"]) for name, stats in snapshot["caches"].items()])
+        
+        return "\n".join(lines) + "\n"
+    
+    def dump(self):
+        """
+        Write the current metrics to METRICS_DIR, as bridge_metrics.json and
+        bridge_metrics.prom (Prometheus text)
+        
+        Returns:
+            list: The paths written
+        """
+        os.makedirs(METRICS_DIR, exist_ok=True)
+        paths = []
+        for name, content in (
+            ("bridge_metrics.json", json.dumps(self.snapshot(), indent=2)),
+            ("bridge_metrics.prom", self.to_prometheus())
+        ):
+            path = os.path.join(METRICS_DIR, name)
+            with open(path, "w") as f:
+                f.write(content)
+            paths.append(path)
+        return paths
+
+
+# Process-wide bridge metrics
+metrics = BridgeMetrics()
+
+
+def _instrumented(method):
+    """Record the call count and latency of a bridge method in `metrics`"""
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            metrics.record_call(method.__name__, time.perf_counter() - started)
+    return wrapper
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing backend after repeated errors
+    
+    The breaker opens after `failure_threshold` consecutive failures. While
+    open, callers should use their fallback; a single success (normally
+    from a recovery probe) closes it again.
+    """
+    
+    def __init__(self, failure_threshold=BREAKER_FAILURE_THRESHOLD, on_open=None):
+        self.failure_threshold = failure_threshold
+        self.on_open = on_open
+        self.failures = 0
+        self.is_open = False
+        self._lock = threading.Lock()
+    
+    def allow(self):
+        """Check whether a call may go to the backend"""
+        return not self.is_open
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.is_open = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            opened = not self.is_open and self.failures >= self.failure_threshold
+            if opened:
+                self.is_open = True
+        
+        if opened and self.on_open is not None:
+            self.on_open()
+
 
 class JavaBridge:
     """
-    Bridge class to interact with Java components via subprocess
-    A simpler approach than using Py4J for basic Java-Python interaction
+    Bridge class to interact with Java components
+    In "gateway" mode a single JVM is started through Py4J and reused for
+    every call; in "subprocess" mode each call starts its own JVM.
+    Both fall back to the Python implementations when Java is unavailable.
     """
     _instance = None
     
@@ -18,18 +396,441 @@ class JavaBridge:
     
     def _initialize(self):
         """Initialize the Java environment"""
+        self.mode = BRIDGE_MODE
+        if self.mode != "python" and not detect_java()["java"]:
+            print("Warning: Java is not installed, using the Python implementations")
+            self.mode = "python"
+        if self.mode == "gateway" and JavaGateway is None:
+            print("Warning: py4j is not installed, using one Java subprocess per call")
+            self.mode = "subprocess"
+        
+        self._gateway = None
+        self._gateway_lock = threading.Lock()
+        self._gateway_failed_at = None
+        self._gateway_starting = False
+        # Serializes booking deltas with the snapshot loaded into a new gateway
+        self._sync_lock = threading.Lock()
+        # Booking deltas waiting to be pushed to the gateway, in commit order
+        self._deltas = queue.Queue()
+        
+        # Caps concurrent Java calls; the breaker sends calls to Python after
+        # repeated failures until a background probe succeeds
+        self._call_slots = threading.BoundedSemaphore(JAVA_MAX_CONCURRENCY)
+        self._breaker = CircuitBreaker(on_open=self._start_recovery_probe)
+        
+        # In-process implementation used whenever Java can't answer
+        self._python = PythonScheduler()
+        
+        # Per-backend call counts and total seconds, see latency_report()
+        self._latency_lock = threading.Lock()
+        self._latency = {
+            "gateway": {"calls": 0, "seconds": 0.0},
+            "subprocess": {"calls": 0, "seconds": 0.0}
+        }
+        
+        # Set once classes/ matches the Java sources; until then calls use
+        # the Python implementations
+        self._classes_ready = threading.Event()
+        
         # Compile Java classes if needed
-        self._compile_java_classes()
+        if self.mode != "python":
+            self._compile_java_classes()
         
+        # Keep the gateway's booking store in step with the database; deltas
+        # are applied on their own thread, off the booking commit path
+        if self.mode == "gateway":
+            threading.Thread(target=self._sync_deltas, name="java-sync", daemon=True).start()
+            database.add_booking_listener(self._on_booking_change)
+        
+        atexit.register(self.shutdown)
+    
+    def _java_source_hash(self):
+        """Hash the contents of every Java source file compile_java.sh builds"""
+        digest = hashlib.sha256()
+        for pattern in JAVA_SOURCE_PATTERNS:
+            for path in sorted(glob.glob(pattern)):
+                digest.update(path.encode())
+                with open(path, "rb") as f:
+                    digest.update(f.read())
+        return digest.hexdigest()
+    
     def _compile_java_classes(self):
-        """Compile Java classes"""
-        compile_process = subprocess.run(['bash', './compile_java.sh'], 
-                                        stdout=subprocess.PIPE, 
-                                        stderr=subprocess.PIPE)
+        """
+        Compile Java classes unless they are already built from the current sources
+        
+        Compilation runs on a background thread so the first page load is not
+        blocked on javac.
+        """
+        source_hash = self._java_source_hash()
+        try:
+            with open(COMPILE_STAMP) as f:
+                if f.read().strip() == source_hash:
+                    metrics.record_cache("compile", True)
+                    self._classes_ready.set()
+                    return
+        except OSError:
+            pass
+        
+        metrics.record_cache("compile", False)
+        
+        if not detect_java()["javac"]:
+            print("Warning: javac is not installed and classes/ is out of date, using the Python implementations")
+            return
+        
+        threading.Thread(
+            target=self._compile_in_background,
+            args=(source_hash,),
+            name="java-compile",
+            daemon=True
+        ).start()
+    
+    def _compile_in_background(self, source_hash):
+        """Run compile_java.sh and record the source hash if it succeeded"""
+        try:
+            compile_process = subprocess.run(['bash', './compile_java.sh'], 
+                                            stdout=subprocess.PIPE, 
+                                            stderr=subprocess.PIPE)
+        except Exception as e:
+            print(f"Warning: Failed to compile Java classes: {str(e)}")
+            return
         
         if compile_process.returncode != 0:
             print(f"Warning: Failed to compile Java classes: {compile_process.stderr.decode()}")
+            return
+        
+        with open(COMPILE_STAMP, "w") as f:
+            f.write(source_hash)
+        self._classes_ready.set()
+    
+    def _java_ready(self):
+        """Check whether calls can go to Java rather than the Python fallback"""
+        return self.mode != "python" and self._classes_ready.is_set() and self._breaker.allow()
+    
+    def is_ready(self):
+        """
+        Check whether calls currently go to Java (False while they use the Python fallback)
+        
+        In gateway mode this also needs a running gateway; asking starts one
+        in the background if there is none.
+        """
+        if not self._java_ready():
+            return False
+        return self.mode != "gateway" or self._get_gateway() is not None
+    
+    def wait_until_ready(self, timeout=None):
+        """
+        Wait for the Java classes to be compiled and, in gateway mode, the gateway to start
+        
+        Returns:
+            bool: True if calls go to Java, False if they still use the Python fallback
+        """
+        if self.mode == "python":
+            return False
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._classes_ready.wait(timeout):
+            return False
+        
+        while not self.is_ready():
+            # Give up once Java is off or the gateway is not starting (it failed
+            # recently and won't be retried yet)
+            if not self._java_ready() or not self._gateway_starting:
+                return False
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(READY_POLL_INTERVAL)
+        return True
+    
+    def fallback_count(self, operation):
+        """Get how many calls to an operation were answered by Python instead of Java"""
+        return metrics.fallback_count(operation)
     
+    def _start_recovery_probe(self):
+        """Probe Java in the background until it answers again"""
+        print(f"Warning: Java calls failed {self._breaker.failures} times in a row, using Python until Java recovers")
+        threading.Thread(target=self._probe_until_recovered, name="java-probe", daemon=True).start()
+    
+    def _probe_until_recovered(self):
+        """Retry a cheap Java call every BREAKER_PROBE_INTERVAL seconds until it succeeds"""
+        while self._breaker.is_open:
+            time.sleep(BREAKER_PROBE_INTERVAL)
+            
+            if self.mode == "gateway":
+                ok, _ = self._call_gateway("generateTimeSlots", 8, 9, 30)
+            else:
+                try:
+                    ok = self._run_java(['java_src.TimeManager', '8', '9', '30']).returncode == 0
+                except Exception:
+                    ok = False
+            
+            if ok:
+                print("Java bridge recovered")
+                self._breaker.record_success()
+    
+    def _get_gateway(self):
+        """
+        Get the running gateway, or None while it is unavailable
+        
+        A missing or dead JVM is (re)started on a background thread, so no
+        caller ever waits for JVM startup; calls use the Python fallback
+        until the new gateway is ready.
+        
+        Returns:
+            GatewayProcess: The gateway, or None if it is unavailable
+        """
+        if self.mode != "gateway":
+            return None
+        
+        with self._gateway_lock:
+            gateway = self._gateway
+            if gateway is not None and gateway.is_alive():
+                return gateway
+            
+            if self._gateway_starting:
+                return None
+            
+            # Don't retry a failed JVM on every rerun
+            if (self._gateway_failed_at is not None and
+                    time.monotonic() - self._gateway_failed_at < GATEWAY_RETRY_INTERVAL):
+                return None
+            
+            self._gateway = None
+            self._gateway_starting = True
+        
+        threading.Thread(target=self._start_gateway, args=(gateway,), name="java-gateway-start", daemon=True).start()
+        return None
+    
+    def _start_gateway(self, old_gateway=None):
+        """Stop the old JVM, if any, then start a new one and load the current bookings into it"""
+        if old_gateway is not None:
+            old_gateway.stop()
+        
+        try:
+            gateway = GatewayProcess()
+            ready = gateway.start()
+        except Exception as e:
+            print(f"Error starting Java gateway: {str(e)}")
+            ready = False
+        
+        if ready:
+            # Give the JVM the current bookings before anything queries it;
+            # deltas committed meanwhile wait in the queue and are applied after
+            with self._sync_lock:
+                ready = self._load_booking_snapshot(gateway)
+                if ready:
+                    with self._gateway_lock:
+                        self._gateway = gateway
+                        self._gateway_failed_at = None
+                        self._gateway_starting = False
+            if not ready:
+                gateway.stop()
+        
+        if not ready:
+            with self._gateway_lock:
+                self._gateway_failed_at = time.monotonic()
+                self._gateway_starting = False
+            self._breaker.record_failure()
+            return
+        
+        print(f"Java gateway started in {gateway.startup_seconds * 1000:.0f} ms")
+    
+    def _discard_gateway(self, gateway):
+        """Forget a broken gateway and stop its JVM in the background; the next call starts a new one"""
+        with self._gateway_lock:
+            if self._gateway is not gateway:
+                return
+            self._gateway = None
+        threading.Thread(target=gateway.stop, name="java-gateway-stop", daemon=True).start()
+    
+    def _booking_lines(self, equipment_ids=None):
+        """
+        Describe confirmed bookings as "<booking_id> <equipment_id> <start> <end>" lines
+        
+        Args:
+            equipment_ids (set): Only include these equipment IDs (as strings), or None for all
+        """
+        return [
+            f"{booking['id']} {booking['equipment_id']} {booking['start_at']} {booking['end_at']}"
+            for booking in database.get_all_bookings()
+            if booking["status"] == "Confirmed"
+            and (equipment_ids is None or str(booking["equipment_id"]) in equipment_ids)
+        ]
+    
+    def _load_booking_snapshot(self, gateway):
+        """
+        Replace the gateway's stored bookings with the confirmed bookings in the database
+        
+        Returns:
+            bool: True if the snapshot was loaded, False otherwise
+        """
+        try:
+            gateway.entry_point.loadBookings(self._booking_lines())
+            return True
+        except Exception as e:
+            print(f"Warning: Could not load bookings into Java gateway: {str(e)}")
+            return False
+    
+    def _on_booking_change(self, event, booking):
+        """
+        Queue a booking delta from the database for the running gateway
+        
+        Called on the booking commit path, so it never talks to the JVM itself.
+        
+        Args:
+            event (str): "confirmed" or "released"
+            booking (dict): The booking record
+        """
+        self._deltas.put((event, booking))
+    
+    def _sync_deltas(self):
+        """Push queued booking deltas to the gateway, in order, forever"""
+        while True:
+            event, booking = self._deltas.get()
+            with self._sync_lock:
+                gateway = self._gateway
+                if gateway is None or not gateway.is_alive():
+                    # The next gateway start loads a fresh snapshot
+                    continue
+                
+                try:
+                    if event == "confirmed":
+                        gateway.entry_point.addBooking(
+                            str(booking["id"]), str(booking["equipment_id"]),
+                            booking["start_at"], booking["end_at"]
+                        )
+                    else:
+                        gateway.entry_point.cancelBooking(str(booking["id"]))
+                except Py4JError as e:
+                    print(f"Warning: Could not sync booking {booking['id']} to Java gateway: {str(e)}")
+                    # Restart and resync on next use rather than answer from stale data
+                    self._discard_gateway(gateway)
+    
+    def _call_gateway(self, method_name, *args):
+        """
+        Call a JavaGateway entry point method
+        
+        Calls time out after JAVA_CALL_TIMEOUT seconds, and at most
+        JAVA_MAX_CONCURRENCY run at once; failures count towards the breaker.
+        A lost connection is not retried: the call falls back to Python at
+        once and the gateway is restarted in the background.
+        
+        Returns:
+            tuple: (True, result) on success, (False, None) if the caller should fall back
+        """
+        gateway = self._get_gateway()
+        if gateway is None:
+            # Not started yet, or restarting
+            return False, None
+        
+        if not self._call_slots.acquire(timeout=JAVA_CALL_TIMEOUT):
+            print(f"Warning: Too many concurrent Java calls, {method_name} falls back to Python")
+            return False, None
+        
+        started = time.perf_counter()
+        try:
+            result = getattr(gateway.entry_point, method_name)(*args)
+        except Py4JNetworkError as e:
+            print(f"Warning: Lost connection to Java gateway: {str(e)}")
+            metrics.record_error(method_name)
+            # Stopping the JVM also ends a hung call
+            self._discard_gateway(gateway)
+        except Py4JError as e:
+            print(f"Warning: Java gateway call {method_name} failed: {str(e)}")
+            metrics.record_error(method_name)
+        else:
+            self._record_latency("gateway", time.perf_counter() - started)
+            self._breaker.record_success()
+            return True, result
+        finally:
+            self._call_slots.release()
+        
+        self._breaker.record_failure()
+        return False, None
+    
+    def _run_java(self, args, input=None):
+        """
+        Run a Java class in a fresh JVM and record how long it took
+        
+        Raises:
+            RuntimeError: If too many Java calls are already running
+            subprocess.TimeoutExpired: If the JVM does not finish within JAVA_CALL_TIMEOUT
+        """
+        if not self._call_slots.acquire(timeout=JAVA_CALL_TIMEOUT):
+            raise RuntimeError("Too many concurrent Java calls")
+        
+        started = time.perf_counter()
+        metrics.record_spawn("subprocess")
+        try:
+            result = subprocess.run(
+                ['java', '-cp', 'classes'] + args,
+                input=input,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                timeout=JAVA_CALL_TIMEOUT
+            )
+        except Exception:
+            metrics.record_error(args[0])
+            self._breaker.record_failure()
+            raise
+        finally:
+            self._call_slots.release()
+        
+        self._record_latency("subprocess", time.perf_counter() - started)
+        if result.returncode == 0:
+            self._breaker.record_success()
+        else:
+            metrics.record_error(args[0])
+            self._breaker.record_failure()
+        return result
+    
+    def _record_latency(self, backend, seconds):
+        with self._latency_lock:
+            stats = self._latency[backend]
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+    
+    def latency_report(self):
+        """
+        Report the average per-call latency of each Java backend
+        
+        The cost of a subprocess call is dominated by JVM startup, so when no
+        subprocess calls were made the gateway's own startup time is used as
+        the estimate.
+        
+        Returns:
+            dict: Average milliseconds per call and the estimated saving per call
+        """
+        report = {"mode": self.mode}
+        with self._latency_lock:
+            latency = {backend: dict(stats) for backend, stats in self._latency.items()}
+        
+        for backend, stats in latency.items():
+            calls = stats["calls"]
+            report[f"{backend}_calls"] = calls
+            report[f"{backend}_avg_ms"] = stats["seconds"] / calls * 1000 if calls else None
+        
+        spawn_ms = report["subprocess_avg_ms"]
+        gateway = self._gateway
+        if spawn_ms is None and gateway is not None and gateway.startup_seconds:
+            spawn_ms = gateway.startup_seconds * 1000
+        
+        gateway_ms = report["gateway_avg_ms"]
+        if spawn_ms is not None and gateway_ms is not None:
+            report["saved_ms_per_call"] = spawn_ms - gateway_ms
+        else:
+            report["saved_ms_per_call"] = None
+        
+        return report
+    
+    def shutdown(self):
+        """Stop the gateway JVM if one is running"""
+        with self._gateway_lock:
+            if self._gateway is not None:
+                self._gateway.stop()
+                self._gateway = None
+    
+    @_instrumented
     def generate_time_slots(self, start_hour=8, end_hour=18, interval=30):
         """
         Generate time slots for booking using the Java TimeManager class
@@ -42,14 +843,19 @@ class JavaBridge:
         Returns:
             list: List of time slots
         """
+        if not self._java_ready():
+            return self._generate_time_slots_python(start_hour, end_hour, interval)
+        
+        if self.mode == "gateway":
+            ok, result = self._call_gateway("generateTimeSlots", start_hour, end_hour, interval)
+            if ok:
+                return list(result)
+            return self._generate_time_slots_python(start_hour, end_hour, interval)
+        
         try:
             # Execute Java class with parameters
-            result = subprocess.run(
-                ['java', '-cp', 'classes', 'java_src.TimeManager', 
-                 str(start_hour), str(end_hour), str(interval)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+            result = self._run_java(
+                ['java_src.TimeManager', str(start_hour), str(end_hour), str(interval)]
             )
             
             if result.returncode != 0:
@@ -78,18 +884,11 @@ class JavaBridge:
         Returns:
             list: List of time slots
         """
-        from datetime import datetime, timedelta
-        
-        time_slots = []
-        current_time = datetime.strptime(f"{start_hour}:00", "%H:%M")
-        end_time = datetime.strptime(f"{end_hour}:00", "%H:%M")
-        
-        while current_time <= end_time:
-            time_slots.append(current_time.strftime("%H:%M"))
-            current_time += timedelta(minutes=interval)
-            
-        return time_slots
+        if self.mode != "python":
+            metrics.record_fallback("generate_time_slots")
+        return self._python.generate_time_slots(start_hour, end_hour, interval)
     
+    @_instrumented
     def is_time_slot_available(self, equipment_id, date, start_time, end_time):
         """
         Check if a time slot is available using Java BookingManager
@@ -103,29 +902,89 @@ class JavaBridge:
         Returns:
             bool: True if available, False otherwise
         """
-        try:
-            # Execute Java class with parameters
-            result = subprocess.run(
-                ['java', '-cp', 'classes', 'java_src.BookingManager', 'check',
-                 str(equipment_id), date, start_time, end_time],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
+        if not self._java_ready():
+            return self._check_time_slot_python(equipment_id, date, start_time, end_time)
+        
+        if self.mode == "gateway":
+            ok, result = self._call_gateway(
+                "isTimeSlotAvailable", str(equipment_id), date, start_time, end_time
             )
+            if ok:
+                return bool(result)
+            return self._check_time_slot_python(equipment_id, date, start_time, end_time)
+        
+        # A fresh JVM has no bookings, so go through the batch protocol which sends them
+        results = self._check_time_slots_java([(equipment_id, date, start_time, end_time)])
+        if results is not None:
+            return results[0]
+        return self._check_time_slot_python(equipment_id, date, start_time, end_time)
+    
+    @_instrumented
+    def check_time_slots(self, queries):
+        """
+        Check many time slots in a single round trip to Java
+        
+        In gateway mode the queries go to the JVM in one call; in subprocess
+        mode they are streamed to a single BookingManager batch process.
+        
+        Args:
+            queries (list): (equipment_id, date, start_time, end_time) tuples,
+                with dates as YYYY-MM-DD and times as HH:MM
             
-            if result.returncode != 0:
-                print(f"Warning: Java booking check failed: {result.stderr}")
-                # Fallback to Python implementation if Java fails
-                return self._check_time_slot_python(equipment_id, date, start_time, end_time)
-            
-            # Parse the output (true/false)
-            output = result.stdout.strip().lower()
-            return output == "true"
-            
+        Returns:
+            list: One bool per query, True if that slot is available
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        
+        if self._java_ready():
+            results = self._check_time_slots_java(queries)
+            if results is not None:
+                return results
+        
+        if self.mode != "python":
+            metrics.record_fallback("check_time_slots")
+        return self._python.check_time_slots(queries)
+    
+    def _check_time_slots_java(self, queries):
+        """
+        Send queries to the gateway or a batch subprocess
+        
+        The gateway already holds the bookings; a batch subprocess is first
+        sent the confirmed bookings of the equipment being queried.
+        
+        Returns:
+            list: Availability per query, or None if the caller should fall back
+        """
+        lines = [
+            f"{equipment_id} {date} {start_time} {end_time}"
+            for equipment_id, date, start_time, end_time in queries
+        ]
+        
+        if self.mode == "gateway":
+            ok, result = self._call_gateway("areTimeSlotsAvailable", lines)
+            return [bool(available) for available in result] if ok else None
+        
+        equipment_ids = {str(query[0]) for query in queries}
+        commands = [f"add {line}" for line in self._booking_lines(equipment_ids)]
+        commands.extend(f"check {line}" for line in lines)
+        
+        try:
+            result = self._run_java(
+                ['java_src.BookingManager', 'batch'],
+                input="".join(f"{command}\n" for command in commands)
+            )
         except Exception as e:
             print(f"Error running Java code: {str(e)}")
-            # Fallback to Python implementation
-            return self._check_time_slot_python(equipment_id, date, start_time, end_time)
+            return None
+        
+        output = result.stdout.split()
+        if result.returncode != 0 or len(output) != len(lines):
+            print(f"Warning: Java batch booking check failed: {result.stderr}")
+            return None
+        
+        return [value == "true" for value in output]
     
     def _check_time_slot_python(self, equipment_id, date, start_time, end_time):
         """
@@ -140,23 +999,21 @@ class JavaBridge:
         Returns:
             bool: True if available, False otherwise
         """
-        from datetime import datetime
-        
-        try:
-            # Parse the date and times
-            date_obj = datetime.strptime(date, "%Y-%m-%d").date()
-            start_time_obj = datetime.strptime(start_time, "%H:%M").time()
-            end_time_obj = datetime.strptime(end_time, "%H:%M").time()
-            
-            # Simple validation - check if end time is after start time
-            start_dt = datetime.combine(date_obj, start_time_obj)
-            end_dt = datetime.combine(date_obj, end_time_obj)
-            
-            return end_dt > start_dt
-            
-        except Exception as e:
-            print(f"Error in Python time slot check: {str(e)}")
-            return False
+        if self.mode != "python":
+            metrics.record_fallback("is_time_slot_available")
+        return self._python.is_time_slot_available(equipment_id, date, start_time, end_time)
+    
+    async def generate_time_slots_async(self, start_hour=8, end_hour=18, interval=30):
+        """Async version of generate_time_slots, run on a worker thread"""
+        return await asyncio.to_thread(self.generate_time_slots, start_hour, end_hour, interval)
+    
+    async def is_time_slot_available_async(self, equipment_id, date, start_time, end_time):
+        """Async version of is_time_slot_available, run on a worker thread"""
+        return await asyncio.to_thread(self.is_time_slot_available, equipment_id, date, start_time, end_time)
+    
+    async def check_time_slots_async(self, queries):
+        """Async version of check_time_slots, run on a worker thread"""
+        return await asyncio.to_thread(self.check_time_slots, list(queries))
     
     def create_booking(self, user_email, equipment_id, date, start_time, end_time, purpose=""):
         """
@@ -191,4 +1048,4 @@ def get_java_bridge():
     global java_bridge
     if java_bridge is None:
         java_bridge = JavaBridge()
-    return java_bridge
\ No newline at end of file
+    return java_bridge
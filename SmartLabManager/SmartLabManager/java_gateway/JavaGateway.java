@@ -4,8 +4,14 @@ import py4j.GatewayServer;
 import java_src.TimeUtils;
 import java_src.BookingManager;
 
+import java.io.IOException;
+import java.util.List;
+
 /**
  * Java Gateway for Py4J to connect Python with Java
+ * Usage: java java_gateway.JavaGateway [port]
+ * A port of 0 lets the operating system pick a free port; the chosen port is
+ * printed on startup so the Python side can connect to it.
  */
 public class JavaGateway {
     
@@ -26,11 +32,77 @@ public class JavaGateway {
         return bookingManager;
     }
     
+    /**
+     * Generate time slots (entry point wrapper around TimeUtils)
+     */
+    public List<String> generateTimeSlots(int startHour, int endHour, int intervalMinutes) {
+        return TimeUtils.generateTimeSlots(startHour, endHour, intervalMinutes);
+    }
+    
+    /**
+     * Check a time slot (entry point wrapper around BookingManager)
+     */
+    public boolean isTimeSlotAvailable(String equipmentId, String date, String startTime, String endTime) {
+        return BookingManager.isTimeSlotAvailable(equipmentId, date, startTime, endTime);
+    }
+    
+    /**
+     * Check many time slots in one round trip (entry point wrapper around BookingManager)
+     * Each query has the form "<equipment_id> <date> <start_time> <end_time>"
+     */
+    public List<Boolean> areTimeSlotsAvailable(List<String> queries) {
+        return BookingManager.areTimeSlotsAvailable(queries);
+    }
+    
+    /**
+     * Store a confirmed booking pushed from Python (minutes as in Python's booking index)
+     */
+    public void addBooking(String bookingId, String equipmentId, long start, long end) {
+        bookingManager.addBooking(bookingId, equipmentId, start, end);
+    }
+    
+    /**
+     * Remove a booking that was cancelled or completed on the Python side
+     */
+    public boolean cancelBooking(String bookingId) {
+        return bookingManager.cancelBooking(bookingId);
+    }
+    
+    /**
+     * Replace the stored bookings with a full snapshot from Python
+     * Each line has the form "<booking_id> <equipment_id> <start> <end>"
+     */
+    public int loadBookings(List<String> lines) {
+        bookingManager.loadBookings(lines);
+        return bookingManager.bookingCount();
+    }
+    
     public static void main(String[] args) {
+        int port = GatewayServer.DEFAULT_PORT;
+        if (args.length >= 1) {
+            try {
+                port = Integer.parseInt(args[0]);
+            } catch (NumberFormatException e) {
+                System.err.println("Invalid port. Using default port.");
+            }
+        }
+        
         JavaGateway app = new JavaGateway();
-        // Start the server on the default port
-        GatewayServer server = new GatewayServer(app);
+        GatewayServer server = new GatewayServer(app, port);
         server.start();
-        System.out.println("Java Gateway Server Started");
+        System.out.println("Java Gateway Server Started on port " + server.getListeningPort());
+        System.out.flush();
+        
+        // Exit when the parent Python process closes our stdin, so a crashed
+        // Streamlit server never leaves an orphaned JVM behind
+        try {
+            while (System.in.read() != -1) {
+                // Ignore any input
+            }
+        } catch (IOException e) {
+            // Treat a broken pipe like end of input
+        }
+        server.shutdown();
+        System.exit(0);
     }
-}
\ No newline at end of file
+}
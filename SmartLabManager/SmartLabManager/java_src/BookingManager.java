@@ -1,11 +1,17 @@
 package java_src;
 
+import java.io.BufferedReader;
+import java.io.IOException;
+import java.io.InputStreamReader;
 import java.time.LocalDate;
 import java.time.LocalTime;
 import java.time.format.DateTimeFormatter;
 import java.util.ArrayList;
+import java.util.HashMap;
 import java.util.List;
-import java.util.UUID;
+import java.util.Map;
+import java.util.NavigableMap;
+import java.util.TreeMap;
 
 /**
  * Java class for managing equipment bookings
@@ -17,37 +23,252 @@ public class BookingManager {
     private static final DateTimeFormatter DATE_FORMATTER = DateTimeFormatter.ofPattern("yyyy-MM-dd");
     private static final DateTimeFormatter TIME_FORMATTER = DateTimeFormatter.ofPattern("HH:mm");
     
+    // Bookings are intervals of absolute minutes, counted like Python's
+    // date.toordinal() * 1440 so both sides use the same numbers
+    private static final long MINUTES_PER_DAY = 24 * 60;
+    private static final long ORDINAL_OF_EPOCH_DAY = 719163L;  // date(1970, 1, 1).toordinal()
+    // Intervals longer than this are kept apart from the rest, so one multi-day
+    // booking does not widen every check on its equipment
+    private static final long LONG_INTERVAL = MINUTES_PER_DAY;
+    
+    // Shared instance handed out to the Py4J gateway
+    private static BookingManager instance;
+    
     /**
-     * Check if a time slot is available for equipment
+     * A confirmed booking occupying [start, end) on one piece of equipment
      */
-    public static boolean isTimeSlotAvailable(String equipmentId, String dateStr, 
-                                             String startTimeStr, String endTimeStr) {
+    private static class Interval {
+        final String equipmentId;
+        final long start;
+        final long end;
         
-        // This is a simplified implementation
-        // In a real application, this would check against a database of bookings
+        Interval(String equipmentId, long start, long end) {
+            this.equipmentId = equipmentId;
+            this.start = start;
+            this.end = end;
+        }
+    }
+    
+    // equipment ID -> start minute -> (booking ID -> end minute), intervals up to LONG_INTERVAL
+    private final Map<String, TreeMap<Long, Map<String, Long>>> intervals = new HashMap<>();
+    // equipment ID -> length -> number of those intervals with it; the longest
+    // one still stored bounds how far back an overlap can start
+    private final Map<String, TreeMap<Long, Integer>> lengths = new HashMap<>();
+    // equipment ID -> (booking ID -> interval) for intervals longer than LONG_INTERVAL
+    private final Map<String, Map<String, Interval>> longIntervals = new HashMap<>();
+    // booking ID -> its interval, for cancellations
+    private final Map<String, Interval> bookings = new HashMap<>();
+    
+    /**
+     * Get the shared BookingManager used by the long-lived gateway JVM
+     */
+    public static synchronized BookingManager getInstance() {
+        if (instance == null) {
+            instance = new BookingManager();
+        }
+        return instance;
+    }
+    
+    /**
+     * Convert a date and time to absolute minutes
+     */
+    public static long toMinutes(LocalDate date, LocalTime time) {
+        return (date.toEpochDay() + ORDINAL_OF_EPOCH_DAY) * MINUTES_PER_DAY
+            + time.getHour() * 60 + time.getMinute();
+    }
+    
+    /**
+     * Store a confirmed booking, replacing any earlier interval with the same booking ID
+     */
+    public synchronized void addBooking(String bookingId, String equipmentId, long start, long end) {
+        cancelBooking(bookingId);
         
-        // For demonstration purposes, we'll just check that the times are valid
+        Interval interval = new Interval(equipmentId, start, end);
+        if (end - start > LONG_INTERVAL) {
+            longIntervals.computeIfAbsent(equipmentId, key -> new HashMap<>()).put(bookingId, interval);
+        } else {
+            intervals.computeIfAbsent(equipmentId, key -> new TreeMap<>())
+                .computeIfAbsent(start, key -> new HashMap<>())
+                .put(bookingId, end);
+            lengths.computeIfAbsent(equipmentId, key -> new TreeMap<>()).merge(end - start, 1, Integer::sum);
+        }
+        bookings.put(bookingId, interval);
+    }
+    
+    /**
+     * Remove a booking that no longer blocks its equipment
+     * @return True if the booking was stored, false otherwise
+     */
+    public synchronized boolean cancelBooking(String bookingId) {
+        Interval interval = bookings.remove(bookingId);
+        if (interval == null) {
+            return false;
+        }
+        
+        long length = interval.end - interval.start;
+        if (length > LONG_INTERVAL) {
+            longIntervals.get(interval.equipmentId).remove(bookingId);
+            return true;
+        }
+        
+        TreeMap<Long, Map<String, Long>> starts = intervals.get(interval.equipmentId);
+        Map<String, Long> atStart = starts.get(interval.start);
+        atStart.remove(bookingId);
+        if (atStart.isEmpty()) {
+            starts.remove(interval.start);
+        }
+        
+        // Drop the length once no stored interval has it, so the bound shrinks
+        TreeMap<Long, Integer> counts = lengths.get(interval.equipmentId);
+        if (counts.merge(length, -1, Integer::sum) == 0) {
+            counts.remove(length);
+        }
+        return true;
+    }
+    
+    /**
+     * Replace every stored booking with a snapshot
+     * @param lines Bookings in the form "<booking_id> <equipment_id> <start> <end>"
+     */
+    public synchronized void loadBookings(List<String> lines) {
+        intervals.clear();
+        lengths.clear();
+        longIntervals.clear();
+        bookings.clear();
+        
+        for (String line : lines) {
+            String[] fields = line.trim().split("\\s+");
+            addBooking(fields[0], fields[1], Long.parseLong(fields[2]), Long.parseLong(fields[3]));
+        }
+    }
+    
+    /**
+     * Get the number of stored bookings
+     */
+    public synchronized int bookingCount() {
+        return bookings.size();
+    }
+    
+    /**
+     * Check whether any stored booking on the equipment overlaps [start, end)
+     */
+    public synchronized boolean hasConflict(String equipmentId, long start, long end) {
+        Map<String, Interval> longOnes = longIntervals.get(equipmentId);
+        if (longOnes != null) {
+            for (Interval interval : longOnes.values()) {
+                if (interval.start < end && interval.end > start) {
+                    return true;
+                }
+            }
+        }
+        
+        TreeMap<Long, Map<String, Long>> starts = intervals.get(equipmentId);
+        if (starts == null || starts.isEmpty()) {
+            return false;
+        }
+        
+        // Only bookings starting before `end`, and late enough that the
+        // longest stored interval could still reach past `start`, can overlap
+        long earliest = start - lengths.get(equipmentId).lastKey() + 1;
+        NavigableMap<Long, Map<String, Long>> candidates = starts.subMap(earliest, true, end, false);
+        for (Map<String, Long> atStart : candidates.values()) {
+            for (long bookedEnd : atStart.values()) {
+                if (bookedEnd > start) {
+                    return true;
+                }
+            }
+        }
+        return false;
+    }
+    
+    /**
+     * Check if a time slot is valid and free of stored bookings for the equipment
+     */
+    public static boolean isTimeSlotAvailable(String equipmentId, String dateStr, 
+                                             String startTimeStr, String endTimeStr) {
         try {
             LocalDate date = LocalDate.parse(dateStr, DATE_FORMATTER);
             LocalTime startTime = LocalTime.parse(startTimeStr, TIME_FORMATTER);
             LocalTime endTime = LocalTime.parse(endTimeStr, TIME_FORMATTER);
             
             // Check that end time is after start time
-            return endTime.isAfter(startTime);
+            if (!endTime.isAfter(startTime)) {
+                return false;
+            }
+            
+            return !getInstance().hasConflict(equipmentId, toMinutes(date, startTime), toMinutes(date, endTime));
         } catch (Exception e) {
             return false;
         }
     }
     
+    /**
+     * Check many time slots in one call
+     * @param queries Queries in the form "<equipment_id> <date> <start_time> <end_time>"
+     * @return One availability result per query, in the same order
+     */
+    public static List<Boolean> areTimeSlotsAvailable(List<String> queries) {
+        List<Boolean> results = new ArrayList<>(queries.size());
+        for (String query : queries) {
+            results.add(checkQuery(query.trim().split("\\s+")));
+        }
+        return results;
+    }
+    
+    /**
+     * Check a query given as [equipment_id, date, start_time, end_time]
+     */
+    private static boolean checkQuery(String[] fields) {
+        if (fields.length < 4) {
+            return false;
+        }
+        return isTimeSlotAvailable(fields[0], fields[1], fields[2], fields[3]);
+    }
+    
+    /**
+     * Process line-delimited commands from stdin until end of input
+     * Each "check <equipment_id> <date> <start_time> <end_time>" line prints
+     * one "true" or "false" line; unknown commands print "error".
+     * "add <booking_id> <equipment_id> <start> <end>" and "cancel <booking_id>"
+     * update the stored bookings and print nothing.
+     */
+    private static void runBatch(BufferedReader reader) throws IOException {
+        StringBuilder output = new StringBuilder();
+        String line;
+        while ((line = reader.readLine()) != null) {
+            line = line.trim();
+            if (line.isEmpty()) {
+                continue;
+            }
+            
+            String[] fields = line.split("\\s+");
+            if (fields[0].equals("check")) {
+                String[] query = new String[fields.length - 1];
+                System.arraycopy(fields, 1, query, 0, query.length);
+                output.append(checkQuery(query)).append('\n');
+            } else if (fields[0].equals("add") && fields.length >= 5) {
+                getInstance().addBooking(fields[1], fields[2], Long.parseLong(fields[3]), Long.parseLong(fields[4]));
+            } else if (fields[0].equals("cancel") && fields.length >= 2) {
+                getInstance().cancelBooking(fields[1]);
+            } else {
+                output.append("error\n");
+            }
+        }
+        System.out.print(output);
+        System.out.flush();
+    }
+    
     /**
      * Main method for running as a standalone application
      * Usage: java BookingManager check <equipment_id> <date> <start_time> <end_time>
+     *        java BookingManager batch   (commands on stdin, one per line)
      */
     public static void main(String[] args) {
         if (args.length < 1) {
             System.out.println("Usage: java BookingManager <command> [args]");
             System.out.println("Commands:");
             System.out.println("  check <equipment_id> <date> <start_time> <end_time>");
+            System.out.println("  batch");
             return;
         }
         
@@ -61,6 +282,13 @@ public class BookingManager {
             
             boolean available = isTimeSlotAvailable(equipmentId, date, startTime, endTime);
             System.out.println(available);
+        } else if (command.equals("batch")) {
+            try {
+                runBatch(new BufferedReader(new InputStreamReader(System.in)));
+            } catch (IOException e) {
+                System.err.println("Error reading batch input: " + e.getMessage());
+                System.exit(1);
+            }
         } else {
             System.out.println("Unknown command or invalid arguments");
         }
@@ -0,0 +1,124 @@
+import numpy as np
+
+from booking_index import MINUTES_PER_DAY
+from slot_bitsets import cell_mask
+
+
+def build_occupancy_grid(starts, ends, window_start, days, slot_bounds):
+    """
+    Count the bookings overlapping every day x slot cell in one vectorized pass
+
+    A booking [s, e) overlaps cell [a, b) when s < b and e > a. Because every
+    booking has s < e, the overlap count of a cell is the number of bookings
+    starting before b minus the number ending at or before a, which two
+    searchsorted calls over the sorted starts and ends give for all cells at once.
+
+    Args:
+        starts (sequence): Booking start minutes (absolute)
+        ends (sequence): Booking end minutes (absolute), same order as starts
+        window_start (int): Absolute minute of midnight on the first day
+        days (int): Number of days (grid rows)
+        slot_bounds (list): (start, end) minute-of-day pairs, one per slot (grid columns)
+
+    Returns:
+        numpy.ndarray: Integer grid of shape (days, len(slot_bounds))
+    """
+    sorted_starts = np.sort(np.asarray(starts, dtype=np.int64))
+    sorted_ends = np.sort(np.asarray(ends, dtype=np.int64))
+
+    bounds = np.asarray(slot_bounds, dtype=np.int64).reshape(-1, 2)
+    day_starts = window_start + np.arange(days, dtype=np.int64)[:, None] * MINUTES_PER_DAY
+    cell_starts = day_starts + bounds[:, 0]
+    cell_ends = day_starts + bounds[:, 1]
+
+    return (
+        np.searchsorted(sorted_starts, cell_ends, side="left")
+        - np.searchsorted(sorted_ends, cell_starts, side="right")
+    )
+
+
+def occupancy_grid_for_bookings(bookings, window_start, days, slot_bounds):
+    """
+    Build the occupancy grid for booking records
+
+    Args:
+        bookings (list): Booking dictionaries with "start_at" and "end_at"
+        window_start (int): Absolute minute of midnight on the first day
+        days (int): Number of days
+        slot_bounds (list): (start, end) minute-of-day pairs, one per slot
+
+    Returns:
+        numpy.ndarray: Integer grid of shape (days, len(slot_bounds))
+    """
+    count = len(bookings)
+    starts = np.fromiter((b["start_at"] for b in bookings), dtype=np.int64, count=count)
+    ends = np.fromiter((b["end_at"] for b in bookings), dtype=np.int64, count=count)
+    return build_occupancy_grid(starts, ends, window_start, days, slot_bounds)
+
+
+def occupancy_grid_for_masks(masks, slot_bounds):
+    """
+    Build the occupancy grid from per-day slot bitsets
+
+    A cell is taken when its mask shares a bit with the day's bitset, so the
+    grid needs one AND per cell and never looks at booking records.
+
+    Args:
+        masks (list): Taken-cell bitset of each day (grid rows)
+        slot_bounds (list): (start, end) minute-of-day pairs, one per slot
+
+    Returns:
+        numpy.ndarray: Grid of shape (len(masks), len(slot_bounds)) with 1 for taken cells
+    """
+    slot_masks = [cell_mask(start, end) for start, end in slot_bounds]
+    grid = np.zeros((len(masks), len(slot_masks)), dtype=np.int64)
+    for day, mask in enumerate(masks):
+        if mask:
+            grid[day] = [bool(mask & slot_mask) for slot_mask in slot_masks]
+    return grid
+
+
+def booked_day_matrix(rows, starts, ends, first_day, days, row_count):
+    """
+    Mark the days each row has a booking on, for many rows in one pass
+
+    Each booking adds +1 at its first day in the window and -1 after its last
+    one in a difference array; a cumulative sum along the days then gives the
+    number of bookings touching every day, however long the bookings are.
+
+    Args:
+        rows (sequence): Grid row of each booking, e.g. the position of its equipment
+        starts (sequence): Booking start minutes (absolute)
+        ends (sequence): Booking end minutes (absolute), same order as starts
+        first_day (int): Date ordinal of the first day
+        days (int): Number of days (grid columns)
+        row_count (int): Number of rows
+
+    Returns:
+        numpy.ndarray: Boolean grid of shape (row_count, days)
+    """
+    rows = np.asarray(rows, dtype=np.int64)
+    first = np.asarray(starts, dtype=np.int64) // MINUTES_PER_DAY - first_day
+    last = (np.asarray(ends, dtype=np.int64) - 1) // MINUTES_PER_DAY - first_day
+
+    # Clip to the window and drop bookings entirely outside it
+    inside = (last >= 0) & (first < days)
+    rows, first, last = rows[inside], np.maximum(first[inside], 0), np.minimum(last[inside], days - 1)
+
+    diff = np.zeros((row_count, days + 1), dtype=np.int64)
+    np.add.at(diff, (rows, first), 1)
+    np.add.at(diff, (rows, last + 1), -1)
+    return np.cumsum(diff[:, :days], axis=1) > 0
+
+
+def booked_days_for_bookings(bookings, first_day, days):
+    """
+    Mark the days any of the bookings touches
+
+    Returns:
+        numpy.ndarray: Boolean vector of length days
+    """
+    count = len(bookings)
+    starts = np.fromiter((b["start_at"] for b in bookings), dtype=np.int64, count=count)
+    ends = np.fromiter((b["end_at"] for b in bookings), dtype=np.int64, count=count)
+    return booked_day_matrix(np.zeros(count, dtype=np.int64), starts, ends, first_day, days, 1)[0]
@@ -4,6 +4,7 @@ import os
 from PIL import Image
 import io
 import base64
+import database
 from assets.default_profile.user_avatar import get_default_avatar
 
 def show_profile():
@@ -136,13 +137,14 @@ def show_profile():
             })
             
             st.session_state.user_data = user_data
+            database.update_user(st.session_state.user_email, user_data)
             st.success("Profile updated successfully!")
     
     # Display user bookings
     st.markdown("---")
     st.subheader("My Booking History")
     
-    user_bookings = [b for b in st.session_state.booking_data if b["user_email"] == st.session_state.user_email]
+    user_bookings = database.get_user_bookings(st.session_state.user_email)
     
     if not user_bookings:
         st.info("You haven't made any bookings yet.")
@@ -159,7 +161,7 @@ def show_profile():
                 st.info("No active bookings.")
             else:
                 for booking in confirmed:
-                    equipment = next((e for e in st.session_state.equipment_data if e["id"] == booking["equipment_id"]), None)
+                    equipment = database.get_equipment(booking["equipment_id"])
                     equipment_name = equipment["name"] if equipment else "Unknown Equipment"
                     
                     with st.expander(f"{equipment_name} - {booking['start_date']} to {booking['end_date']}"):
@@ -175,7 +177,7 @@ def show_profile():
                 st.info("No completed bookings.")
             else:
                 for booking in completed:
-                    equipment = next((e for e in st.session_state.equipment_data if e["id"] == booking["equipment_id"]), None)
+                    equipment = database.get_equipment(booking["equipment_id"])
                     equipment_name = equipment["name"] if equipment else "Unknown Equipment"
                     
                     with st.expander(f"{equipment_name} - {booking['start_date']} to {booking['end_date']}"):
@@ -191,7 +193,7 @@ def show_profile():
                 st.info("No cancelled bookings.")
             else:
                 for booking in cancelled:
-                    equipment = next((e for e in st.session_state.equipment_data if e["id"] == booking["equipment_id"]), None)
+                    equipment = database.get_equipment(booking["equipment_id"])
                     equipment_name = equipment["name"] if equipment else "Unknown Equipment"
                     
                     with st.expander(f"{equipment_name} - {booking['start_date']} to {booking['end_date']}"):
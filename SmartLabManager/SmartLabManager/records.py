@@ -0,0 +1,59 @@
+class KeyedCollection:
+    """
+    Records keyed by ID that iterate in insertion order
+
+    Lookups, updates and deletes by ID are constant-time; iterating yields
+    the records in the order they were first added.
+    """
+
+    def __init__(self, records=(), key="id"):
+        self.key = key
+        self._records = {}
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    def __iter__(self):
+        return iter(self._records.values())
+
+    def __contains__(self, record_id):
+        return record_id in self._records
+
+    def __getitem__(self, record_id):
+        return self._records[record_id]
+
+    def get(self, record_id, default=None):
+        """Get a record by ID"""
+        return self._records.get(record_id, default)
+
+    def add(self, record):
+        """Add a record, replacing any record with the same ID in place"""
+        self._records[record[self.key]] = record
+        return record
+
+    def update(self, record_id, data):
+        """
+        Update the fields of a record
+
+        Returns:
+            dict: The updated record, or None if it does not exist
+        """
+        record = self._records.get(record_id)
+        if record is not None:
+            record.update(data)
+        return record
+
+    def remove(self, record_id):
+        """
+        Remove a record
+
+        Returns:
+            dict: The removed record, or None if it did not exist
+        """
+        return self._records.pop(record_id, None)
+
+    def values(self):
+        """Get all records as a list, in insertion order"""
+        return list(self._records.values())
@@ -0,0 +1,275 @@
+import os
+import random
+import threading
+import time
+from datetime import date, timedelta
+
+import database
+from booking_index import request_span, time_slots
+
+# Which backend answers scheduling calls: "auto" (measured at startup),
+# "java" (the JavaBridge) or "python" (in-process)
+SCHEDULER_BACKEND = os.environ.get("SLAB_SCHEDULER_BACKEND", "auto")
+
+# Operations the backends share, each routed to a backend of its own
+OPERATIONS = ("generate_time_slots", "is_time_slot_available", "check_time_slots")
+
+CALIBRATION_ROUNDS = 5
+CALIBRATION_WAIT = 120  # seconds to wait for the Java classes (and gateway) before calibrating
+
+# (start_hour, end_hour, interval) ranges used by the booking and session forms
+COMMON_TIME_SLOT_RANGES = ((8, 18, 30), (8, 17, 30), (9, 18, 30))
+
+# Process-wide time slot table, keyed on (start_hour, end_hour, interval)
+_time_slot_cache = {}
+_time_slot_stats = [0, 0]  # hits, misses
+
+
+def get_time_slots(start_hour=8, end_hour=18, interval=30):
+    """
+    Get the time slots for a range from the process-wide slot table
+
+    Common ranges are precomputed at import; other ranges are generated once
+    through the scheduler and cached, so repeated form renders never go
+    through a backend.
+
+    Args:
+        start_hour (int): Start hour in 24-hour format
+        end_hour (int): End hour in 24-hour format
+        interval (int): Interval in minutes
+
+    Returns:
+        tuple: Time slots in format HH:MM
+    """
+    key = (start_hour, end_hour, interval)
+    slots = _time_slot_cache.get(key)
+    if slots is None:
+        _time_slot_stats[1] += 1
+        slots = tuple(get_scheduler().generate_time_slots(start_hour, end_hour, interval))
+        slots = _time_slot_cache.setdefault(key, slots)
+    else:
+        _time_slot_stats[0] += 1
+    return slots
+
+
+def time_slot_cache_stats():
+    """
+    Get the hit and miss counts of the time slot table
+
+    Returns:
+        tuple: (hits, misses)
+    """
+    return tuple(_time_slot_stats)
+
+
+# The slots are a pure function of the range, so warm the common ones up front
+for _range in COMMON_TIME_SLOT_RANGES:
+    _time_slot_cache[_range] = time_slots(*_range)
+
+
+class PythonScheduler:
+    """
+    In-process scheduling backend with the same API as JavaBridge
+    Availability is answered from the engine's booking interval index.
+    """
+
+    name = "python"
+
+    def generate_time_slots(self, start_hour=8, end_hour=18, interval=30):
+        """
+        Generate time slots for booking
+
+        Args:
+            start_hour (int): Start hour in 24-hour format
+            end_hour (int): End hour in 24-hour format
+            interval (int): Interval in minutes
+
+        Returns:
+            list: List of time slots
+        """
+        return list(time_slots(start_hour, end_hour, interval))
+
+    def is_time_slot_available(self, equipment_id, date, start_time, end_time):
+        """
+        Check if a time slot is valid and free of confirmed bookings
+
+        Args:
+            equipment_id (str): Equipment ID
+            date (str): Date in format YYYY-MM-DD
+            start_time (str): Start time in format HH:MM
+            end_time (str): End time in format HH:MM
+
+        Returns:
+            bool: True if available, False otherwise
+        """
+        return self.check_time_slots([(equipment_id, date, start_time, end_time)])[0]
+
+    def check_time_slots(self, queries):
+        """
+        Check many time slots against the booking index
+
+        Args:
+            queries (list): (equipment_id, date, start_time, end_time) tuples
+
+        Returns:
+            list: One bool per query, True if that slot is available
+        """
+        bookings = database.get_engine().bookings
+        results = []
+        for equipment_id, day, start_time, end_time in queries:
+            try:
+                start, end = request_span(day, start_time=start_time, end_time=end_time)
+            except (TypeError, ValueError) as e:
+                print(f"Error in Python time slot check: {str(e)}")
+                results.append(False)
+                continue
+
+            # Equipment IDs arrive as strings but are stored as integers
+            if isinstance(equipment_id, str) and equipment_id.isdigit():
+                equipment_id = int(equipment_id)
+
+            results.append(end > start and not bookings.has_overlap(equipment_id, start, end))
+        return results
+
+
+def calibration_workload(seed=11, checks=50):
+    """
+    Build a query mix like the one the booking pages produce
+
+    Returns:
+        dict: Operation name -> positional arguments for one call
+    """
+    rng = random.Random(seed)
+    equipment_ids = [str(equipment["id"]) for equipment in database.get_all_equipment()] or ["1"]
+    slots = time_slots(8, 18, 30)
+
+    queries = []
+    for _ in range(checks):
+        day = (date.today() + timedelta(days=rng.randrange(14))).isoformat()
+        first = rng.randrange(len(slots) - 1)
+        last = rng.randrange(first + 1, min(first + 5, len(slots)))
+        queries.append((rng.choice(equipment_ids), day, slots[first], slots[last]))
+
+    return {
+        "generate_time_slots": (8, 18, 30),
+        "is_time_slot_available": queries[0],
+        "check_time_slots": (queries,)
+    }
+
+
+class Scheduler:
+    """
+    Routes each scheduling operation to the faster of the Java and Python backends
+
+    Until calibrate() has measured both, every operation uses Python.
+    SLAB_SCHEDULER_BACKEND ("java" or "python") overrides the measured choice.
+    """
+
+    def __init__(self, java, python=None, override=SCHEDULER_BACKEND):
+        self.backends = {"java": java, "python": python or PythonScheduler()}
+        self.override = override if override in self.backends else None
+        self.choice = {operation: "python" for operation in OPERATIONS}
+        self.calibration = {}
+
+    def backend_for(self, operation):
+        """Get the backend that answers an operation"""
+        return self.backends[self.override or self.choice[operation]]
+
+    def generate_time_slots(self, start_hour=8, end_hour=18, interval=30):
+        return self.backend_for("generate_time_slots").generate_time_slots(start_hour, end_hour, interval)
+
+    def is_time_slot_available(self, equipment_id, date, start_time, end_time):
+        return self.backend_for("is_time_slot_available").is_time_slot_available(
+            equipment_id, date, start_time, end_time
+        )
+
+    def check_time_slots(self, queries):
+        return self.backend_for("check_time_slots").check_time_slots(queries)
+
+    def calibrate(self, rounds=CALIBRATION_ROUNDS):
+        """
+        Time every operation on both backends and route each to the faster one
+
+        Java is only measured when the bridge is ready to call it, and a
+        measurement is thrown away if any of its calls fell back to Python
+        (say the gateway died meanwhile), since it would then time Python.
+
+        Returns:
+            dict: Operation name -> {"java_ms", "python_ms", "backend"}
+        """
+        java_ready = self.backends["java"].is_ready()
+        workload = calibration_workload()
+
+        calibration = {}
+        for operation in OPERATIONS:
+            args = workload[operation]
+            timings = {"java_ms": None, "python_ms": None}
+            for name, backend in self.backends.items():
+                if name == "java" and not java_ready:
+                    continue
+
+                if name == "java":
+                    fallbacks = backend.fallback_count(operation)
+
+                # One untimed call so JVM startup and first-use costs don't count
+                method = getattr(backend, operation)
+                method(*args)
+                started = time.perf_counter()
+                for _ in range(rounds):
+                    method(*args)
+                elapsed = time.perf_counter() - started
+
+                # Calls answered by the Python fallback would be timed as Java
+                if name == "java" and backend.fallback_count(operation) != fallbacks:
+                    continue
+                timings[f"{name}_ms"] = elapsed / rounds * 1000
+
+            faster = "java" if timings["java_ms"] is not None and timings["java_ms"] < timings["python_ms"] else "python"
+            self.choice[operation] = faster
+            calibration[operation] = dict(timings, backend=faster)
+
+        self.calibration = calibration
+        return calibration
+
+    def report(self):
+        """
+        Describe which backend serves each operation and why
+
+        Returns:
+            dict: Operation name -> {"backend", "java_ms", "python_ms"}
+        """
+        return {
+            operation: {
+                "backend": self.override or self.choice[operation],
+                "java_ms": self.calibration.get(operation, {}).get("java_ms"),
+                "python_ms": self.calibration.get(operation, {}).get("python_ms")
+            }
+            for operation in OPERATIONS
+        }
+
+
+# Initialize Scheduler
+scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """
+    Get the Scheduler instance, calibrating it in the background on first use
+    """
+    global scheduler
+    with _scheduler_lock:
+        if scheduler is None:
+            from java_bridge import get_java_bridge
+
+            scheduler = Scheduler(get_java_bridge())
+            if scheduler.override is None:
+                threading.Thread(target=_calibrate_in_background, name="scheduler-calibration", daemon=True).start()
+    return scheduler
+
+def _calibrate_in_background():
+    scheduler.backends["java"].wait_until_ready(CALIBRATION_WAIT)
+    try:
+        scheduler.calibrate()
+    except Exception as e:
+        print(f"Warning: Scheduler calibration failed, using Python: {str(e)}")
+        return
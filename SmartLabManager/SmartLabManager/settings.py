@@ -1,4 +1,5 @@
 import streamlit as st
+import database
 
 def show_settings():
     st.image("assets/badge.png", width=150)
@@ -71,15 +72,15 @@ def show_settings():
     if st.button("Update Password"):
         if not current_password or not new_password or not confirm_password:
             st.error("Please fill in all password fields")
-        elif current_password != st.session_state.user_data.get("password", ""):
+        elif not database.authenticate_user(st.session_state.user_email, current_password):
             st.error("Current password is incorrect")
         elif new_password != confirm_password:
             st.error("New passwords do not match")
         elif len(new_password) < 6:
             st.error("Password must be at least 6 characters long")
         else:
-            # Update password in user data
-            st.session_state.user_data["password"] = new_password
+            # Store the new password hashed and keep the session copy in step
+            st.session_state.user_data = database.set_user_password(st.session_state.user_email, new_password)
             st.success("Password updated successfully!")
     
     # Save all settings
@@ -0,0 +1,135 @@
+from booking_index import MINUTES_PER_DAY
+
+# Every equipment-day is 288 cells of 5 minutes; bit i covers minutes [5i, 5i + 5)
+CELL_MINUTES = 5
+CELLS_PER_DAY = MINUTES_PER_DAY // CELL_MINUTES
+
+
+def cell_mask(start_minute, end_minute):
+    """
+    Get the mask of the cells that [start_minute, end_minute) touches within one day
+
+    Intervals that do not fall on cell boundaries are widened to them.
+
+    Args:
+        start_minute (int): Minute of the day
+        end_minute (int): Minute of the day, up to MINUTES_PER_DAY
+
+    Returns:
+        int: Bit mask, 0 for an empty interval
+    """
+    first = start_minute // CELL_MINUTES
+    last = -(-end_minute // CELL_MINUTES)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+def day_masks(start, end):
+    """
+    Split an absolute [start, end) interval into per-day masks
+
+    Returns:
+        list: (day ordinal, mask) pairs, one per day the interval touches
+    """
+    masks = []
+    day = start // MINUTES_PER_DAY
+    while day * MINUTES_PER_DAY < end:
+        day_start = day * MINUTES_PER_DAY
+        masks.append((day, cell_mask(max(start - day_start, 0), min(end - day_start, MINUTES_PER_DAY))))
+        day += 1
+    return masks
+
+
+class SlotBitsets:
+    """
+    Occupancy of every equipment-day as a bitset of 5-minute cells
+
+    Booking ORs an interval's cells in, cancelling clears them with AND-NOT,
+    a conflict check is an AND, and the free cells of a day are a scan over
+    one integer. Clearing cells is blind to who else uses them, so the owner
+    re-adds any other booking that shares the cleared span.
+
+    Intervals are widened to whole cells, so a hit is only exact for times on
+    5-minute boundaries; callers that need an exact answer confirm hits
+    against the interval index.
+    """
+
+    def __init__(self):
+        self._days = {}  # (equipment_id, day ordinal) -> mask
+
+    @classmethod
+    def from_bookings(cls, bookings, status="Confirmed"):
+        """Build bitsets over all bookings with the given status"""
+        bitsets = cls()
+        for booking in bookings:
+            if booking["status"] == status:
+                bitsets.add(booking["equipment_id"], booking["start_at"], booking["end_at"])
+        return bitsets
+
+    def add(self, equipment_id, start, end):
+        """Mark [start, end) as taken"""
+        for day, mask in day_masks(start, end):
+            key = (equipment_id, day)
+            self._days[key] = self._days.get(key, 0) | mask
+
+    def remove(self, equipment_id, start, end):
+        """Mark [start, end) as free"""
+        for day, mask in day_masks(start, end):
+            key = (equipment_id, day)
+            remaining = self._days.get(key, 0) & ~mask
+            if remaining:
+                self._days[key] = remaining
+            else:
+                self._days.pop(key, None)
+
+    def is_free(self, equipment_id, start, end):
+        """Check that no cell of [start, end) is taken"""
+        return all(not self._days.get((equipment_id, day), 0) & mask for day, mask in day_masks(start, end))
+
+    def day_mask(self, equipment_id, day):
+        """Get the mask of taken cells on one day (by date ordinal)"""
+        return self._days.get((equipment_id, day), 0)
+
+    def free_starts(self, equipment_id, day, starts, length):
+        """
+        Filter candidate start times down to those free for `length` minutes
+
+        A candidate that runs past midnight is also checked against the next day.
+
+        Args:
+            equipment_id (int): Equipment ID
+            day (int): Date ordinal
+            starts (iterable): Candidate minutes of the day
+            length (int): Minutes that must be free after each start
+
+        Returns:
+            list: The free candidate minutes
+        """
+        taken = self.day_mask(equipment_id, day)
+        day_start = day * MINUTES_PER_DAY
+        free = []
+        for start in starts:
+            if start + length <= MINUTES_PER_DAY:
+                if not taken & cell_mask(start, start + length):
+                    free.append(start)
+            elif self.is_free(equipment_id, day_start + start, day_start + start + length):
+                free.append(start)
+        return free
+
+    def free_until(self, equipment_id, day, minute):
+        """
+        Find where the free stretch starting at `minute` ends
+
+        The answer is rounded down to a cell boundary, so it never runs into a
+        booking that starts mid-cell.
+
+        Returns:
+            int: Minute of the day of the next taken cell, or MINUTES_PER_DAY if none
+        """
+        cell = minute // CELL_MINUTES
+        following = self.day_mask(equipment_id, day) >> cell
+        if not following:
+            return MINUTES_PER_DAY
+        # The lowest set bit is the first taken cell
+        return (cell + (following & -following).bit_length() - 1) * CELL_MINUTES
@@ -0,0 +1,74 @@
+import heapq
+from itertools import islice
+
+from booking_index import MINUTES_PER_DAY
+
+
+def free_starts(busy, first_day, days, work_start, work_end, duration, step=30, not_before=0):
+    """
+    Yield every feasible aligned start, in time order
+
+    Within a free gap the starts follow one another `step` minutes apart;
+    a busy interval that leaves too little room moves the walk straight past
+    it. The walk is lazy: a caller that only needs the first few starts never
+    looks at the rest of the window.
+
+    Args:
+        busy (list): (start, end) busy intervals sorted by start, absolute minutes; they may overlap
+        first_day (int): Absolute minute of midnight on the first day
+        days (int): Number of days to search
+        work_start (int): Minute of the day working hours begin
+        work_end (int): Minute of the day working hours end
+        duration (int): Minutes the slot must be free for
+        step (int): Starts are aligned to multiples of this many minutes
+        not_before (int): Absolute minute before which nothing may start
+
+    Yields:
+        int: Absolute start minute
+    """
+    position = 0
+    for day in range(days):
+        day_start = first_day + day * MINUTES_PER_DAY
+        day_end = day_start + work_end
+        cursor = max(day_start + work_start, not_before)
+
+        while True:
+            cursor = -(-cursor // step) * step
+            if cursor + duration > day_end:
+                break
+
+            # Skip busy intervals that are over before the cursor
+            while position < len(busy) and busy[position][1] <= cursor:
+                position += 1
+
+            if position < len(busy) and busy[position][0] < cursor + duration:
+                # Not enough room before the next busy interval; try after it
+                cursor = busy[position][1]
+                continue
+
+            yield cursor
+            cursor += step
+
+
+def _tagged(equipment_id, starts):
+    for start in starts:
+        yield start, equipment_id
+
+
+def earliest_slots(candidates, k):
+    """
+    Take the k earliest starts across many pieces of equipment
+
+    Each equipment's starts arrive already in time order, so a heap merge
+    across the streams yields the global order while advancing each stream
+    only as far as needed.
+
+    Args:
+        candidates (dict): Equipment ID -> iterator of start minutes in increasing order
+        k (int): Number of results
+
+    Returns:
+        list: Up to k (start, equipment_id) pairs, earliest first
+    """
+    streams = [_tagged(equipment_id, starts) for equipment_id, starts in candidates.items()]
+    return list(islice(heapq.merge(*streams), k))
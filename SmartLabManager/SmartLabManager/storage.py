@@ -0,0 +1,605 @@
+import abc
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from booking_index import booking_span
+
+# Storage backend: "sqlite" (shared, persistent) or "memory" (lost on restart)
+STORAGE_BACKEND = os.environ.get("SLAB_STORAGE", "sqlite")
+DB_PATH = os.environ.get("SLAB_DB_PATH", "slab.db")
+POOL_SIZE = 8
+
+EQUIPMENT_FIELDS = ["name", "description", "category", "location", "status", "image_url"]
+BOOKING_FIELDS = [
+    "user_email", "equipment_id", "start_date", "end_date", "start_time", "end_time",
+    "start_at", "end_at", "purpose", "status", "timestamp"
+]
+# Booking fields that are only present on some bookings (same-day time slots)
+OPTIONAL_BOOKING_FIELDS = ["start_time", "end_time"]
+
+
+class BookingConflictError(Exception):
+    """
+    Raised when a booking would overlap a confirmed booking on the same equipment
+
+    The conflicting booking committed first (or another user holds the slot,
+    in which case held is True); the caller can pick another slot and retry.
+    """
+
+    retryable = True
+
+    def __init__(self, equipment_id, conflicts, held=False):
+        self.equipment_id = equipment_id
+        self.conflicts = list(conflicts)
+        self.held = held
+        if held:
+            message = f"Equipment {equipment_id} is held by another user for that time"
+        else:
+            message = f"Equipment {equipment_id} is already booked for that time (bookings {self.conflicts})"
+        super().__init__(message)
+
+
+class Storage(abc.ABC):
+    """
+    Interface for the records behind database.py
+    Records are plain dictionaries; the backend assigns equipment and booking IDs.
+    """
+
+    # Users
+    @abc.abstractmethod
+    def get_user(self, email):
+        pass
+
+    @abc.abstractmethod
+    def save_user(self, user):
+        pass
+
+    # Equipment
+    @abc.abstractmethod
+    def list_equipment(self):
+        pass
+
+    @abc.abstractmethod
+    def get_equipment(self, equipment_id):
+        pass
+
+    @abc.abstractmethod
+    def add_equipment(self, equipment):
+        pass
+
+    @abc.abstractmethod
+    def update_equipment(self, equipment_id, data):
+        pass
+
+    @abc.abstractmethod
+    def delete_equipment(self, equipment_id):
+        pass
+
+    @abc.abstractmethod
+    def seed_equipment(self, equipment_list):
+        """Insert the initial catalog the first time the store is opened"""
+
+    # Bookings
+    @abc.abstractmethod
+    def list_bookings(self, equipment_id=None, user_email=None, status=None):
+        pass
+
+    @abc.abstractmethod
+    def get_booking(self, booking_id):
+        pass
+
+    @abc.abstractmethod
+    def add_booking(self, booking):
+        pass
+
+    @abc.abstractmethod
+    def add_booking_if_free(self, booking):
+        """
+        Insert a confirmed booking unless it overlaps another confirmed booking
+
+        The check and the insert are one atomic step, so of two overlapping
+        requests exactly one is stored.
+
+        Raises:
+            BookingConflictError: If the interval is already taken
+        """
+
+    @abc.abstractmethod
+    def confirm_booking_if_free(self, booking_id):
+        """
+        Set a booking back to Confirmed unless another confirmed booking overlaps it
+
+        The check and the update are one atomic step, like add_booking_if_free.
+
+        Returns:
+            dict: The updated booking, or None if it does not exist
+
+        Raises:
+            BookingConflictError: If the interval is already taken
+        """
+
+    @abc.abstractmethod
+    def update_booking(self, booking_id, data):
+        pass
+
+    # Lab sessions
+    @abc.abstractmethod
+    def list_lab_sessions(self):
+        pass
+
+    @abc.abstractmethod
+    def add_lab_session(self, session):
+        pass
+
+    @abc.abstractmethod
+    def update_lab_session(self, session_id, data):
+        pass
+
+    @abc.abstractmethod
+    def delete_lab_session(self, session_id):
+        pass
+
+    def close(self):
+        pass
+
+
+class MemoryStorage(Storage):
+    """Process-local storage, shared by all sessions but lost on restart"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._users = {}
+        self._equipment = {}
+        self._bookings = {}
+        self._lab_sessions = {}
+        self._next_equipment_id = 1
+        self._next_booking_id = 1
+        self._next_lab_session_id = 1
+        self._seeded = False
+
+    def get_user(self, email):
+        with self._lock:
+            user = self._users.get(email)
+            return dict(user) if user else None
+
+    def save_user(self, user):
+        with self._lock:
+            self._users[user["email"]] = dict(user)
+            return dict(user)
+
+    def list_equipment(self):
+        with self._lock:
+            return [dict(e) for e in self._equipment.values()]
+
+    def get_equipment(self, equipment_id):
+        with self._lock:
+            equipment = self._equipment.get(equipment_id)
+            return dict(equipment) if equipment else None
+
+    def add_equipment(self, equipment):
+        with self._lock:
+            equipment = dict(equipment)
+            equipment["id"] = equipment.get("id") or self._next_equipment_id
+            self._next_equipment_id = max(self._next_equipment_id, equipment["id"] + 1)
+            self._equipment[equipment["id"]] = equipment
+            return dict(equipment)
+
+    def update_equipment(self, equipment_id, data):
+        with self._lock:
+            equipment = self._equipment.get(equipment_id)
+            if equipment is None:
+                return None
+            equipment.update(data)
+            return dict(equipment)
+
+    def delete_equipment(self, equipment_id):
+        with self._lock:
+            return self._equipment.pop(equipment_id, None) is not None
+
+    def seed_equipment(self, equipment_list):
+        if self._seeded:
+            return
+        self._seeded = True
+        for equipment in equipment_list:
+            self.add_equipment(equipment)
+
+    def list_bookings(self, equipment_id=None, user_email=None, status=None):
+        with self._lock:
+            return [
+                dict(b) for b in self._bookings.values()
+                if (equipment_id is None or b["equipment_id"] == equipment_id)
+                and (user_email is None or b["user_email"] == user_email)
+                and (status is None or b["status"] == status)
+            ]
+
+    def get_booking(self, booking_id):
+        with self._lock:
+            booking = self._bookings.get(booking_id)
+            return dict(booking) if booking else None
+
+    def add_booking(self, booking):
+        with self._lock:
+            booking = dict(booking)
+            booking["id"] = self._next_booking_id
+            self._next_booking_id += 1
+            self._bookings[booking["id"]] = booking
+            return dict(booking)
+
+    def add_booking_if_free(self, booking):
+        with self._lock:
+            conflicts = [
+                b["id"] for b in self._bookings.values()
+                if b["equipment_id"] == booking["equipment_id"] and b["status"] == "Confirmed"
+                and b["start_at"] < booking["end_at"] and b["end_at"] > booking["start_at"]
+            ]
+            if conflicts:
+                raise BookingConflictError(booking["equipment_id"], conflicts)
+
+            booking = dict(booking)
+            booking["id"] = self._next_booking_id
+            self._next_booking_id += 1
+            self._bookings[booking["id"]] = booking
+            return dict(booking)
+
+    def confirm_booking_if_free(self, booking_id):
+        with self._lock:
+            booking = self._bookings.get(booking_id)
+            if booking is None:
+                return None
+
+            conflicts = [
+                b["id"] for b in self._bookings.values()
+                if b["equipment_id"] == booking["equipment_id"] and b["status"] == "Confirmed" and b["id"] != booking_id
+                and b["start_at"] < booking["end_at"] and b["end_at"] > booking["start_at"]
+            ]
+            if conflicts:
+                raise BookingConflictError(booking["equipment_id"], conflicts)
+
+            booking["status"] = "Confirmed"
+            return dict(booking)
+
+    def update_booking(self, booking_id, data):
+        with self._lock:
+            booking = self._bookings.get(booking_id)
+            if booking is None:
+                return None
+            booking.update(data)
+            return dict(booking)
+
+    def list_lab_sessions(self):
+        with self._lock:
+            return [dict(s, participants=list(s["participants"])) for s in self._lab_sessions.values()]
+
+    def add_lab_session(self, session):
+        with self._lock:
+            session = dict(session, participants=list(session.get("participants", [])))
+            session["id"] = self._next_lab_session_id
+            self._next_lab_session_id += 1
+            self._lab_sessions[session["id"]] = session
+            return dict(session, participants=list(session["participants"]))
+
+    def update_lab_session(self, session_id, data):
+        with self._lock:
+            session = self._lab_sessions.get(session_id)
+            if session is None:
+                return None
+            session.update(data)
+            session["participants"] = list(session["participants"])
+            return dict(session, participants=list(session["participants"]))
+
+    def delete_lab_session(self, session_id):
+        with self._lock:
+            return self._lab_sessions.pop(session_id, None) is not None
+
+
+class SQLiteStorage(Storage):
+    """
+    SQLite storage in WAL mode, shared by every session in the server process
+    Connections are pooled and handed to one thread at a time.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE IF NOT EXISTS users (
+        email TEXT PRIMARY KEY,
+        data TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS equipment (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        description TEXT,
+        category TEXT,
+        location TEXT,
+        status TEXT NOT NULL,
+        image_url TEXT
+    );
+    CREATE TABLE IF NOT EXISTS bookings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_email TEXT NOT NULL,
+        equipment_id INTEGER NOT NULL,
+        start_date TEXT NOT NULL,
+        end_date TEXT NOT NULL,
+        start_time TEXT,
+        end_time TEXT,
+        start_at INTEGER,
+        end_at INTEGER,
+        purpose TEXT,
+        status TEXT NOT NULL,
+        timestamp TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_bookings_equipment ON bookings (equipment_id, start_date);
+    CREATE INDEX IF NOT EXISTS idx_bookings_user ON bookings (user_email);
+    CREATE INDEX IF NOT EXISTS idx_bookings_date ON bookings (start_date, end_date);
+    CREATE TABLE IF NOT EXISTS lab_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        data TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path=DB_PATH, pool_size=POOL_SIZE):
+        self.path = path
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+        with self._connection() as conn:
+            conn.executescript(self.SCHEMA)
+            self._migrate(conn)
+
+    def _migrate(self, conn):
+        """Add the integer interval columns to databases created before they existed"""
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(bookings)")}
+        if "start_at" not in columns:
+            conn.execute("ALTER TABLE bookings ADD COLUMN start_at INTEGER")
+            conn.execute("ALTER TABLE bookings ADD COLUMN end_at INTEGER")
+
+        rows = conn.execute("SELECT * FROM bookings WHERE start_at IS NULL").fetchall()
+        for row in rows:
+            start_at, end_at = booking_span(self._booking_from_row(row))
+            conn.execute(
+                "UPDATE bookings SET start_at = ?, end_at = ? WHERE id = ?",
+                (start_at, end_at, row["id"])
+            )
+
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_bookings_span ON bookings (equipment_id, start_at)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        """Borrow a pooled connection, opening a new one if the pool is empty"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+
+        try:
+            yield conn
+        finally:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        """Run statements in a write transaction"""
+        with self._connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _booking_from_row(row):
+        booking = dict(row)
+        for field in OPTIONAL_BOOKING_FIELDS:
+            if booking[field] is None:
+                del booking[field]
+        return booking
+
+    # Users
+    def get_user(self, email):
+        with self._connection() as conn:
+            row = conn.execute("SELECT data FROM users WHERE email = ?", (email,)).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def save_user(self, user):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO users (email, data) VALUES (?, ?)",
+                (user["email"], json.dumps(user))
+            )
+        return dict(user)
+
+    # Equipment
+    def list_equipment(self):
+        with self._connection() as conn:
+            rows = conn.execute("SELECT * FROM equipment ORDER BY id").fetchall()
+        return [dict(row) for row in rows]
+
+    def get_equipment(self, equipment_id):
+        with self._connection() as conn:
+            row = conn.execute("SELECT * FROM equipment WHERE id = ?", (equipment_id,)).fetchone()
+        return dict(row) if row else None
+
+    def add_equipment(self, equipment):
+        columns = [field for field in ["id"] + EQUIPMENT_FIELDS if equipment.get(field) is not None]
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"INSERT INTO equipment ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [equipment[field] for field in columns]
+            )
+            equipment_id = cursor.lastrowid
+        return self.get_equipment(equipment_id)
+
+    def update_equipment(self, equipment_id, data):
+        fields = [field for field in EQUIPMENT_FIELDS if field in data]
+        if fields:
+            with self._transaction() as conn:
+                conn.execute(
+                    f"UPDATE equipment SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?",
+                    [data[field] for field in fields] + [equipment_id]
+                )
+        return self.get_equipment(equipment_id)
+
+    def delete_equipment(self, equipment_id):
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM equipment WHERE id = ?", (equipment_id,))
+        return cursor.rowcount > 0
+
+    def seed_equipment(self, equipment_list):
+        with self._transaction() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'equipment_seeded'").fetchone():
+                return
+            for equipment in equipment_list:
+                columns = ["id"] + EQUIPMENT_FIELDS
+                conn.execute(
+                    f"INSERT OR IGNORE INTO equipment ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    [equipment.get(field) for field in columns]
+                )
+            conn.execute("INSERT INTO meta (key, value) VALUES ('equipment_seeded', '1')")
+
+    # Bookings
+    def list_bookings(self, equipment_id=None, user_email=None, status=None):
+        clauses = []
+        params = []
+        for column, value in [("equipment_id", equipment_id), ("user_email", user_email), ("status", status)]:
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+
+        sql = "SELECT * FROM bookings"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        with self._connection() as conn:
+            rows = conn.execute(sql + " ORDER BY id", params).fetchall()
+        return [self._booking_from_row(row) for row in rows]
+
+    def get_booking(self, booking_id):
+        with self._connection() as conn:
+            row = conn.execute("SELECT * FROM bookings WHERE id = ?", (booking_id,)).fetchone()
+        return self._booking_from_row(row) if row else None
+
+    def add_booking(self, booking):
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"INSERT INTO bookings ({', '.join(BOOKING_FIELDS)}) VALUES ({', '.join('?' for _ in BOOKING_FIELDS)})",
+                [booking.get(field) for field in BOOKING_FIELDS]
+            )
+            booking_id = cursor.lastrowid
+        return dict(booking, id=booking_id)
+
+    def add_booking_if_free(self, booking):
+        # BEGIN IMMEDIATE takes the write lock before the check, so no other
+        # connection or process can insert between the check and the insert
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id FROM bookings WHERE equipment_id = ? AND status = 'Confirmed' AND start_at < ? AND end_at > ?",
+                (booking["equipment_id"], booking["end_at"], booking["start_at"])
+            ).fetchall()
+            if rows:
+                raise BookingConflictError(booking["equipment_id"], [row["id"] for row in rows])
+
+            cursor = conn.execute(
+                f"INSERT INTO bookings ({', '.join(BOOKING_FIELDS)}) VALUES ({', '.join('?' for _ in BOOKING_FIELDS)})",
+                [booking.get(field) for field in BOOKING_FIELDS]
+            )
+            booking_id = cursor.lastrowid
+        return dict(booking, id=booking_id)
+
+    def confirm_booking_if_free(self, booking_id):
+        with self._transaction() as conn:
+            booking = conn.execute(
+                "SELECT equipment_id, start_at, end_at FROM bookings WHERE id = ?", (booking_id,)
+            ).fetchone()
+            if booking is None:
+                return None
+
+            rows = conn.execute(
+                "SELECT id FROM bookings WHERE equipment_id = ? AND status = 'Confirmed' AND id != ? AND start_at < ? AND end_at > ?",
+                (booking["equipment_id"], booking_id, booking["end_at"], booking["start_at"])
+            ).fetchall()
+            if rows:
+                raise BookingConflictError(booking["equipment_id"], [row["id"] for row in rows])
+
+            conn.execute("UPDATE bookings SET status = 'Confirmed' WHERE id = ?", (booking_id,))
+        return self.get_booking(booking_id)
+
+    def update_booking(self, booking_id, data):
+        fields = [field for field in BOOKING_FIELDS if field in data]
+        if fields:
+            with self._transaction() as conn:
+                conn.execute(
+                    f"UPDATE bookings SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?",
+                    [data[field] for field in fields] + [booking_id]
+                )
+        return self.get_booking(booking_id)
+
+    # Lab sessions
+    def list_lab_sessions(self):
+        with self._connection() as conn:
+            rows = conn.execute("SELECT id, data FROM lab_sessions ORDER BY id").fetchall()
+        return [dict(json.loads(row["data"]), id=row["id"]) for row in rows]
+
+    def add_lab_session(self, session):
+        session = {key: value for key, value in session.items() if key != "id"}
+        with self._transaction() as conn:
+            cursor = conn.execute("INSERT INTO lab_sessions (data) VALUES (?)", (json.dumps(session),))
+            session_id = cursor.lastrowid
+        return dict(session, id=session_id)
+
+    def update_lab_session(self, session_id, data):
+        with self._transaction() as conn:
+            row = conn.execute("SELECT data FROM lab_sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+            session = json.loads(row["data"])
+            session.update({key: value for key, value in data.items() if key != "id"})
+            conn.execute("UPDATE lab_sessions SET data = ? WHERE id = ?", (json.dumps(session), session_id))
+        return dict(session, id=session_id)
+
+    def delete_lab_session(self, session_id):
+        with self._transaction() as conn:
+            cursor = conn.execute("DELETE FROM lab_sessions WHERE id = ?", (session_id,))
+        return cursor.rowcount > 0
+
+    def close(self):
+        """Close all pooled connections"""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def create_storage(backend=STORAGE_BACKEND, path=DB_PATH):
+    """
+    Create a storage backend
+
+    Args:
+        backend (str): "sqlite" or "memory"
+        path (str): Database file for the SQLite backend
+
+    Returns:
+        Storage: The storage backend
+    """
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "sqlite":
+        return SQLiteStorage(path)
+    raise ValueError(f"Unknown storage backend: {backend}")
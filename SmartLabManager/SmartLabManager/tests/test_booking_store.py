@@ -0,0 +1,140 @@
+"""
+Tests for the concurrency-sensitive parts of BookingStore: holds, reconfirming
+cancelled bookings, commits under contention and the completion sweeper
+
+Every test runs against both MemoryStorage and SQLiteStorage.
+
+Usage:
+    python -m pytest tests
+"""
+import os
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from booking_index import request_span
+from engine import CompletionSweeper, Engine
+from storage import BookingConflictError, MemoryStorage, SQLiteStorage
+
+EQUIPMENT = [{"id": 1, "name": "Oscilloscope", "description": "", "category": "Electronics",
+              "location": "Lab 1", "status": "Available", "image_url": None}]
+
+DAY = date.today() + timedelta(days=1)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_engine(request, tmp_path):
+    """Build engines over one shared store of the requested kind"""
+    memory = MemoryStorage()
+    engines = []
+
+    def make():
+        storage = memory if request.param == "memory" else SQLiteStorage(str(tmp_path / "bookings.db"))
+        engine = Engine(storage, EQUIPMENT)
+        engines.append(engine)
+        return engine
+
+    yield make
+    for engine in engines:
+        engine.close()
+
+
+@pytest.fixture
+def bookings(make_engine):
+    return make_engine().bookings
+
+
+def book(bookings, user_email, start_time="10:00", end_time="11:00"):
+    return bookings.add(user_email, 1, DAY, DAY, start_time=start_time, end_time=end_time)
+
+
+def test_hold_blocks_other_users(bookings):
+    hold = bookings.hold("alice@example.com", 1, DAY, "10:00", "11:00")
+
+    with pytest.raises(BookingConflictError) as error:
+        book(bookings, "bob@example.com", "10:30", "11:30")
+    assert error.value.held
+    with pytest.raises(BookingConflictError):
+        bookings.hold("bob@example.com", 1, DAY, "10:00", "11:00")
+
+    # The holder can still book the slot, which uses up the hold
+    booking = bookings.confirm_hold(hold["id"])
+    assert booking["status"] == "Confirmed"
+    assert bookings.get_hold(hold["id"]) is None
+
+
+def test_hold_expires(bookings):
+    hold = bookings.hold("alice@example.com", 1, DAY, "10:00", "11:00", ttl=0.05)
+    time.sleep(0.1)
+
+    assert bookings.get_hold(hold["id"]) is None
+    assert bookings.confirm_hold(hold["id"]) is None
+    assert book(bookings, "bob@example.com")["status"] == "Confirmed"
+
+
+def test_reconfirm_without_conflict(bookings):
+    booking = book(bookings, "alice@example.com")
+    bookings.update_status(booking["id"], "Cancelled")
+
+    assert bookings.update_status(booking["id"], "Confirmed")
+    assert bookings.get(booking["id"])["status"] == "Confirmed"
+    with pytest.raises(BookingConflictError):
+        book(bookings, "bob@example.com")
+
+
+def test_reconfirm_with_conflict(bookings):
+    booking = book(bookings, "alice@example.com")
+    bookings.update_status(booking["id"], "Cancelled")
+    taken = book(bookings, "bob@example.com", "10:30", "11:30")
+
+    with pytest.raises(BookingConflictError) as error:
+        bookings.update_status(booking["id"], "Confirmed")
+    assert error.value.conflicts == [taken["id"]]
+    assert bookings.get(booking["id"])["status"] == "Cancelled"
+
+
+def test_one_winner_per_slot(make_engine):
+    # Two engines on one store stand in for two server processes on SQLite
+    engines = [make_engine(), make_engine()]
+    threads = 8
+    barrier = threading.Barrier(threads)
+    wins = []
+
+    def worker(worker_id):
+        barrier.wait()
+        try:
+            book(engines[worker_id % len(engines)].bookings, f"user{worker_id}@example.com")
+            wins.append(worker_id)
+        except BookingConflictError:
+            pass
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+
+    assert len(wins) == 1
+    assert len(engines[0].storage.list_bookings(equipment_id=1, status="Confirmed")) == 1
+
+
+def test_sweeper_completes_ended_bookings(bookings):
+    now = [0]
+    sweeper = CompletionSweeper(bookings, clock=lambda: now[0])
+    booking = book(bookings, "alice@example.com")
+    later = book(bookings, "bob@example.com", "12:00", "13:00")
+    start, end = request_span(DAY, None, "10:00", "11:00")
+
+    now[0] = end - 1
+    assert sweeper.sweep() == 0
+
+    now[0] = end
+    assert sweeper.sweep() == 1
+    assert bookings.get(booking["id"])["status"] == "Completed"
+    assert bookings.get(later["id"])["status"] == "Confirmed"
+    assert not bookings.has_overlap(1, start, end)
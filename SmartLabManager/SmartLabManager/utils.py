@@ -3,6 +3,10 @@ import base64
 from PIL import Image
 import io
 from datetime import datetime, timedelta
+import numpy as np
+import database
+from booking_index import MINUTES_PER_DAY, to_minutes
+from occupancy import booked_day_matrix, booked_days_for_bookings
 
 def display_success(message):
     """Display success message with formatting"""
@@ -22,59 +26,59 @@ def validate_date_range(start_date, end_date):
         return False
     return True
 
-def check_booking_conflict(equipment_id, start_date, end_date, booking_data, exclude_booking_id=None):
+def check_booking_conflict(equipment_id, start_date, end_date, exclude_booking_id=None, start_time=None, end_time=None):
     """
     Check if there's a booking conflict
     Returns True if there is a conflict, False otherwise
     """
-    for booking in booking_data:
-        # Skip the booking if it's the one being updated
-        if exclude_booking_id and booking["id"] == exclude_booking_id:
-            continue
-            
-        if booking["equipment_id"] == equipment_id and booking["status"] == "Confirmed":
-            booking_start = datetime.strptime(booking["start_date"], "%Y-%m-%d").date()
-            booking_end = datetime.strptime(booking["end_date"], "%Y-%m-%d").date()
-            
-            # Check for overlap
-            if (start_date <= booking_end and end_date >= booking_start):
-                return True
-    
-    return False
+    conflicts = database.find_booking_conflicts(
+        equipment_id,
+        start_date,
+        end_date,
+        start_time=start_time,
+        end_time=end_time,
+        exclude_booking_id=exclude_booking_id
+    )
+    return bool(conflicts)
 
-def get_upcoming_bookings(user_email, booking_data, days=7):
-    """Get upcoming bookings within the specified number of days"""
-    today = datetime.now().date()
-    upcoming = []
-    
-    for booking in booking_data:
-        if booking["user_email"] == user_email and booking["status"] == "Confirmed":
-            start_date = datetime.strptime(booking["start_date"], "%Y-%m-%d").date()
-            
-            # Check if the booking is within the specified days
-            if today <= start_date <= today + timedelta(days=days):
-                upcoming.append(booking)
-    
-    return upcoming
+def get_upcoming_bookings(user_email, days=7):
+    """Get upcoming bookings within the specified number of days, earliest first"""
+    window_start = to_minutes(datetime.now().date())
+    window_end = window_start + (days + 1) * MINUTES_PER_DAY
+    return database.get_bookings_starting(window_start, window_end, user_email)
 
 def get_equipment_availability(equipment_id, booking_data, days=30):
     """
     Get availability of equipment for the next n days
-    Returns a list of dates when the equipment is booked
+    Returns a sorted list of the dates when the equipment is booked, each once
+    """
+    today = datetime.now().date()
+    bookings = [
+        booking for booking in booking_data
+        if booking["equipment_id"] == equipment_id and booking["status"] == "Confirmed"
+    ]
+    
+    # Today plus the next n days
+    booked = booked_days_for_bookings(bookings, today.toordinal(), days + 1)
+    return [today + timedelta(days=int(day)) for day in np.flatnonzero(booked)]
+
+def get_all_equipment_availability(booking_data, days=30):
+    """
+    Get availability of every piece of equipment for the next n days in one pass
+    Returns a dict of equipment ID to a boolean vector with one entry per day, True when booked;
+    equipment without confirmed bookings in booking_data is left out
     """
     today = datetime.now().date()
-    booked_dates = []
+    bookings = [booking for booking in booking_data if booking["status"] == "Confirmed"]
     
-    for booking in booking_data:
-        if booking["equipment_id"] == equipment_id and booking["status"] == "Confirmed":
-            start = datetime.strptime(booking["start_date"], "%Y-%m-%d").date()
-            end = datetime.strptime(booking["end_date"], "%Y-%m-%d").date()
-            
-            # Add all dates in the range to booked_dates
-            current = start
-            while current <= end:
-                if today <= current <= today + timedelta(days=days):
-                    booked_dates.append(current)
-                current += timedelta(days=1)
+    # One grid row per piece of equipment
+    equipment_ids = sorted({booking["equipment_id"] for booking in bookings})
+    row_of = {equipment_id: row for row, equipment_id in enumerate(equipment_ids)}
+    count = len(bookings)
+    rows = np.fromiter((row_of[b["equipment_id"]] for b in bookings), dtype=np.int64, count=count)
+    starts = np.fromiter((b["start_at"] for b in bookings), dtype=np.int64, count=count)
+    ends = np.fromiter((b["end_at"] for b in bookings), dtype=np.int64, count=count)
     
-    return booked_dates
+    # Today plus the next n days
+    booked = booked_day_matrix(rows, starts, ends, today.toordinal(), days + 1, len(equipment_ids))
+    return dict(zip(equipment_ids, booked))